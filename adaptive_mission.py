@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 04:02:35 2026
+
+@author: K. Grafton
+
+Adaptive control-point refinement. Every segment is first solved on a
+coarse Chebyshev grid, then refined to 2n - 1 points (the Lobatto points
+nest, so each grid contains the last). The change in a segment's fuel
+burn between successive grids is its discretisation error estimate, and
+only segments whose estimate exceeds the tolerance are refined again. A
+solve whose root finder did not converge is never used as an estimate.
+Each solve starts from the previous solution resampled onto the new
+grid, so the refined solves take few residual evaluations.
+
+    results, info = evaluate_adaptive(lambda n: mission_setup(analyses, vehicle,
+                                                              number_control_points=n),
+                                      tolerance=0.05)
+"""
+
+import numpy as np
+
+from mission_sweep import segment_state
+from warm_start import count_iterations, resample, residual_evaluations
+
+def evaluate_adaptive(setup, tolerance=0.05, rtol=1e-4, initial_points=9, max_points=129,
+                      max_rounds=8):
+    """Evaluates the mission built by setup(number_control_points) to a
+    fuel burn error of tolerance (kg) + rtol * burn per segment. Returns
+    the finest results and an info dict: control points, error estimate
+    and fuel burn per segment, the segments whose last solve did not
+    converge, total residual evaluations, rounds solved and whether the
+    tolerance was met."""
+
+    points  = {}
+    guesses = {}
+    good    = {}      # tag -> (burn, points) of its last converged solve
+    errors  = {}
+    total   = 0
+
+    for rounds in range(1, max_rounds + 1):
+        mission = count_iterations(setup(initial_points))
+        for tag, segment in mission.segments.items():
+            n = points.setdefault(tag, initial_points)
+            segment.state.numerics.number_control_points = n
+            for key, value in guesses.get(tag, {}).items():
+                segment.state.unknowns[key] = resample(value, n)
+
+        results = mission.evaluate()
+        total  += residual_evaluations(results)
+        burns   = {tag: segment_fuel_burn(segment) for tag, segment in results.segments.items()}
+        solved  = {tag: bool(segment_state(segment).numerics.get('converged', True))
+                   for tag, segment in results.segments.items()}
+        guesses.update({tag: {k: np.array(v, copy=True) for k, v in segment_state(segment).unknowns.items()}
+                        for tag, segment in results.segments.items() if solved[tag]})
+
+        # an unconverged solve gives no error estimate, and a first solve
+        # has nothing to compare against: refine both
+        refine = []
+        for tag, burn in burns.items():
+            if not solved[tag] or tag not in good:
+                errors[tag] = np.inf
+            elif points[tag] != good[tag][1]:
+                errors[tag] = abs(burn - good[tag][0])
+            if errors[tag] > tolerance + rtol * abs(burn) and points[tag] < max_points:
+                refine.append(tag)
+
+        solved_points = dict(points)
+        good.update({tag: (burn, points[tag]) for tag, burn in burns.items() if solved[tag]})
+        if not refine:
+            break
+        for tag in refine:
+            points[tag] = min(2 * points[tag] - 1, max_points)
+
+    unconverged = [tag for tag in burns if not solved[tag]]
+    met = not unconverged and all(errors[tag] <= tolerance + rtol * abs(burns[tag]) for tag in burns)
+    info = {'control_points':       solved_points,
+            'error_estimate':       dict(errors),
+            'fuel_burn':            burns,
+            'unconverged':          unconverged,
+            'residual_evaluations': total,
+            'rounds':               rounds,
+            'converged':            met}
+
+    return results, info
+
+def segment_fuel_burn(segment):
+
+    mass = segment.conditions.weights.total_mass[:,0]
+
+    return float(mass[0] - mass[-1])
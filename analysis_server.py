@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 02:21:50 2026
+
+@author: K. Grafton
+
+Long-lived local analysis service. A pool of worker processes each build
+and finalize the Sling 2 vehicle, configs and analyses once at start-up,
+then answer mission, payload-range and V-n queries for as long as the
+server runs.
+
+Clients send one JSON object per line over a Unix socket (or localhost
+TCP) and get one JSON line back per request, matched by id:
+
+    {"id": 1, "type": "mission", "params": {"air_speed": 64.3}}
+    {"id": 1, "result": {"fuel_burn": 57.1, ...}}
+
+Requests arriving within a few milliseconds of each other are batched:
+missions go to the workers in chunks that warm-start from each other,
+payload-range and V-n requests are broadcast through one
+payload_range_batch() or vn_envelopes() call. Answers are cached on the
+request parameters, and identical requests in flight share one solve.
+
+Parameters are SI (m, m/s, kg, K). Omitted ones take the sling2 defaults.
+"""
+
+import asyncio
+import json
+import math
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+SOCKET = os.path.join(os.environ.get('XDG_RUNTIME_DIR', '/tmp'), 'sling2.sock')
+
+# the mission_setup() defaults and the vehicle's MTOW. The rpm is not a
+# parameter, mission_setup() only uses it as the solver's first guess
+MISSION_DEFAULTS       = {'altitude':     9500. * 0.3048,
+                          'air_speed':    120. * 1852. / 3600.,
+                          'takeoff_mass': 700.,
+                          'distance':     600. * 1852.}
+
+# None is the vehicle's own value, altitude None the mission default
+PAYLOAD_RANGE_DEFAULTS = {'operating_empty': None,
+                          'max_zero_fuel':   None,
+                          'max_takeoff':     None,
+                          'reserves':        0.,
+                          'altitude':        None}
+
+VN_DEFAULTS            = {'weight':    None,
+                          'altitude':  0.,
+                          'delta_ISA': 0.}
+
+DEFAULTS = {'mission':       MISSION_DEFAULTS,
+            'payload_range': PAYLOAD_RANGE_DEFAULTS,
+            'vn':            VN_DEFAULTS}
+
+# ----------------------------------------------------------------------
+#   Server
+# ----------------------------------------------------------------------
+
+class AnalysisServer:
+
+    def __init__(self, max_workers=None, batch_window=0.005, max_batch=64, cache_size=4096,
+                 propeller_map=False):
+
+        self.max_workers   = max_workers or os.cpu_count() or 1
+        self.batch_window  = batch_window
+        self.max_batch     = max_batch
+        self.cache_size    = cache_size
+        self.propeller_map = propeller_map
+        self.cache         = OrderedDict()
+        self.in_flight     = {}
+        self.stats         = {'requests': 0, 'cache_hits': 0, 'shared': 0, 'batches': 0, 'solved': 0}
+        self._pool         = None
+        self._queue        = None
+        self._batcher      = None
+        self._running      = set()
+
+    async def start(self):
+        """Starts the pool and waits until every worker has built its
+        vehicle and analyses."""
+
+        loop         = asyncio.get_running_loop()
+        self._pool   = ProcessPoolExecutor(max_workers=self.max_workers, initializer=init_worker,
+                                           initargs=(self.propeller_map,))
+        self._queue  = asyncio.Queue()
+
+        # one task per worker forces them all to start and initialize now
+        await asyncio.gather(*[loop.run_in_executor(self._pool, warm_up)
+                               for i in range(self.max_workers)])
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+        return self
+
+    async def close(self):
+
+        if self._batcher is not None:
+            self._batcher.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+        return
+
+    async def query(self, kind, params=None):
+        """Answer to one request, from the cache, a matching request in
+        flight or the next batch."""
+
+        params = normalise(kind, params)
+        key    = (kind, json.dumps(params, sort_keys=True))
+        self.stats['requests'] += 1
+
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.stats['cache_hits'] += 1
+            return self.cache[key]
+
+        if key in self.in_flight:
+            self.stats['shared'] += 1
+            return await asyncio.shield(self.in_flight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        await self._queue.put((kind, key, params, future))
+
+        try:
+            return await asyncio.shield(future)
+        finally:
+            self.in_flight.pop(key, None)
+
+    # ------------------------------------------------------------------
+    #   Batching
+    # ------------------------------------------------------------------
+
+    async def _batch_loop(self):
+
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch    = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0.:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            for kind, items in self._groups(batch):
+                task = asyncio.create_task(self._run(kind, items))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    def _groups(self, batch):
+        """(kind, items) groups for the workers. Missions are split across
+        the pool, the broadcast kinds go whole."""
+
+        groups = OrderedDict()
+        for item in batch:
+            groups.setdefault(item[0], []).append(item)
+
+        for kind, items in groups.items():
+            if kind != 'mission':
+                yield kind, items
+                continue
+            # neighbouring conditions together, so the warm starts help
+            items.sort(key=lambda item: tuple(item[2][k] for k in sorted(MISSION_DEFAULTS)))
+            size = math.ceil(len(items) / self.max_workers)
+            for i in range(0, len(items), size):
+                yield kind, items[i:i + size]
+
+        return
+
+    async def _run(self, kind, items):
+
+        loop = asyncio.get_running_loop()
+        self.stats['batches'] += 1
+        self.stats['solved']  += len(items)
+
+        try:
+            answers = await loop.run_in_executor(self._pool, run_batch, kind,
+                                                 [params for kind, key, params, future in items])
+        except Exception as error:
+            for kind, key, params, future in items:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (kind, key, params, future), answer in zip(items, answers):
+            self.cache[key] = answer
+            if not future.done():
+                future.set_result(answer)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+        return
+
+    # ------------------------------------------------------------------
+    #   Protocol
+    # ------------------------------------------------------------------
+
+    async def handle(self, reader, writer):
+        """One connection, requests answered as they finish so a slow
+        mission does not hold up a V-n query behind it."""
+
+        lock  = asyncio.Lock()
+        tasks = set()
+
+        async def answer(request):
+            reply = {'id': request.get('id')}
+            try:
+                if 'error' in request:
+                    raise ValueError('bad request: ' + request['error'])
+                if request.get('type') == 'stats':
+                    reply['result'] = dict(self.stats, cached=len(self.cache))
+                else:
+                    reply['result'] = await self.query(request.get('type'), request.get('params'))
+            except Exception as error:
+                reply['error'] = '%s: %s' % (type(error).__name__, error)
+            async with lock:
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    request = {'type': None, 'error': str(error)}
+                if not isinstance(request, dict):
+                    request = {'type': None, 'error': 'expected a JSON object, not %s' % type(request).__name__}
+                task = asyncio.create_task(answer(request))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+        return
+
+    async def serve(self, path=None, host='127.0.0.1', port=None):
+        """Serves on a Unix socket at path, or on host:port, until cancelled."""
+
+        await self.start()
+        try:
+            if port is None:
+                path = SOCKET if path is None else path
+                if os.path.exists(path):
+                    os.remove(path)
+                server = await asyncio.start_unix_server(self.handle, path)
+            else:
+                server = await asyncio.start_server(self.handle, host, port)
+            print('sling2 analysis server on %s with %d workers'
+                  % (path if port is None else '%s:%d' % (host, port), self.max_workers), file=sys.stderr)
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.close()
+
+        return
+
+def normalise(kind, params):
+    """Request parameters with the defaults filled in, so equivalent
+    requests share a cache key."""
+
+    if kind not in DEFAULTS:
+        raise ValueError('unknown request type %r, expected one of %s' % (kind, ', '.join(DEFAULTS)))
+
+    params  = dict(params or {})
+    unknown = sorted(set(params) - set(DEFAULTS[kind]))
+    if unknown:
+        raise ValueError('unknown %s parameters: %s' % (kind, ', '.join(unknown)))
+
+    values = dict(DEFAULTS[kind], **params)
+
+    return {name: None if value is None else float(value) for name, value in values.items()}
+
+# ----------------------------------------------------------------------
+#   Worker
+# ----------------------------------------------------------------------
+
+def init_worker(propeller_map=False):
+    """Vehicle and finalized analyses through mission_sweep's worker, plus
+    the finalized configs."""
+
+    import sling2
+    import mission_sweep
+
+    mission_sweep.init_worker(propeller_map)
+    worker = mission_sweep._worker
+    if 'configs' not in worker:
+        configs = sling2.configs_setup(worker['vehicle'])
+        configs.finalize()
+        worker['configs'] = configs
+
+    return
+
+def warm_up():
+
+    return os.getpid()
+
+def run_batch(kind, params):
+    """Answers a list of normalised requests of one kind."""
+
+    return BATCH_RUNNERS[kind](params)
+
+def run_missions(params):
+
+    from mission_sweep import SWEEP_DTYPE, evaluate_chunk
+
+    answers = [None] * len(params)
+    names   = ('altitude', 'air_speed', 'takeoff_mass')
+
+    # evaluate_chunk takes one distance per chunk
+    distances = sorted(set(p['distance'] for p in params))
+    for distance in distances:
+        index  = [i for i, p in enumerate(params) if p['distance'] == distance]
+        points = np.array([[params[i][name] for name in names] for i in index])
+        rows   = evaluate_chunk(points, distance, warm_start=True)
+        for i, row in zip(index, rows):
+            answers[i] = row_dict(row, SWEEP_DTYPE)
+
+    return answers
+
+def run_payload_range(params):
+
+    from mission_sweep import _worker
+    from payload_range_batch import PAYLOAD_RANGE_DTYPE, payload_range_batch
+
+    vehicle = _worker['vehicle']
+    masses  = vehicle.mass_properties
+
+    def column(name, default):
+        return np.array([default if p[name] is None else p[name] for p in params])
+
+    diagrams = payload_range_batch(vehicle, _worker['analyses'],
+                                   operating_empty  = column('operating_empty', masses.operating_empty),
+                                   max_zero_fuel    = column('max_zero_fuel', masses.max_zero_fuel),
+                                   max_takeoff      = column('max_takeoff', masses.max_takeoff),
+                                   reserves         = column('reserves', 0.),
+                                   cruise_altitudes = column('altitude', np.nan))
+
+    return [[row_dict(row, PAYLOAD_RANGE_DTYPE) for row in rows] for rows in diagrams]
+
+def run_vn(params):
+
+    from mission_sweep import _worker
+    from vn_envelope import VN_DTYPE, vn_envelopes
+
+    vehicle = _worker['vehicle']
+    weights = [vehicle.mass_properties.max_takeoff if p['weight'] is None else p['weight'] for p in params]
+
+    envelopes = vn_envelopes(vehicle, np.array(weights), np.array([p['altitude'] for p in params]),
+                             np.array([p['delta_ISA'] for p in params]))
+
+    return [row_dict(row, VN_DTYPE) for row in envelopes]
+
+BATCH_RUNNERS = {'mission':       run_missions,
+                 'payload_range': run_payload_range,
+                 'vn':            run_vn}
+
+def row_dict(row, dtype):
+    """A structured row as plain JSON types, NaN as None."""
+
+    values = {}
+    for name, value in zip(dtype.names, row.item()):
+        if isinstance(value, float) and not math.isfinite(value):
+            value = None
+        values[name] = value
+
+    return values
+
+# ----------------------------------------------------------------------
+#   Client
+# ----------------------------------------------------------------------
+
+def query(kind, path=SOCKET, **params):
+    """One blocking request to a running server, for scripts and tests."""
+
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(json.dumps({'id': 0, 'type': kind, 'params': params}).encode() + b'\n')
+        data = b''
+        while not data.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+
+    reply = json.loads(data)
+    if 'error' in reply:
+        raise RuntimeError(reply['error'])
+
+    return reply['result']
+
+# ----------------------------------------------------------------------
+#   Command Line
+# ----------------------------------------------------------------------
+
+def cli(argv=None):
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve Sling 2 mission, payload-range and V-n queries.')
+    parser.add_argument('--socket', default=None, help='Unix socket path, default %s' % SOCKET)
+    parser.add_argument('--port', type=int, default=None, help='listen on localhost TCP instead')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, default one per CPU')
+    parser.add_argument('--batch-window', type=float, default=0.005, help='seconds to gather a batch')
+    parser.add_argument('--cache-size', type=int, default=4096, help='answers kept in the result cache')
+    parser.add_argument('--propeller-map', action='store_true', help='interpolate a tabulated propeller map instead of BEM')
+    args = parser.parse_args(argv)
+
+    server = AnalysisServer(max_workers=args.workers, batch_window=args.batch_window,
+                            cache_size=args.cache_size, propeller_map=args.propeller_map)
+    try:
+        asyncio.run(server.serve(args.socket, port=args.port))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(cli())
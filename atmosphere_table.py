@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 00:48:21 2026
+
+@author: K. Grafton
+
+One tabulated US Standard 1976 atmosphere for the mission, V-n and loads
+code. Pressure and standard temperature are tabulated once on a uniform
+geometric altitude grid, so a lookup is an index computation and a
+linear blend rather than a walk through the layers. A temperature offset
+(delta ISA) changes temperature only, pressure stays on the standard
+profile as in SUAVE and FAR 23, and density, speed of sound and
+viscosity follow from the offset temperature in closed form.
+
+Altitudes are geometric (m), converted to geopotential with SUAVE's mean
+earth radius so the table matches US_Standard_1976.compute_values().
+Points outside the table are evaluated from the layers directly.
+
+    atmo = standard_atmosphere().compute(altitudes, delta_ISA=20.)
+    rho  = atmo['density']
+"""
+
+import numpy as np
+
+# SUAVE's Earth and Air
+EARTH_RADIUS = 6371000.
+G0           = 9.80665
+R_AIR        = 287.0528742
+GAMMA        = 1.4
+SUTHERLAND_C = 1.458e-6
+SUTHERLAND_S = 110.4
+
+T_SL = 288.15
+P_SL = 101325.
+
+# US Standard 1976 layers: base geopotential altitude (m), lapse rate (K/m)
+LAYERS = ((0.,     -0.0065),
+          (11000.,  0.),
+          (20000.,  0.001),
+          (32000.,  0.0028),
+          (47000.,  0.),
+          (51000., -0.0028),
+          (71000., -0.002),
+          (84852.,  None))
+
+ALTITUDE_RANGE = (-2000., 30000.)
+ALTITUDE_STEP  = 5.
+
+_standard = {}
+
+# ----------------------------------------------------------------------
+#   Table
+# ----------------------------------------------------------------------
+
+class AtmosphereTable:
+
+    def __init__(self, altitude_range=ALTITUDE_RANGE, step=ALTITUDE_STEP):
+
+        self.h0   = float(altitude_range[0])
+        self.step = float(step)
+        self.n    = int(round((altitude_range[1] - altitude_range[0]) / step)) + 1
+        self.h1   = self.h0 + (self.n - 1) * self.step
+
+        altitude  = self.h0 + self.step * np.arange(self.n)
+        T, p      = layered_conditions(altitude)
+
+        self.temperature = T
+        self.pressure    = p
+        # the logarithm interpolates the exponential profile far better
+        self.log_pressure = np.log(p)
+
+    def standard(self, altitude):
+        """Standard temperature (K) and pressure (Pa) at geometric altitudes."""
+
+        altitude = np.asarray(altitude, dtype=float)
+        x        = (altitude - self.h0) / self.step
+        i        = np.clip(np.floor(x).astype(int), 0, self.n - 2)
+        w        = x - i
+
+        T = self.temperature[i] * (1. - w) + self.temperature[i + 1] * w
+        p = np.exp(self.log_pressure[i] * (1. - w) + self.log_pressure[i + 1] * w)
+
+        outside = (altitude < self.h0) | (altitude > self.h1)
+        if np.any(outside):
+            T_out, p_out = layered_conditions(altitude[outside])
+            T = np.array(T, dtype=float)
+            p = np.array(p, dtype=float)
+            T[outside] = T_out
+            p[outside] = p_out
+
+        return T, p
+
+    def compute(self, altitude, delta_ISA=0.):
+        """Broadcast conditions at geometric altitudes (m) and temperature
+        offsets (K) as a dict of arrays."""
+
+        altitude, delta_ISA = np.broadcast_arrays(np.asarray(altitude, dtype=float),
+                                                  np.asarray(delta_ISA, dtype=float))
+        T_std, p = self.standard(altitude)
+        T        = T_std + delta_ISA
+        rho      = p / (R_AIR * T)
+        mu       = dynamic_viscosity(T)
+
+        return {'temperature':         T,
+                'pressure':            p,
+                'density':             rho,
+                'speed_of_sound':      np.sqrt(GAMMA * R_AIR * T),
+                'dynamic_viscosity':   mu,
+                'kinematic_viscosity': mu / rho}
+
+    def density(self, altitude, delta_ISA=0.):
+
+        T_std, p = self.standard(altitude)
+
+        return p / (R_AIR * (T_std + delta_ISA))
+
+def standard_atmosphere():
+    """The shared table, built on first use."""
+
+    if 'table' not in _standard:
+        _standard['table'] = AtmosphereTable()
+
+    return _standard['table']
+
+# ----------------------------------------------------------------------
+#   Layered model
+# ----------------------------------------------------------------------
+
+def layered_conditions(altitude):
+    """Standard temperature and pressure from the 1976 layers, the slow
+    path the table is built from."""
+
+    altitude = np.asarray(altitude, dtype=float)
+    H        = altitude / (1. + altitude / EARTH_RADIUS)
+
+    T = np.empty_like(H)
+    p = np.empty_like(H)
+
+    T_base, p_base = T_SL, P_SL
+    for (H_base, lapse), (H_top, _) in zip(LAYERS[:-1], LAYERS[1:]):
+        # the first layer also takes anything below sea level, the last
+        # anything above the table of layers
+        lo = -np.inf if H_base == LAYERS[0][0] else H_base
+        hi = np.inf if H_top == LAYERS[-1][0] else H_top
+        k  = (H >= lo) & (H < hi)
+        dH = H[k] - H_base
+        if lapse == 0.:
+            T[k] = T_base
+            p[k] = p_base * np.exp(-G0 * dH / (R_AIR * T_base))
+        else:
+            T[k] = T_base + lapse * dH
+            p[k] = p_base * (T[k] / T_base)**(-G0 / (lapse * R_AIR))
+
+        # carry the layer top forward as the next base
+        dH = H_top - H_base
+        if lapse == 0.:
+            p_base = p_base * np.exp(-G0 * dH / (R_AIR * T_base))
+        else:
+            p_base = p_base * ((T_base + lapse * dH) / T_base)**(-G0 / (lapse * R_AIR))
+            T_base = T_base + lapse * dH
+
+    return T, p
+
+def dynamic_viscosity(T):
+    """Sutherland's law with SUAVE's constants."""
+
+    return SUTHERLAND_C * T**1.5 / (T + SUTHERLAND_S)
+
+# ----------------------------------------------------------------------
+#   SUAVE analysis
+# ----------------------------------------------------------------------
+
+def suave_atmosphere():
+    """A SUAVE US_Standard_1976 analysis that answers compute_values() from
+    the shared table. Variable gamma is left to SUAVE."""
+
+    from SUAVE.Analyses.Atmospheric import US_Standard_1976
+    from SUAVE.Analyses.Mission.Segments.Conditions import Conditions
+
+    class US_Standard_1976_Table(US_Standard_1976):
+
+        def compute_values(self, altitude, temperature_deviation=0.0, var_gamma=False):
+
+            if var_gamma:
+                return US_Standard_1976.compute_values(self, altitude, temperature_deviation, var_gamma)
+
+            altitude = np.atleast_1d(np.asarray(altitude, dtype=float))
+            if altitude.ndim == 1:
+                altitude = altitude[:,None]
+            values   = standard_atmosphere().compute(altitude, temperature_deviation)
+            gas      = self.fluid_properties
+            T        = values['temperature']
+
+            atmo_data = Conditions()
+            atmo_data.expand_rows(altitude.shape[0])
+            for name, value in values.items():
+                atmo_data[name] = value
+            if hasattr(gas, 'compute_thermal_conductivity'):
+                atmo_data.thermal_conductivity = gas.compute_thermal_conductivity(T)
+            if hasattr(gas, 'compute_prandtl_number'):
+                atmo_data.prandtl_number       = gas.compute_prandtl_number(T)
+
+            return atmo_data
+
+    return US_Standard_1976_Table()
+
+# ----------------------------------------------------------------------
+#   ADRpy atmosphere
+# ----------------------------------------------------------------------
+
+def adrpy_atmosphere(delta_ISA=0.):
+    """An ADRpy Atmosphere whose temperature, pressure, density and speed of
+    sound come from the shared table. ADRpy altitudes are geopotential."""
+
+    from ADRpy import atmospheres as at
+
+    table = standard_atmosphere()
+
+    def geometric(altitude_m):
+        H = np.asarray(altitude_m, dtype=float)
+        return H / (1. - H / EARTH_RADIUS)
+
+    def scalar(value):
+        return value.item() if np.ndim(value) == 0 else value
+
+    class TableAtmosphere(at.Atmosphere):
+
+        def airtemp_c(self, altitude_m=0, *args, **kwargs):
+            return scalar(table.compute(geometric(altitude_m), delta_ISA)['temperature'] - 273.15)
+
+        def airtemp_k(self, altitude_m=0, *args, **kwargs):
+            return scalar(table.compute(geometric(altitude_m), delta_ISA)['temperature'])
+
+        def airpress_pa(self, altitude_m=0, *args, **kwargs):
+            return scalar(table.compute(geometric(altitude_m), delta_ISA)['pressure'])
+
+        def airdens_kgpm3(self, altitude_m=0, *args, **kwargs):
+            return scalar(table.density(geometric(altitude_m), delta_ISA))
+
+        def vsound_mps(self, altitude_m=0, *args, **kwargs):
+            return scalar(table.compute(geometric(altitude_m), delta_ISA)['speed_of_sound'])
+
+    return TableAtmosphere()
@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:10:54 2026
+
+@author: K. Grafton
+
+Benchmarks of the Sling 2 pipeline stages and performance regression
+checks against a saved baseline.
+
+Each benchmark builds what it needs once, untimed, then runs its call a
+few times as warmup and times the rest. The stage group covers
+vehicle_setup(), propeller_design(), mission.evaluate() at 16 control
+points, payload_range, V_n_diagram and a headless main(). The scaling
+group runs the mission at 16 to 256 control points and mission sweeps of
+1 to 1000 points, and is only run when asked for since the largest cases
+take a long time.
+
+    python benchmarks.py --output bench.json --save-baseline
+    python benchmarks.py --baseline benchmark_baseline.json --threshold 0.15
+
+The exit status is 1 when any benchmark's median is slower than its
+baseline median by more than the threshold.
+"""
+
+import fnmatch
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+BASELINE = 'benchmark_baseline.json'
+
+CONTROL_POINTS = (16, 32, 64, 128, 256)
+SWEEP_SIZES    = (1, 10, 100, 1000)
+
+# name -> (group, factory, warmup, repeat). The factory does the untimed
+# setup and returns the call to time.
+BENCHMARKS = {}
+
+def benchmark(name, group='stages', warmup=1, repeat=5):
+
+    def register(factory):
+        BENCHMARKS[name] = (group, factory, warmup, repeat)
+        return factory
+
+    return register
+
+# ----------------------------------------------------------------------
+#   Stages
+# ----------------------------------------------------------------------
+
+@benchmark('vehicle_setup')
+def bench_vehicle_setup():
+
+    import sling2
+
+    # the first (warmup) call fills the propeller design cache, the timed
+    # ones measure the build with a warm cache as the pipeline sees it
+    return sling2.vehicle_setup
+
+@benchmark('propeller_design')
+def bench_propeller_design():
+
+    import sling2
+    from SUAVE.Methods.Propulsion import propeller_design
+    from polar_db import use_polar_db
+
+    def run():
+        with use_polar_db():
+            return propeller_design(sling2.propeller_setup(), 20)
+
+    return run
+
+@benchmark('mission.evaluate')
+def bench_mission_evaluate(number_control_points=16):
+
+    import sling2
+
+    vehicle, analyses = finalized_vehicle()
+
+    # a fresh mission each time, evaluating one leaves its solved
+    # unknowns behind as the next initial guess
+    def run():
+        mission = sling2.mission_setup(analyses, vehicle, number_control_points=number_control_points)
+        return mission.evaluate()
+
+    return run
+
+@benchmark('payload_range')
+def bench_payload_range():
+
+    from payload_range_batch import payload_range_batch
+
+    vehicle, analyses = finalized_vehicle()
+
+    return lambda: payload_range_batch(vehicle, analyses)
+
+@benchmark('V_n_diagram')
+def bench_V_n_diagram():
+
+    import matplotlib.pyplot as plt
+    from SUAVE.Core import Units
+    from SUAVE.Methods.Performance import V_n_diagram
+
+    plt.switch_backend('Agg')
+    vehicle, analyses = finalized_vehicle()
+    weight = vehicle.mass_properties.max_takeoff
+
+    def run():
+        # V_n_diagram writes its log and data files to the working directory
+        with scratch_directory():
+            V_n_diagram(vehicle, analyses, weight, 0. * Units.m, 20. * Units.degC)
+        plt.close('all')
+
+    return run
+
+@benchmark('main', warmup=1, repeat=3)
+def bench_main():
+
+    import sling2
+
+    # headless main() writes nothing but output, so it runs in place: the
+    # airfoil files, the design cache and the polar database are relative
+    # to the working directory and a scratch one would time cold caches
+    def run():
+        with tempfile.TemporaryDirectory() as directory:
+            sling2.main(headless=True, output=os.path.join(directory, 'results.npz'))
+
+    return run
+
+# ----------------------------------------------------------------------
+#   Scaling
+# ----------------------------------------------------------------------
+
+for _n in CONTROL_POINTS:
+    benchmark('mission.evaluate[cp=%d]' % _n, group='scaling', warmup=1, repeat=3)(
+        lambda n=_n: bench_mission_evaluate(n))
+
+def bench_sweep(n_points):
+
+    import numpy as np
+    from SUAVE.Core import Units
+    from mission_sweep import sweep
+
+    # a line of altitudes, so every size is the same sweep sampled finer
+    altitudes = np.linspace(2000., 12000., n_points) * Units.feet
+
+    return lambda: sweep(altitudes, [120. * Units.knots], [700.])
+
+for _n in SWEEP_SIZES:
+    benchmark('sweep[n=%d]' % _n, group='scaling', warmup=0 if _n >= 100 else 1,
+              repeat=1 if _n >= 1000 else 3)(lambda n=_n: bench_sweep(n))
+
+# ----------------------------------------------------------------------
+#   Running
+# ----------------------------------------------------------------------
+
+_vehicle = {}
+
+def finalized_vehicle():
+    """One vehicle and finalized analyses shared by the benchmarks."""
+
+    import sling2
+
+    if not _vehicle:
+        vehicle  = sling2.vehicle_setup()
+        analyses = sling2.base_analysis(vehicle)
+        analyses.finalize()
+        _vehicle['vehicle']  = vehicle
+        _vehicle['analyses'] = analyses
+
+    return _vehicle['vehicle'], _vehicle['analyses']
+
+@contextmanager
+def scratch_directory():
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(cwd)
+
+    return
+
+def select(patterns=None, groups=('stages',)):
+    """Benchmark names matching any of the glob patterns, or every one in
+    groups when no pattern is given."""
+
+    if patterns:
+        return [name for name in BENCHMARKS if any(fnmatch.fnmatchcase(name, p) for p in patterns)]
+
+    return [name for name, (group, *rest) in BENCHMARKS.items() if group in groups]
+
+def run_benchmark(name, warmup=None, repeat=None):
+    """Times one benchmark and returns its statistics in seconds."""
+
+    group, factory, default_warmup, default_repeat = BENCHMARKS[name]
+    warmup = default_warmup if warmup is None else warmup
+    repeat = default_repeat if repeat is None else repeat
+
+    t0  = time.perf_counter()
+    run = factory()
+    setup = time.perf_counter() - t0
+
+    for i in range(warmup):
+        run()
+
+    times = []
+    for i in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - t0)
+
+    return dict(statistics_of(times), group=group, warmup=warmup, setup=setup)
+
+def statistics_of(times):
+
+    ordered = sorted(times)
+    if len(ordered) > 1:
+        quartiles = statistics.quantiles(ordered, n=4)
+        iqr       = quartiles[2] - quartiles[0]
+        stdev     = statistics.stdev(ordered)
+    else:
+        iqr = stdev = 0.
+
+    return {'times':  times,
+            'repeat': len(times),
+            'min':    ordered[0],
+            'median': statistics.median(ordered),
+            'mean':   statistics.fmean(ordered),
+            'stdev':  stdev,
+            'iqr':    iqr,
+            'max':    ordered[-1]}
+
+def run_benchmarks(names, warmup=None, repeat=None, file=None):
+
+    file    = sys.stderr if file is None else file
+    results = {}
+
+    for name in names:
+        results[name] = run_benchmark(name, warmup, repeat)
+        r = results[name]
+        print('%-28s median %9.4f s  min %9.4f s  iqr %8.4f s  (%d runs)'
+              % (name, r['median'], r['min'], r['iqr'], r['repeat']), file=file)
+
+    return {'environment': environment(), 'benchmarks': results}
+
+def environment():
+
+    import subprocess
+
+    env = {'python':    platform.python_version(),
+           'platform':  platform.platform(),
+           'machine':   platform.machine(),
+           'cpu_count': os.cpu_count(),
+           'time':      time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+    for module in ('SUAVE', 'numpy', 'scipy'):
+        try:
+            env[module] = __import__(module).__version__
+        except ImportError:
+            env[module] = None
+
+    try:
+        env['commit'] = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        env['commit'] = None
+
+    return env
+
+# ----------------------------------------------------------------------
+#   Baseline comparison
+# ----------------------------------------------------------------------
+
+def compare(results, baseline, threshold=0.10, min_delta=0.005):
+    """Compares medians against the baseline. A benchmark regresses when
+    it is slower by more than threshold (fractional) and by more than
+    min_delta seconds, so millisecond stages do not trip on noise. Returns
+    a row per benchmark found in both."""
+
+    rows = []
+    for name, current in results['benchmarks'].items():
+        base = baseline['benchmarks'].get(name)
+        if base is None:
+            continue
+        ratio     = current['median'] / base['median'] if base['median'] > 0. else float('inf')
+        regressed = (ratio > 1. + threshold and current['median'] - base['median'] > min_delta)
+        rows.append({'name':      name,
+                     'baseline':  base['median'],
+                     'current':   current['median'],
+                     'ratio':     ratio,
+                     'regressed': regressed})
+
+    return rows
+
+def print_comparison(rows, threshold, file=None):
+
+    file = sys.stderr if file is None else file
+    print('%-28s %11s %11s %8s' % ('benchmark', 'baseline s', 'current s', 'ratio'), file=file)
+    for row in rows:
+        print('%-28s %11.4f %11.4f %7.2fx %s'
+              % (row['name'], row['baseline'], row['current'], row['ratio'],
+                 'REGRESSED (> %.0f%%)' % (100. * threshold) if row['regressed'] else ''), file=file)
+
+    return
+
+def load(path):
+
+    with open(path) as f:
+        return json.load(f)
+
+def save(path, results):
+
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=1)
+
+    return path
+
+# ----------------------------------------------------------------------
+#   Command Line
+# ----------------------------------------------------------------------
+
+def cli(argv=None):
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the Sling 2 pipeline and check for regressions.')
+    parser.add_argument('patterns', nargs='*', help='benchmark names or glob patterns, default the stage group')
+    parser.add_argument('--scaling', action='store_true', help='also run the control-point and sweep scaling cases')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    parser.add_argument('--warmup', type=int, default=None, help='untimed runs before timing, default per benchmark')
+    parser.add_argument('--repeat', type=int, default=None, help='timed runs, default per benchmark')
+    parser.add_argument('--output', default=None, help='write the results to this JSON file')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed fractional slowdown of the median')
+    parser.add_argument('--min-delta', type=float, default=0.005, help='slowdowns below this many seconds never fail')
+    args = parser.parse_args(argv)
+
+    names = select(args.patterns, ('stages', 'scaling') if args.scaling else ('stages',))
+
+    if args.list:
+        for name in names:
+            group, factory, warmup, repeat = BENCHMARKS[name]
+            print('%-28s %-8s warmup %d, repeat %d' % (name, group, warmup, repeat))
+        return 0
+
+    results = run_benchmarks(names, args.warmup, args.repeat)
+
+    if args.output:
+        save(args.output, results)
+
+    if args.save_baseline:
+        # merge, so saving a subset keeps the other baselines
+        baseline = load(args.baseline) if os.path.exists(args.baseline) else {'benchmarks': {}}
+        baseline['benchmarks'].update(results['benchmarks'])
+        baseline['environment'] = results['environment']
+        save(args.baseline, baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('no baseline at %s, run with --save-baseline to create one' % args.baseline, file=sys.stderr)
+        return 0
+
+    rows = compare(results, load(args.baseline), args.threshold, args.min_delta)
+    print_comparison(rows, args.threshold)
+
+    return 1 if any(row['regressed'] for row in rows) else 0
+
+if __name__ == '__main__':
+    sys.exit(cli())
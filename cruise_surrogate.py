@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:26:58 2026
+
+@author: K. Grafton
+
+Response-surface surrogate of the cruise segment for millisecond fuel and
+range queries. Training runs the mission_setup() cruise over an altitude,
+air speed and takeoff mass grid at the longest distance of interest. The
+cruise is steady, so the fuel burned to any shorter distance is read off
+the same solution and distance costs no extra samples. The fuel table is
+then interpolated over (distance, altitude, air speed, takeoff mass).
+
+Queries outside the trained box fall back to a real mission evaluation.
+All values SI.
+"""
+
+import json
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+
+import mission_sweep
+
+AXES = ('distance', 'altitude', 'air_speed', 'takeoff_mass')
+
+# fewest points per axis RegularGridInterpolator's splines accept
+MIN_POINTS = {'cubic': 4, 'quintic': 6}
+
+class CruiseSurrogate:
+
+    def __init__(self, axes, fuel, metadata=None, method='cubic'):
+
+        self.axes     = [np.asarray(a, dtype=float) for a in axes]
+        self.fuel     = np.asarray(fuel, dtype=float)
+        self.metadata = metadata or {}
+        self.method   = method
+        self._interp  = RegularGridInterpolator(self.axes, self.fuel, method=method)
+
+    # ------------------------------------------------------------------
+    #   Queries
+    # ------------------------------------------------------------------
+
+    def in_domain(self, *values):
+
+        values = np.broadcast_arrays(*[np.asarray(v, dtype=float) for v in values])
+        inside = np.ones(values[0].shape, dtype=bool)
+        for axis, value in zip(self.axes, values):
+            inside &= (value >= axis[0]) & (value <= axis[-1])
+
+        return inside
+
+    def fuel_burn(self, distance, altitude, air_speed, takeoff_mass, fallback=True):
+        """Fuel burned over the distance, vectorised over broadcast inputs.
+        Points outside the trained box are evaluated for real, or NaN with
+        fallback=False."""
+
+        values = np.broadcast_arrays(*[np.asarray(v, dtype=float)
+                                       for v in (distance, altitude, air_speed, takeoff_mass)])
+        shape  = values[0].shape
+        points = np.column_stack([v.ravel() for v in values])
+        inside = self.in_domain(*points.T)
+
+        fuel         = np.full(len(points), np.nan)
+        fuel[inside] = self._interp(points[inside])
+
+        if fallback:
+            for i in np.nonzero(~inside)[0]:
+                d, h, v, m = points[i]
+                fuel[i]    = evaluate_fuel_curve(h, v, m, [d], d)[0][0]
+
+        return fuel.reshape(shape)
+
+    def range(self, fuel, altitude, air_speed, takeoff_mass, n_distance=256, fallback=True):
+        """Distance flown on the given fuel, the inverse of fuel_burn()."""
+
+        values = np.broadcast_arrays(*[np.asarray(v, dtype=float)
+                                       for v in (fuel, altitude, air_speed, takeoff_mass)])
+        shape  = values[0].shape
+        fuel, h, v, m = [x.ravel() for x in values]
+
+        d      = np.linspace(self.axes[0][0], self.axes[0][-1], n_distance)
+        inside = self.in_domain(d[-1], h, v, m)
+
+        ranges = np.full(fuel.size, np.nan)
+        if inside.any():
+            n      = int(inside.sum())
+            pts    = np.column_stack([np.repeat(d[None,:], n, axis=0).ravel(),
+                                      np.repeat(h[inside], n_distance),
+                                      np.repeat(v[inside], n_distance),
+                                      np.repeat(m[inside], n_distance)])
+            curves = self._interp(pts).reshape(n, n_distance)
+            ranges[inside] = invert_curves(d, curves, fuel[inside])
+
+        if fallback:
+            # outside the box, or past the longest trained distance
+            for i in np.nonzero(~inside | np.isnan(ranges))[0]:
+                far       = 2. * self.axes[0][-1]
+                d_fine    = np.linspace(0., far, n_distance)
+                curve, ok = evaluate_fuel_curve(h[i], v[i], m[i], d_fine, far)
+                ranges[i] = invert_curves(d_fine, curve[None,:], fuel[i:i+1])[0]
+
+        return ranges.reshape(shape)
+
+    # ------------------------------------------------------------------
+    #   Storage
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+
+        arrays = {'axis_' + name: axis for name, axis in zip(AXES, self.axes)}
+        np.savez(path, fuel=self.fuel, method=np.array(self.method),
+                 metadata=np.array(json.dumps(self.metadata)), **arrays)
+
+        return path
+
+    @classmethod
+    def load(cls, path):
+
+        with np.load(path) as data:
+            axes     = [data['axis_' + name] for name in AXES]
+            fuel     = data['fuel']
+            method   = str(data['method'])
+            metadata = json.loads(str(data['metadata']))
+
+        return cls(axes, fuel, metadata, method)
+
+# ----------------------------------------------------------------------
+#   Training
+# ----------------------------------------------------------------------
+
+def train(altitudes, air_speeds, takeoff_masses, max_distance, n_distance=25,
+          method='cubic', n_validation=20, max_workers=None, chunksize=4, seed=0):
+    """Samples the cruise mission on the grid and returns the fitted
+    surrogate, with a validation error estimate from n_validation random
+    real evaluations inside the box. A spline method is dropped to
+    'linear' if an axis is too short for it. Samples that do not converge
+    are solved again from a cold start, and any still unconverged are
+    filled from their converged neighbours with a warning."""
+
+    altitudes      = np.atleast_1d(np.asarray(altitudes, dtype=float))
+    air_speeds     = np.atleast_1d(np.asarray(air_speeds, dtype=float))
+    takeoff_masses = np.atleast_1d(np.asarray(takeoff_masses, dtype=float))
+    # before any solve is dispatched
+    method         = interpolation_method(method, (n_distance, len(altitudes), len(air_speeds),
+                                                   len(takeoff_masses)))
+
+    t0        = time.time()
+    distances = np.linspace(0., max_distance, n_distance)
+    points    = mission_sweep.grid_points(altitudes, air_speeds, takeoff_masses)
+    curves    = np.zeros((len(points), n_distance))
+    converged = np.zeros(len(points), dtype=bool)
+
+    for index, fuel, ok in _iter_curves(points, distances, max_workers, chunksize):
+        curves[index]    = fuel
+        converged[index] = ok
+
+    # a poor warm start is the usual cause
+    retry = np.nonzero(~converged)[0]
+    if len(retry):
+        for index, fuel, ok in _iter_curves(points[retry], distances, max_workers, chunksize,
+                                            warm_start=False):
+            curves[retry[index]]    = fuel
+            converged[retry[index]] = ok
+
+    shape  = (len(altitudes), len(air_speeds), len(takeoff_masses))
+    curves = curves.reshape(shape + (n_distance,))
+    if not converged.any():
+        raise RuntimeError('no cruise sample converged, cannot build the surrogate')
+    if not converged.all():
+        warnings.warn('%d of %d cruise samples did not converge, filled from their neighbours'
+                      % ((~converged).sum(), len(points)))
+        curves = fill_unconverged(curves, converged.reshape(shape))
+
+    fuel = np.moveaxis(curves, -1, 0)
+
+    metadata = {'created':          time.strftime('%Y-%m-%d %H:%M:%S'),
+                'training_seconds': time.time() - t0,
+                'samples':          int(len(points)),
+                'resolved':         int(len(retry)),
+                'unconverged':      int((~converged).sum()),
+                'method':           method}
+
+    surrogate = CruiseSurrogate([distances, altitudes, air_speeds, takeoff_masses], fuel,
+                                metadata, method)
+
+    if n_validation:
+        surrogate.metadata['validation'] = validate(surrogate, n_validation, max_workers, seed)
+
+    return surrogate
+
+def interpolation_method(method, sizes):
+    """The method, or 'linear' with a warning if an axis has fewer points
+    than the method needs."""
+
+    if min(sizes) < 1:
+        raise ValueError('every surrogate axis needs at least one point')
+
+    short = [name for name, n in zip(AXES, sizes) if n < MIN_POINTS.get(method, 1)]
+    if short:
+        warnings.warn("%s needs %d points per axis, %s too short, using 'linear'"
+                      % (method, MIN_POINTS[method], ', '.join(short)))
+        return 'linear'
+
+    return method
+
+def fill_unconverged(curves, converged):
+    """Replaces the fuel curves of the unconverged grid nodes with the mean
+    of their converged, or already filled, neighbours along each axis."""
+
+    curves = curves.copy()
+    known  = converged.copy()
+
+    while not known.all():
+        total = np.zeros(curves.shape)
+        count = np.zeros(known.shape)
+        for axis in range(known.ndim):
+            for shift in (1, -1):
+                k = np.roll(known, shift, axis)
+                v = np.roll(curves, shift, axis)
+                # np.roll wraps round, the wrapped edge is not a neighbour
+                edge       = [slice(None)] * known.ndim
+                edge[axis] = 0 if shift == 1 else -1
+                k[tuple(edge)] = False
+                total += np.where(k[...,None], v, 0.)
+                count += k
+        new          = ~known & (count > 0)
+        curves[new]  = total[new] / count[new][:,None]
+        known       |= new
+
+    return curves
+
+def validate(surrogate, n_samples, max_workers=None, seed=0):
+    """Compares the surrogate against real evaluations at random points."""
+
+    rng    = np.random.default_rng(seed)
+    points = np.column_stack([rng.uniform(a[0], a[-1], n_samples) for a in surrogate.axes])
+
+    truth     = np.zeros(n_samples)
+    converged = np.zeros(n_samples, dtype=bool)
+    for index, fuel, ok in _iter_curves(points[:,1:], None, max_workers, 1, points[:,0]):
+        truth[index]     = fuel[:,-1]
+        converged[index] = ok
+
+    # an unconverged truth is no measure of the surrogate
+    points = points[converged]
+    truth  = truth[converged]
+    if not len(truth):
+        return {'samples': 0}
+
+    error  = surrogate.fuel_burn(*points.T, fallback=False) - truth
+    scale  = np.maximum(np.abs(truth), 1e-9)
+
+    return {'samples':             int(len(truth)),
+            'max_abs_error':       float(np.max(np.abs(error))),
+            'rms_error':           float(np.sqrt(np.mean(error**2))),
+            'max_relative_error':  float(np.max(np.abs(error) / scale))}
+
+def _iter_curves(points, distances, max_workers, chunksize, point_distances=None, warm_start=True):
+
+    chunks = [np.arange(i, min(i + chunksize, len(points)))
+              for i in range(0, len(points), chunksize)]
+
+    def task(index):
+        dist = None if point_distances is None else point_distances[index]
+        return points[index], distances, dist, warm_start
+
+    if max_workers == 0:
+        mission_sweep.init_worker()
+        for index in chunks:
+            yield (index,) + fuel_curve_chunk(*task(index))
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=mission_sweep.init_worker) as pool:
+        futures = {pool.submit(fuel_curve_chunk, *task(index)): index for index in chunks}
+        for future in as_completed(futures):
+            yield (futures[future],) + future.result()
+
+    return
+
+def fuel_curve_chunk(points, distances=None, point_distances=None, warm_start=True):
+    """Fuel burned against distance for each (altitude, air speed, mass)
+    point, flown to the last distance (or to that point's own distance)."""
+
+    n_out     = 1 if distances is None else len(distances)
+    fuel      = np.zeros((len(points), n_out))
+    converged = np.zeros(len(points), dtype=bool)
+
+    for i, (altitude, air_speed, takeoff_mass) in enumerate(points):
+        if distances is None:
+            d = np.array([point_distances[i]])
+        else:
+            d = distances
+        fuel[i], converged[i] = evaluate_fuel_curve(altitude, air_speed, takeoff_mass, d, d[-1],
+                                                    warm_start)
+
+    return fuel, converged
+
+def evaluate_fuel_curve(altitude, air_speed, takeoff_mass, distances, flown_distance,
+                        warm_start=True):
+    """Real cruise evaluation to flown_distance. Returns the fuel burned
+    interpolated at the requested distances and the converged flag."""
+
+    distances = np.asarray(distances, dtype=float)
+    if flown_distance <= 0.:
+        return np.zeros(distances.shape), True
+
+    results = mission_sweep.evaluate_point(altitude, air_speed, takeoff_mass,
+                                           distance=flown_distance, warm_start=warm_start)
+    segment = results.segments.cruise
+    state   = mission_sweep.segment_state(segment)
+
+    x    = segment.conditions.frames.inertial.position_vector[:,0]
+    mass = segment.conditions.weights.total_mass[:,0]
+
+    return np.interp(distances, x - x[0], mass[0] - mass), bool(state.numerics.get('converged', True))
+
+def invert_curves(distances, curves, fuel):
+    """Distance at which each monotone fuel curve reaches its fuel value,
+    NaN beyond the end of the curve."""
+
+    curves = np.maximum.accumulate(curves, axis=1)
+    k      = np.sum(curves < fuel[:,None], axis=1)
+    out    = np.full(len(fuel), np.nan)
+
+    ok     = (k > 0) & (k < curves.shape[1])
+    rows   = np.nonzero(ok)[0]
+    k      = k[ok]
+    f0     = curves[rows, k-1]
+    f1     = curves[rows, k]
+    w      = (fuel[rows] - f0) / np.where(f1 > f0, f1 - f0, 1.)
+    out[rows] = distances[k-1] + w * (distances[k] - distances[k-1])
+
+    zero   = fuel <= curves[:,0]
+    out[zero] = distances[0]
+
+    return out
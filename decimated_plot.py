@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:20:36 2026
+
+@author: K. Grafton
+
+Decimated plotting for long time series. Each line is reduced to about
+two points per horizontal pixel of its axes before it is drawn, with
+largest-triangle-three-buckets (shape-preserving, the default) or
+per-bucket min/max (keeps every spike). The full data is kept, and the
+visible range is re-decimated whenever the x limits change, so zooming in
+brings the detail back.
+
+Figures can be rendered to PNG in a process pool with the Agg backend.
+
+    ax = plt.gca()
+    plot(ax, df['missn_time'], df['pitch_deg'], label='pitch_deg')
+"""
+
+import pickle
+import weakref
+
+import numpy as np
+
+POINTS_PER_PIXEL = 2
+
+# axes -> [(line, x, y, method)], the full data behind each decimated line
+_sources = weakref.WeakKeyDictionary()
+
+# ----------------------------------------------------------------------
+#   Decimation
+# ----------------------------------------------------------------------
+
+def lttb(x, y, n_out):
+    """Indices of the n_out points chosen by largest-triangle-three-buckets
+    (Steinarsson 2013). The first and last points are always kept."""
+
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    # n_out - 2 buckets between the fixed end points
+    edges  = np.linspace(1, n - 1, n_out - 1).astype(int)
+    counts = np.diff(edges)
+    x_mean = np.add.reduceat(x[:-1], edges[:-1]) / counts
+    y_mean = np.add.reduceat(y[:-1], edges[:-1]) / counts
+    x_mean = np.append(x_mean, x[-1])
+    y_mean = np.append(y_mean, y[-1])
+
+    chosen    = np.empty(n_out, dtype=int)
+    chosen[0] = 0
+    a         = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # twice the triangle area against the last chosen point and the
+        # mean of the next bucket
+        area = np.abs((x[a] - x_mean[i + 1]) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (y_mean[i + 1] - y[a]))
+        area = np.where(np.isnan(area), -1., area)
+        a    = lo + int(np.argmax(area))
+        chosen[i + 1] = a
+    chosen[-1] = n - 1
+
+    return chosen
+
+def min_max(x, y, n_out):
+    """Indices of the first, last and each bucket's minimum and maximum,
+    in order, about n_out in all."""
+
+    n         = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n_out >= n:
+        return np.arange(n)
+
+    y    = np.asarray(y, dtype=float)
+    size = n // n_buckets
+    body = y[:size * n_buckets].reshape(n_buckets, size)
+
+    # NaNs (gaps) must not hide a bucket's real extremes
+    def lowest(values, axis=None):
+        return np.argmin(np.where(np.isnan(values), np.inf, values), axis=axis)
+
+    def highest(values, axis=None):
+        return np.argmax(np.where(np.isnan(values), -np.inf, values), axis=axis)
+
+    start = np.arange(n_buckets) * size
+    keep  = [start + lowest(body, axis=1), start + highest(body, axis=1), [0, n - 1]]
+    if size * n_buckets < n:
+        tail = y[size * n_buckets:]
+        keep.append(size * n_buckets + np.array([lowest(tail), highest(tail)]))
+
+    return np.unique(np.concatenate(keep))
+
+METHODS = {'lttb': lttb, 'minmax': min_max}
+
+def decimate(x, y, n_out, method='lttb'):
+    """x and y reduced to about n_out points."""
+
+    x = np.asarray(x)
+    y = np.asarray(y)
+    i = METHODS[method](x, y, n_out)
+
+    return x[i], y[i]
+
+# ----------------------------------------------------------------------
+#   Axes
+# ----------------------------------------------------------------------
+
+def plot(ax, x, y, *args, method='lttb', **kwargs):
+    """ax.plot() of a decimated copy of the series, re-decimated on zoom."""
+
+    x = np.asarray(x)
+    y = np.asarray(y)
+
+    n_out = max(int(ax.bbox.width * POINTS_PER_PIXEL), 3)
+    line, = ax.plot(*decimate(x, y, n_out, method), *args, **kwargs)
+    register(ax, line, x, y, method)
+
+    return line
+
+def decimate_axes(ax, method='lttb'):
+    """Decimates every line already drawn on ax, e.g. by a plotting
+    function that draws each point."""
+
+    for line in ax.get_lines():
+        if any(line is l for l, *rest in _sources.get(ax, ())):
+            continue
+        x, y = np.asarray(line.get_xdata()), np.asarray(line.get_ydata())
+        register(ax, line, x, y, method)
+        # the limits may not cover the data yet, the first pass takes it all
+        update_line(ax, line, x, y, method, window=False)
+
+    return ax
+
+def decimate_figure(fig, method='lttb'):
+
+    for ax in fig.get_axes():
+        decimate_axes(ax, method)
+
+    return fig
+
+def register(ax, line, x, y, method='lttb'):
+
+    if ax not in _sources:
+        _sources[ax] = []
+        ax.callbacks.connect('xlim_changed', redraw)
+    _sources[ax].append((line, x, y, method))
+
+    return
+
+def redraw(ax):
+    """xlim_changed callback, re-decimates each line over the new limits."""
+
+    for line, x, y, method in _sources.get(ax, ()):
+        update_line(ax, line, x, y, method)
+
+    return
+
+def update_line(ax, line, x, y, method, window=True):
+
+    n_out = max(int(ax.bbox.width * POINTS_PER_PIXEL), 3)
+
+    # only the visible window, plus a point either side so the line runs
+    # to the edges. Unsorted x is decimated whole.
+    if window and len(x) > 1 and np.all(x[1:] >= x[:-1]):
+        x0, x1 = sorted(ax.get_xlim())
+        i0 = max(int(np.searchsorted(x, x0, side='left')) - 1, 0)
+        i1 = min(int(np.searchsorted(x, x1, side='right')) + 1, len(x))
+        if i1 - i0 >= 2:
+            x, y = x[i0:i1], y[i0:i1]
+
+    line.set_data(*decimate(x, y, n_out, method))
+
+    return
+
+# ----------------------------------------------------------------------
+#   Rendering
+# ----------------------------------------------------------------------
+
+def render_figures(figures, paths, max_workers=None, dpi=None):
+    """Saves each figure to its path as PNG, in a process pool with the Agg
+    backend. The figures are pickled with their decimated data, the zoom
+    callbacks are not carried over. Returns the paths."""
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    figures = list(figures)
+    paths   = list(paths)
+    if len(figures) <= 1 or max_workers == 0:
+        for fig, path in zip(figures, paths):
+            fig.savefig(path, dpi=dpi)
+        return paths
+
+    data = [pickle.dumps(fig) for fig in figures]
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=use_agg) as pool:
+        list(pool.map(save_pickled_figure, data, paths, [dpi] * len(paths)))
+
+    return paths
+
+def use_agg():
+
+    import matplotlib
+    matplotlib.use('Agg')
+
+    return
+
+def save_pickled_figure(data, path, dpi=None):
+
+    use_agg()
+    fig = pickle.loads(data)
+    fig.savefig(path, dpi=dpi)
+
+    return path
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:02:11 2026
+
+@author: K. Grafton
+
+On-disk cache for the designed propeller. Entries are keyed on a hash of
+the propeller inputs and of the airfoil geometry/polar files it reads, so
+any edit to either forces a fresh propeller_design(). Only the inputs in
+PROPELLER_INPUTS are hashed, so keys are the same in every process and
+interpreter run.
+"""
+
+import hashlib
+import os
+import pickle
+
+import numpy as np
+
+CACHE_DIR = os.environ.get('SLING2_CACHE_DIR', '.sling2_cache')
+
+# the propeller_setup() attributes propeller_design() reads or passes
+# through to the designed propeller, the airfoil files are hashed by content
+PROPELLER_INPUTS = ('number_of_blades', 'tip_radius', 'hub_radius', 'design_Cl', 'angular_velocity',
+                    'design_power', 'design_thrust', 'design_altitude', 'freestream_velocity',
+                    'variable_pitch', 'origin', 'orientation_euler_angles', 'airfoil_polar_stations',
+                    'airfoil_geometry', 'airfoil_polars', 'tag')
+
+def cached_propeller_design(prop, number_of_stations=20, cache_dir=CACHE_DIR):
+
+    from SUAVE.Methods.Propulsion import propeller_design
+    from polar_db import use_polar_db
+
+    key  = propeller_design_key(prop, number_of_stations)
+    path = os.path.join(cache_dir, 'propeller_' + key + '.pkl')
+
+    designed = load_entry(path)
+    if designed is not None:
+        return designed
+
+    with use_polar_db():
+        designed = propeller_design(prop, number_of_stations)
+    store_entry(path, designed)
+
+    return designed
+
+def propeller_design_key(prop, number_of_stations=20, version=None):
+    """Cache key of a propeller_design() run, for the installed SUAVE
+    unless another version is given."""
+
+    if version is None:
+        import SUAVE
+        version = SUAVE.__version__
+
+    h = hashlib.sha256()
+    h.update(version.encode())
+    h.update(str(number_of_stations).encode())
+    hash_value(h, {name: prop.get(name) for name in PROPELLER_INPUTS})
+
+    for path in airfoil_files(prop):
+        h.update(path.encode())
+        with open(path, 'rb') as f:
+            h.update(f.read())
+
+    return h.hexdigest()[:32]
+
+def airfoil_files(prop):
+
+    files = []
+    for entry in (prop.get('airfoil_geometry') or []):
+        files.append(entry)
+    for polars in (prop.get('airfoil_polars') or []):
+        files.extend(polars)
+
+    return files
+
+def load_entry(path):
+
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        # missing, half-written or stale entries are simply rebuilt
+        return None
+
+def store_entry(path, value):
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    # many processes may race on the same key, write-then-rename keeps
+    # readers from ever seeing a partial pickle
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    try:
+        with open(tmp, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    return
+
+def hash_value(h, value):
+    """Feeds value into the hash h. Only types whose text is the same in
+    every process are accepted, a repr() holding an object address would
+    give a new key each run."""
+
+    if isinstance(value, dict):
+        h.update(b'{')
+        for k in sorted(value.keys(), key=str):
+            h.update(str(k).encode())
+            hash_value(h, value[k])
+        h.update(b'}')
+    elif isinstance(value, (list, tuple)):
+        h.update(b'[')
+        for v in value:
+            hash_value(h, v)
+        h.update(b']')
+    elif isinstance(value, np.ndarray):
+        h.update(str(value.dtype).encode() + str(value.shape).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif value is None or isinstance(value, (bool, int, float, complex, str, np.generic)):
+        h.update(repr(value).encode())
+    elif isinstance(value, bytes):
+        h.update(value)
+    elif isinstance(value, type):
+        h.update(('%s.%s' % (value.__module__, value.__qualname__)).encode())
+    else:
+        raise TypeError('%s values cannot be hashed into a cache key' % type(value).__name__)
+
+    return
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 00:05:43 2026
+
+@author: K. Grafton
+
+X-Plane flights against the SUAVE mission. Each log is aligned with the
+mission results by time or by distance flown since the start of its
+window, the mission is interpolated onto the log samples and the
+residuals (log - model) of airspeed, pitch, fuel flow and throttle are
+summarised per log. Logs are read through the columnar store and compared
+in a process pool, only the reduced mission arrays are sent to workers.
+
+Residuals in KEAS, degrees, kg/h and throttle fraction.
+
+    logs  = glob.glob('flights/*.txt')
+    table = compare_logs(logs, align='distance')
+    write_comparison('validation.dat', table, logs)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from vn_envelope import KNOT, LB, RHO_SL
+from xplane_analysis import TIME, read_header
+
+# quantity -> (X-Plane column, factor to the units above). The log names
+# depend on which data-output rows were enabled, override as needed.
+XPLANE_COLUMNS = {'air_speed': ('_Vind_keas', 1.),
+                  'pitch':     ('pitch_deg',  1.),
+                  'fuel_flow': ('FUEL1lb/h',  LB),
+                  'throttle':  ('thro1_part', 1.)}
+
+# true airspeed, integrated for the distance alignment
+XPLANE_TRUE_AIRSPEED = ('Vtrue_ktas', KNOT)
+
+QUANTITIES = tuple(XPLANE_COLUMNS)
+
+# log is the index of the log in the list compared, paths have no fixed length
+COMPARISON_DTYPE = np.dtype([('log', 'i8'), ('n_points', 'i8'), ('duration', 'f8'), ('distance', 'f8')]
+                            + [('%s_%s' % (q, s), 'f8') for q in QUANTITIES
+                               for s in ('bias', 'rms', 'max')])
+
+# ----------------------------------------------------------------------
+#   Mission reference
+# ----------------------------------------------------------------------
+
+def mission_reference(results):
+    """The mission as flat arrays in the comparison units, segments joined
+    end to end: time (s), distance (m), air_speed (KEAS), pitch (deg),
+    fuel_flow (kg/h) and throttle."""
+
+    columns = {name: [] for name in ('time', 'distance') + QUANTITIES}
+
+    for segment in results.segments.values():
+        c   = segment.conditions
+        v   = c.freestream.velocity[:,0]
+        rho = c.freestream.density[:,0]
+        columns['time'].append(c.frames.inertial.time[:,0])
+        columns['distance'].append(c.frames.inertial.position_vector[:,0])
+        columns['air_speed'].append(v * np.sqrt(rho / RHO_SL) / KNOT)
+        columns['pitch'].append(np.degrees(c.frames.body.inertial_rotations[:,1]))
+        columns['fuel_flow'].append(c.weights.vehicle_mass_rate[:,0] * 3600.)
+        columns['throttle'].append(c.propulsion.throttle[:,0])
+
+    reference = {name: np.concatenate(values) for name, values in columns.items()}
+
+    # segments share their boundary points, keep the first of each
+    keep = np.concatenate([[True], np.diff(reference['time']) > 0.])
+
+    return {name: values[keep] for name, values in reference.items()}
+
+def default_results():
+    """The cruise mission of sling2.main()."""
+
+    import sling2
+
+    vehicle  = sling2.vehicle_setup()
+    analyses = sling2.base_analysis(vehicle)
+    analyses.finalize()
+
+    return sling2.mission_setup(analyses, vehicle).evaluate()
+
+# ----------------------------------------------------------------------
+#   Comparison
+# ----------------------------------------------------------------------
+
+def compare_logs(paths, results=None, align='time', windows=None, max_workers=None, chunksize=4,
+                 columns=None):
+    """Compares every log with the mission and returns a COMPARISON_DTYPE
+    row per log, in the order given, its 'log' field the index into paths.
+
+    results is one SUAVE mission result for all logs or {path: results}
+    for logs flown at different conditions, default the sling2 cruise.
+    windows optionally gives {path: (start, end)} in missn_time to cut the
+    cruise out of each log. align is 'time' or 'distance'. max_workers=0
+    compares in the calling process."""
+
+    paths   = list(paths)
+    windows = windows or {}
+    columns = dict(XPLANE_COLUMNS, **(columns or {}))
+
+    if results is None:
+        results = default_results()
+    # SUAVE results are a dict too
+    if isinstance(results, dict) and 'segments' not in results:
+        references = {path: mission_reference(r) for path, r in results.items()}
+        missing    = [path for path in paths if path not in references]
+        if missing:
+            raise KeyError('no mission results for ' + ', '.join(missing))
+    else:
+        reference  = mission_reference(results)
+        references = {path: reference for path in paths}
+
+    jobs = [(path, references[path], windows.get(path, (None, None)), align, columns, index)
+            for index, path in enumerate(paths)]
+
+    if max_workers == 0:
+        rows = [compare_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            rows = list(pool.map(compare_job, jobs, chunksize=chunksize))
+
+    return np.array(rows, dtype=COMPARISON_DTYPE)
+
+def compare_job(job):
+
+    return compare_log(*job)
+
+def compare_log(path, reference, window=(None, None), align='time', columns=XPLANE_COLUMNS, index=0):
+    """One COMPARISON_DTYPE row, index going in its 'log' field.
+    Quantities whose column the log does not carry are NaN."""
+
+    from xplane_store import open_log
+
+    names   = set(read_header(path))
+    present = {q: columns[q] for q in QUANTITIES if columns[q][0] in names}
+    wanted  = [column for column, factor in present.values()]
+    if align == 'distance' and XPLANE_TRUE_AIRSPEED[0] not in names:
+        raise KeyError('%s has no %s to align by distance' % (path, XPLANE_TRUE_AIRSPEED[0]))
+    # for the distance flown whichever the alignment
+    if XPLANE_TRUE_AIRSPEED[0] in names:
+        wanted.append(XPLANE_TRUE_AIRSPEED[0])
+
+    data = open_log(path).arrays(window[0], window[1], wanted)
+    time = np.asarray(data[TIME], dtype=float)
+    time = time - time[0] if len(time) else time
+
+    distance = np.zeros_like(time)
+    if XPLANE_TRUE_AIRSPEED[0] in data:
+        v = np.asarray(data[XPLANE_TRUE_AIRSPEED[0]], dtype=float) * XPLANE_TRUE_AIRSPEED[1]
+        distance[1:] = np.cumsum(0.5 * (v[1:] + v[:-1]) * np.diff(time))
+
+    if align == 'time':
+        x_log, x_model = time, reference['time'] - reference['time'][0]
+    elif align == 'distance':
+        x_log, x_model = distance, reference['distance'] - reference['distance'][0]
+    else:
+        raise ValueError("align must be 'time' or 'distance', not %r" % align)
+
+    # only the samples the mission covers
+    inside = (x_log >= x_model[0]) & (x_log <= x_model[-1])
+
+    row = np.zeros((), dtype=COMPARISON_DTYPE)
+    row['log']      = index
+    row['n_points'] = int(np.count_nonzero(inside))
+    row['duration'] = time[inside][-1] - time[inside][0] if row['n_points'] else 0.
+    row['distance'] = distance[inside][-1] - distance[inside][0] if row['n_points'] else 0.
+
+    for q in QUANTITIES:
+        if q not in present or not row['n_points']:
+            for s in ('bias', 'rms', 'max'):
+                row['%s_%s' % (q, s)] = np.nan
+            continue
+        column, factor = present[q]
+        measured = np.asarray(data[column], dtype=float)[inside] * factor
+        residual = measured - np.interp(x_log[inside], x_model, reference[q])
+        row[q + '_bias'] = np.nanmean(residual)
+        row[q + '_rms']  = np.sqrt(np.nanmean(residual**2))
+        row[q + '_max']  = np.nanmax(np.abs(residual))
+
+    return row.item()
+
+# ----------------------------------------------------------------------
+#   Output
+# ----------------------------------------------------------------------
+
+def write_comparison(path, table, logs):
+    """Writes the table with each row's log path, logs being the list
+    the table was compared from."""
+
+    table  = np.atleast_1d(table)
+    fields = COMPARISON_DTYPE.names[1:]
+
+    with open(path, 'w') as f:
+        f.write('# X-Plane logs against the SUAVE mission (log - model): KEAS, deg, kg/h, throttle\n')
+        f.write('# ' + ' '.join(fields) + ' log\n')
+        for row in table:
+            f.write(' '.join('%14.6g' % row[name] for name in fields) + ' ' + logs[row['log']] + '\n')
+
+    return path
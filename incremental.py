@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 01:37:09 2026
+
+@author: K. Grafton
+
+Incremental evaluation of the Sling 2 pipeline. Each stage records which
+inputs it reads while it runs, and its output is memoized on a hash of
+those input values and of the stages it depends on. After an edit only
+the stages that read a changed input, and the stages downstream of them,
+run again, e.g. a new cruise air speed re-solves the mission but keeps
+the vehicle, propeller and finalized analyses.
+
+    model   = sling2_pipeline()
+    results = model.get('results')
+    model.set(air_speed=130. * Units.knots)
+    results = model.get('results')     # model.recomputed == ['mission', 'results']
+
+Stage outputs are shared SUAVE objects, stages must not modify what they
+receive from upstream beyond what the pipeline would redo anyway.
+"""
+
+import hashlib
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from design_cache import hash_value
+
+class Pipeline:
+
+    def __init__(self, inputs=None, cache_size=8):
+
+        self.inputs     = dict(inputs or {})
+        self.cache_size = cache_size
+        self.stages     = OrderedDict()
+        self.recomputed = []
+
+    def stage(self, name, depends=()):
+        """Decorator registering fn(inputs, **upstream outputs) as a stage."""
+
+        def register(fn):
+            self.stages[name] = {'fn':      fn,
+                                 'depends': tuple(depends),
+                                 'reads':   None,
+                                 'key':     None,
+                                 'memo':    OrderedDict()}
+            return fn
+
+        return register
+
+    def set(self, **changes):
+
+        self.inputs.update(changes)
+
+        return self
+
+    def get(self, name):
+        """Output of a stage, recomputing it and whatever it depends on
+        only where their inputs changed."""
+
+        self.recomputed = []
+
+        return self._evaluate(name)[0]
+
+    def stale(self, name):
+        """Stages that would run for get(name), in order."""
+
+        stale = []
+        self._key(name, stale)
+
+        return stale
+
+    # ------------------------------------------------------------------
+    #   Evaluation
+    # ------------------------------------------------------------------
+
+    def _evaluate(self, name):
+
+        stage    = self.stages[name]
+        upstream = {dep: self._evaluate(dep) for dep in stage['depends']}
+        key      = self._stage_key(stage, {dep: k for dep, (value, k) in upstream.items()})
+
+        if key is not None and key in stage['memo']:
+            stage['memo'].move_to_end(key)
+            stage['key'] = key
+            return stage['memo'][key], key
+
+        reads  = Reads(self.inputs)
+        output = stage['fn'](reads, **{dep: value for dep, (value, k) in upstream.items()})
+
+        stage['reads'] = sorted(reads.keys_read)
+        key            = self._stage_key(stage, {dep: k for dep, (value, k) in upstream.items()})
+        stage['key']   = key
+        stage['memo'][key] = output
+        while len(stage['memo']) > self.cache_size:
+            stage['memo'].popitem(last=False)
+        self.recomputed.append(name)
+
+        return output, key
+
+    def _key(self, name, stale):
+        """Key the stage would have now, noting the stages without a memo
+        for theirs."""
+
+        stage    = self.stages[name]
+        upstream = {dep: self._key(dep, stale) for dep in stage['depends']}
+        key      = self._stage_key(stage, upstream)
+
+        if key is None or key not in stage['memo']:
+            if name not in stale:
+                stale.append(name)
+
+        return key
+
+    def _stage_key(self, stage, upstream_keys):
+        """Hash of the inputs the stage read last time and its upstream
+        keys, None before it has run or when an upstream stage has none."""
+
+        if stage['reads'] is None or any(k is None for k in upstream_keys.values()):
+            return None
+
+        h = hashlib.sha256()
+        hash_value(h, {name: self.inputs.get(name, Missing) for name in stage['reads']})
+        hash_value(h, upstream_keys)
+
+        return h.hexdigest()
+
+class Reads(Mapping):
+    """Read-only view of the inputs that remembers every key looked up,
+    including keys that were missing."""
+
+    def __init__(self, inputs):
+
+        self._inputs   = inputs
+        self.keys_read = set()
+
+    def __getitem__(self, key):
+
+        self.keys_read.add(key)
+
+        return self._inputs[key]
+
+    def __iter__(self):
+
+        # iterating reads everything
+        self.keys_read.update(self._inputs)
+
+        return iter(self._inputs)
+
+    def __len__(self):
+
+        return len(self._inputs)
+
+class Missing:
+    """Stands in for an input that was read but not set."""
+
+# ----------------------------------------------------------------------
+#   Sling 2
+# ----------------------------------------------------------------------
+
+MASS_INPUTS = ('max_takeoff', 'takeoff', 'operating_empty', 'max_zero_fuel')
+
+def sling2_pipeline(**inputs):
+    """The stages of sling2.main(). Inputs left unset take the sling2
+    defaults:
+
+        propeller_map, propeller_inputs     vehicle
+        max_takeoff, takeoff, operating_empty, max_zero_fuel (kg)
+        drag_area (m^2)                      analyses
+        altitude, air_speed, distance, rpm, number_control_points
+        reserves (kg)                        payload_range
+        vn_weight (kg), vn_altitude (m), delta_ISA (K)
+    """
+
+    model = Pipeline(inputs)
+
+    @model.stage('vehicle')
+    def vehicle(inputs):
+        import sling2
+        vehicle = sling2.vehicle_setup(propeller_map=inputs.get('propeller_map', False),
+                                       propeller_inputs=inputs.get('propeller_inputs'))
+        for name in MASS_INPUTS:
+            if inputs.get(name) is not None:
+                vehicle.mass_properties[name] = inputs[name]
+        return vehicle
+
+    @model.stage('configs', depends=['vehicle'])
+    def configs(inputs, vehicle):
+        import sling2
+        configs = sling2.configs_setup(vehicle)
+        configs.finalize()
+        return configs
+
+    @model.stage('analyses', depends=['vehicle'])
+    def analyses(inputs, vehicle):
+        import sling2
+        analyses = sling2.base_analysis(vehicle, drag_area=inputs.get('drag_area'))
+        analyses.finalize()
+        return analyses
+
+    @model.stage('mission', depends=['vehicle', 'analyses'])
+    def mission(inputs, vehicle, analyses):
+        import sling2
+        return sling2.mission_setup(analyses, vehicle,
+                                    altitude  = inputs.get('altitude'),
+                                    air_speed = inputs.get('air_speed'),
+                                    distance  = inputs.get('distance'),
+                                    rpm       = inputs.get('rpm', 5500),
+                                    number_control_points = inputs.get('number_control_points', 16))
+
+    @model.stage('results', depends=['mission'])
+    def results(inputs, mission):
+        return mission.evaluate()
+
+    @model.stage('payload_range', depends=['vehicle', 'analyses'])
+    def payload_range(inputs, vehicle, analyses):
+        from payload_range_batch import payload_range_batch
+        return payload_range_batch(vehicle, analyses, reserves=inputs.get('reserves', 0.))[0]
+
+    @model.stage('vn', depends=['vehicle'])
+    def vn(inputs, vehicle):
+        from vn_envelope import vn_envelopes
+        weight = inputs.get('vn_weight')
+        if weight is None:
+            weight = vehicle.mass_properties.max_takeoff
+        return vn_envelopes(vehicle, weight, inputs.get('vn_altitude', 0.), inputs.get('delta_ISA', 20.))
+
+    return model
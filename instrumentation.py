@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:02:37 2026
+
+@author: K. Grafton
+
+Stage-level instrumentation of the analysis pipeline. While an
+Instrumentation is active, every stage() block records wall and CPU time,
+the process's peak RSS so far and how much the stage raised it, and how
+many calls the expensive models saw:
+
+    root_finder_calls       mission solves (segment root finder calls)
+    residual_evaluations    residual evaluations inside those solves
+    propeller_spin          blade element Propeller.spin() calls
+    propeller_spin_points   conditions rows passed to those
+    propeller_map_spin      Mapped_Propeller.spin() calls
+    propeller_map_fallback  of those, calls off the map that spun the
+                            blade element model instead
+    aerodynamics_evaluate   aerodynamics analysis evaluations
+
+Nested stages include their children. Results are written as JSON or as
+Chrome trace events (chrome://tracing, Perfetto), and the stages at one
+nesting depth can each be captured with cProfile (only one profiler can
+run at a time).
+
+    with Instrumentation(profile_dir='profiles') as inst:
+        with stage('mission.evaluate'):
+            results = mission.evaluate()
+    inst.write('stages.json')
+"""
+
+import cProfile
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# the active Instrumentation, if any
+_active = None
+
+COUNTERS = ('root_finder_calls', 'residual_evaluations', 'propeller_spin',
+            'propeller_spin_points', 'propeller_map_spin', 'propeller_map_fallback',
+            'aerodynamics_evaluate')
+
+class Instrumentation:
+
+    def __init__(self, profile_dir=None, profile_depth=0, trace_memory=False, patch=True):
+
+        self.profile_dir   = profile_dir
+        self.profile_depth = profile_depth
+        self.trace_memory  = trace_memory
+        self.patch         = patch
+        self.counters      = dict.fromkeys(COUNTERS, 0)
+        self.stages        = []
+        self._open         = []
+        self._restore      = []
+        self._started      = None
+        self._previous     = None
+        self._tracing      = False
+        self._mapped       = None
+
+    def __enter__(self):
+
+        global _active
+
+        self._previous = _active
+        self._started  = time.perf_counter()
+        _active        = self
+
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        if self.patch:
+            self._install_patches()
+
+        return self
+
+    def __exit__(self, *exc):
+
+        global _active
+
+        for restore in reversed(self._restore):
+            restore()
+        self._restore = []
+
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+        _active = self._previous
+
+        return False
+
+    def count(self, name, n=1):
+
+        self.counters[name] = self.counters.get(name, 0) + n
+
+        return
+
+    # ------------------------------------------------------------------
+    #   Stages
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def stage(self, name, **args):
+
+        profiler = None
+        if self.profile_dir and len(self._open) == self.profile_depth:
+            profiler = cProfile.Profile()
+
+        record = {'name':     name,
+                  'depth':    len(self._open),
+                  'start':    time.perf_counter() - self._started,
+                  'args':     args}
+        before = dict(self.counters)
+        rss0   = max_rss()
+
+        if tracemalloc.is_tracing():
+            # peak since the stage started, the enclosing stage keeps its
+            # own running maximum
+            for s in self._open:
+                s['peak'] = max(s.get('peak', 0), tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+
+        self._open.append(record)
+        wall0 = time.perf_counter()
+        cpu0  = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+
+        try:
+            yield record
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            record['wall'] = time.perf_counter() - wall0
+            record['cpu']  = time.process_time() - cpu0
+            self._open.pop()
+
+            if tracemalloc.is_tracing():
+                peak = max(record.pop('peak', 0), tracemalloc.get_traced_memory()[1])
+                record['peak_traced_memory'] = peak
+                for s in self._open:
+                    s['peak'] = max(s.get('peak', 0), peak)
+            # getrusage only has the peak over the process lifetime:
+            # max_rss is that peak at the end of the stage, and
+            # max_rss_growth how far the stage raised it
+            record['max_rss']        = max_rss()
+            record['max_rss_growth'] = record['max_rss'] - rss0
+            record['counters'] = {k: v - before.get(k, 0) for k, v in self.counters.items()}
+
+            if profiler is not None:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                record['profile'] = os.path.join(self.profile_dir,
+                                                 '%02d_%s.prof' % (len(self.stages), safe_name(name)))
+                profiler.dump_stats(record['profile'])
+
+            self.stages.append(record)
+
+        return
+
+    # ------------------------------------------------------------------
+    #   Output
+    # ------------------------------------------------------------------
+
+    def summary(self):
+
+        stages = sorted(self.stages, key=lambda s: s['start'])
+
+        return {'stages':   stages,
+                'counters': dict(self.counters),
+                'wall':     time.perf_counter() - self._started if self._started else 0.}
+
+    def chrome_trace(self):
+        """Complete ('X') events with the counters and memory as args, in
+        microseconds."""
+
+        pid    = os.getpid()
+        tid    = threading.get_ident() % 2**31
+        events = []
+        for s in sorted(self.stages, key=lambda s: s['start']):
+            args = dict(s['args'])
+            args.update(cpu=s['cpu'], max_rss=s['max_rss'], max_rss_growth=s['max_rss_growth'],
+                        **s['counters'])
+            if 'peak_traced_memory' in s:
+                args['peak_traced_memory'] = s['peak_traced_memory']
+            events.append({'name': s['name'], 'cat': 'stage', 'ph': 'X', 'pid': pid, 'tid': tid,
+                           'ts': s['start'] * 1e6, 'dur': s['wall'] * 1e6, 'args': args})
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, path, format=None):
+        """Writes the summary as JSON, or Chrome trace events with
+        format='chrome' or a path ending in .trace.json."""
+
+        if format is None:
+            format = 'chrome' if path.endswith('.trace.json') else 'json'
+        data = self.chrome_trace() if format == 'chrome' else self.summary()
+
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=1, default=float)
+
+        return path
+
+    def report(self, file=None):
+
+        file = sys.stderr if file is None else file
+        print('%-32s %9s %9s %12s %10s %8s %8s %8s %8s %8s'
+              % ('stage', 'wall s', 'cpu s', 'peak rss MB', '+peak MB', 'solves', 'resid', 'spins',
+                 'mapped', 'fallback'), file=file)
+        for s in sorted(self.stages, key=lambda s: s['start']):
+            c = s['counters']
+            print('%-32s %9.3f %9.3f %12.1f %10.1f %8d %8d %8d %8d %8d'
+                  % ('  ' * s['depth'] + s['name'], s['wall'], s['cpu'], s['max_rss'] / 2**20,
+                     s['max_rss_growth'] / 2**20, c['root_finder_calls'], c['residual_evaluations'],
+                     c['propeller_spin'], c['propeller_map_spin'], c['propeller_map_fallback']), file=file)
+
+        return
+
+    # ------------------------------------------------------------------
+    #   Call counting
+    # ------------------------------------------------------------------
+
+    def _install_patches(self):
+
+        try:
+            from SUAVE.Analyses.Mission import Mission
+            from SUAVE.Analyses.Mission.Segments.Segment import Segment
+            from SUAVE.Components.Energy.Converters import Propeller
+            from SUAVE.Analyses.Aerodynamics import Fidelity_Zero
+            from propeller_map import Mapped_Propeller
+        except ImportError:
+            return
+
+        # segments hold their root finder in settings from when they are
+        # built, so it is swapped per segment for each evaluate() rather
+        # than patched where it is defined. That reaches missions set up
+        # before this was active, whichever root finder they were given
+        for cls in dict.fromkeys([Mission, Segment] + all_subclasses(Segment)):
+            if 'evaluate' in cls.__dict__:
+                self._wrap(cls, 'evaluate', context=self.counting_root_finders)
+
+        # only classes with their own spin(), inherited ones are counted
+        # through their base. Mapped_Propeller is named so it is defined
+        # (and patched) even before any vehicle uses the map
+        self._mapped = Mapped_Propeller
+        for cls in dict.fromkeys([Propeller] + all_subclasses(Propeller)):
+            if cls is not Mapped_Propeller and 'spin' in cls.__dict__:
+                self._wrap(cls, 'spin', self._count_spin)
+        self._wrap(Mapped_Propeller, 'spin', lambda *a: self.count('propeller_map_spin'))
+        self._wrap(Fidelity_Zero, 'evaluate', lambda *a: self.count('aerodynamics_evaluate'))
+
+        return
+
+    @contextmanager
+    def counting_root_finders(self, segment, *args):
+        """Swaps the root finder of the segment and of every segment under
+        it for a counting wrapper of it while the block runs."""
+
+        swapped = []
+        for s in walk_segments(segment):
+            settings = s.get('settings')
+            if settings is None:
+                continue
+            finder = settings.get('root_finder')
+            if getattr(finder, 'instrumentation', None) is self:
+                continue
+            settings.root_finder = self._counting_root_finder(finder)
+            swapped.append((settings, finder))
+
+        try:
+            yield
+        finally:
+            for settings, finder in reversed(swapped):
+                if finder is None:
+                    del settings['root_finder']
+                else:
+                    settings.root_finder = finder
+
+        return
+
+    def _counting_root_finder(self, finder):
+
+        if finder is None:
+            # SUAVE's converge_root falls back to fsolve
+            import scipy.optimize
+            finder = scipy.optimize.fsolve
+
+        def counted(func, x0, args=(), **kwargs):
+            self.count('root_finder_calls')
+            def residuals(x, *a):
+                self.count('residual_evaluations')
+                return func(x, *a)
+            return finder(residuals, x0, args=args, **kwargs)
+
+        counted.instrumentation = self
+
+        return counted
+
+    def _count_spin(self, prop, conditions, *args):
+
+        # the blade element spin a Mapped_Propeller falls back to off its map
+        if self._mapped is not None and isinstance(prop, self._mapped):
+            self.count('propeller_map_fallback')
+            return
+
+        self.count('propeller_spin')
+        self.count('propeller_spin_points', len(conditions.freestream.density))
+
+        return
+
+    def _wrap(self, cls, name, counter=None, context=None):
+        """Patches cls.name to call counter(obj, *args) first, or to run
+        inside context(obj, *args), until this is exited."""
+
+        original = cls.__dict__.get(name)
+        method   = getattr(cls, name)
+
+        def counted(obj, *args, **kwargs):
+            if context is not None:
+                with context(obj, *args):
+                    return method(obj, *args, **kwargs)
+            counter(obj, *args)
+            return method(obj, *args, **kwargs)
+
+        setattr(cls, name, counted)
+        if original is None:
+            self._restore.append(lambda: delattr(cls, name))
+        else:
+            self._restore.append(lambda: setattr(cls, name, original))
+
+        return
+
+def stage(name, **args):
+    """Times the block as a stage of the active Instrumentation, a no-op
+    when there is none."""
+
+    if _active is None:
+        return nullcontext()
+
+    return _active.stage(name, **args)
+
+def active():
+
+    return _active
+
+def max_rss():
+    """Peak resident set size of this process in bytes."""
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+def walk_segments(segment):
+    """The segment and, depth first, every segment nested under it."""
+
+    yield segment
+    for sub in segment.get('segments', {}).values():
+        yield from walk_segments(sub)
+
+    return
+
+def all_subclasses(cls):
+
+    subclasses = []
+    for sub in cls.__subclasses__():
+        subclasses += [sub] + all_subclasses(sub)
+
+    return subclasses
+
+def safe_name(name):
+
+    return ''.join(c if c.isalnum() or c in '-_.' else '_' for c in name)
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 04:40:12 2026
+
+@author: K. Grafton
+
+Compact store for many mission results. The chosen condition paths of
+every segment are flattened into one preallocated array per field,
+shaped (capacity, control points, columns), in float64 or float32, held
+in memory or as .npy files mapped from disk. A stored mission is a few
+contiguous rows instead of a tree of SUAVE Data, so thousands fit in
+memory and moving one between processes is a dict of small arrays.
+
+Workers flatten their results with flatten() and the parent appends the
+arrays. results(i) rebuilds a results-shaped view of one mission over the
+stored rows, which plot_mission() and the payload-range code read like
+the output of mission.evaluate().
+
+    store = MissionStore(fields='all', path='sweep_store')
+    i     = store.append(mission.evaluate())
+    plot_mission(store.results(i))
+    mass  = store.field('cruise/weights.total_mass')     # (count, n, 1)
+
+plot_mission() reads most of the conditions and wants fields='all', the
+default MISSION_FIELDS cover fuel_curve() and the sweep summaries. The
+layout is fixed by the first mission written, later ones must have the
+same segments and control points.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+from results_io import MISSION_FIELDS, lookup
+
+VERSION = 1
+
+class MissionStore:
+
+    def __init__(self, fields=MISSION_FIELDS, dtype='f8', capacity=256, path=None):
+        """fields is a list of condition paths or 'all' for every array in
+        the conditions. With a path the fields are .npy files mapped from
+        that directory."""
+
+        self.fields   = fields
+        self.dtype    = np.dtype(dtype)
+        self.capacity = capacity
+        self.path     = path
+        self.count    = 0
+        self.schema   = None
+        self._arrays  = {}
+
+    # ------------------------------------------------------------------
+    #   Writing
+    # ------------------------------------------------------------------
+
+    def append(self, results):
+
+        return self.append_arrays(flatten(results, self.fields))
+
+    def append_arrays(self, arrays):
+        """Appends one mission already flattened by flatten(), e.g. in a
+        worker process. Returns its index."""
+
+        return self.write(self.count, arrays)
+
+    def write(self, index, arrays):
+        """Writes one flattened mission at index, growing the store to hold
+        it. Rows skipped over stay unset, NaN."""
+
+        if self.schema is None:
+            self._allocate(arrays)
+        if index >= self.capacity:
+            self._grow(max(2 * self.capacity, index + 1))
+        if set(arrays) != set(self.schema):
+            raise KeyError('fields not in both the mission and the store: %s'
+                           % ', '.join(sorted(set(arrays) ^ set(self.schema))))
+        for key, shape in self.schema.items():
+            value = np.asarray(arrays[key])
+            if value.shape != shape:
+                raise ValueError('%s is shaped %s, the store holds %s' % (key, value.shape, shape))
+            self._array(key)[index] = value
+        self.count = max(self.count, index + 1)
+
+        return index
+
+    def flush(self):
+        """Writes the header of an on-disk store, its count included."""
+
+        if self.path is None or self.schema is None:
+            return self
+
+        for array in self._arrays.values():
+            if isinstance(array, np.memmap):
+                array.flush()
+
+        header = {'version':  VERSION,
+                  'dtype':    self.dtype.str,
+                  'fields':   self.fields,
+                  'count':    self.count,
+                  'capacity': self.capacity,
+                  'schema':   [[key, list(shape)] for key, shape in self.schema.items()]}
+        path = os.path.join(self.path, 'header.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(header, f, indent=1)
+        os.replace(path + '.tmp', path)
+
+        return self
+
+    def _allocate(self, arrays):
+
+        self.schema = {key: np.asarray(value).shape for key, value in arrays.items()}
+        if self.path is not None:
+            os.makedirs(self.path, exist_ok=True)
+        for key in self.schema:
+            self._arrays[key] = self._new_array(key, self.capacity)
+
+        return
+
+    def _new_array(self, key, capacity, suffix=''):
+
+        shape = (capacity,) + self.schema[key]
+        if self.path is None:
+            return np.full(shape, np.nan, dtype=self.dtype)
+
+        # unset rows read NaN on disk as in memory, not zeros
+        array    = np.lib.format.open_memmap(self._file(key) + suffix, mode='w+', dtype=self.dtype, shape=shape)
+        array[:] = np.nan
+
+        return array
+
+    def _grow(self, capacity):
+
+        for key in self.schema:
+            old = self._array(key)
+            new = self._new_array(key, capacity, '.tmp')
+            new[:self.count] = old[:self.count]
+            if self.path is not None:
+                # unmap both files first, Windows will not replace a mapped one
+                new.flush()
+                del self._arrays[key]
+                del old, new
+                os.replace(self._file(key) + '.tmp', self._file(key))
+                new = np.load(self._file(key), mmap_mode='r+')
+            self._arrays[key] = new
+        self.capacity = capacity
+        self.flush()
+
+        return
+
+    # ------------------------------------------------------------------
+    #   Reading
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def open(cls, path, mode='r'):
+        """An on-disk store. Fields are mapped as they are first read."""
+
+        with open(os.path.join(path, 'header.json')) as f:
+            header = json.load(f)
+        if header.get('version') != VERSION:
+            raise ValueError(path + ' is not a current mission store')
+
+        store          = cls(header['fields'], header['dtype'], header['capacity'], path)
+        store.count    = header['count']
+        store.schema   = {key: tuple(shape) for key, shape in header['schema']}
+        store._mode    = mode
+
+        return store
+
+    def keys(self):
+
+        return list(self.schema or ())
+
+    def field(self, key):
+        """(count, control points, columns) view of one field."""
+
+        return self._array(key)[:self.count]
+
+    def results(self, index):
+        """Results-shaped view of one stored mission:
+        results.segments[tag].conditions.<path> over the stored rows."""
+
+        Data = data_class()
+
+        results          = Data()
+        results.segments = Data()
+        for key in self.schema:
+            tag, path = key.split('/', 1)
+            if tag not in results.segments:
+                results.segments[tag] = Data()
+                results.segments[tag].conditions = Data()
+            node  = results.segments[tag].conditions
+            names = path.split('.')
+            for name in names[:-1]:
+                if name not in node:
+                    node[name] = Data()
+                node = node[name]
+            node[names[-1]] = self._array(key)[index]
+
+        return results
+
+    def __len__(self):
+
+        return self.count
+
+    def _array(self, key):
+
+        if key not in self._arrays:
+            mode = getattr(self, '_mode', 'r')
+            self._arrays[key] = np.load(self._file(key), mmap_mode=mode)
+
+        return self._arrays[key]
+
+    def _file(self, key):
+        # by position, condition paths need not be valid file names
+        return os.path.join(self.path, 'field_%04d.npy' % list(self.schema).index(key))
+
+    def delete(self):
+
+        if self.path is not None:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+        return
+
+# ----------------------------------------------------------------------
+#   Flattening
+# ----------------------------------------------------------------------
+
+def flatten(results, fields=MISSION_FIELDS):
+    """{'<segment tag>/<condition path>': 2-D array} of the results, the
+    arrays a store appends. Paths a segment lacks are NaN."""
+
+    arrays = {}
+    for tag, segment in results.segments.items():
+        conditions = segment.conditions
+        n_points   = conditions.frames.inertial.time.shape[0]
+        paths      = array_paths(conditions, n_points) if fields == 'all' else fields
+        for path in paths:
+            value = lookup(conditions, path)
+            if value is None:
+                value = np.full((n_points, 1), np.nan)
+            value = np.asarray(value, dtype=float)
+            arrays['%s/%s' % (tag, path)] = value.reshape(n_points, -1) if value.ndim != 2 else value
+
+    return arrays
+
+def array_paths(data, n_points, prefix=''):
+    """Dotted paths of every (n_points, m) array under a Data tree."""
+
+    paths = []
+    for key, value in data.items():
+        path = prefix + key
+        if isinstance(value, dict):
+            paths += array_paths(value, n_points, path + '.')
+        elif (isinstance(value, np.ndarray) and value.ndim == 2 and value.shape[0] == n_points
+              and value.dtype.kind in 'fiub'):
+            paths.append(path)
+
+    return paths
+
+def data_class():
+    """SUAVE's Data when it is importable, else an attribute dict."""
+
+    try:
+        from SUAVE.Core import Data
+    except ImportError:
+        return AttributeDict
+
+    return Data
+
+class AttributeDict(dict):
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
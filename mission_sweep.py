@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:31:40 2026
+
+@author: K. Grafton
+
+Process-pool sweep of the Sling 2 cruise mission over altitude, air speed
+and takeoff mass grids. Each worker builds and finalizes the vehicle and
+analyses once and reuses them for every point it is handed. The rpm is
+not swept: the solver finds it from the torque balance, and the sweep
+reports the converged value.
+"""
+
+import itertools
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+# all values SI except rpm, sfc in kg/(N s). throttle and rpm are the
+# time averages of the converged cruise
+SWEEP_DTYPE = np.dtype([('altitude',     'f8'),
+                        ('air_speed',    'f8'),
+                        ('takeoff_mass', 'f8'),
+                        ('fuel_burn',    'f8'),
+                        ('throttle',     'f8'),
+                        ('rpm',          'f8'),
+                        ('lift_to_drag', 'f8'),
+                        ('sfc',          'f8'),
+                        ('converged',    '?'),
+                        ('residual_evaluations', 'i8')])
+
+# per-process vehicle and analyses, filled by init_worker()
+_worker = {}
+
+# ----------------------------------------------------------------------
+#   Sweep
+# ----------------------------------------------------------------------
+
+def sweep(altitudes, air_speeds, takeoff_masses, distance=None, max_workers=None, chunksize=8,
+          warm_start=True, propeller_map=False, store=None):
+    """Evaluates the full grid and returns a structured array shaped
+    (altitudes, air_speeds, takeoff_masses) with SWEEP_DTYPE fields.
+    With warm_start each point starts from the converged unknowns of the
+    nearest point already solved on the same worker. propeller_map swaps
+    the BEM propeller for its tabulated map. Given a MissionStore, the
+    full mission of flat grid point i is also kept at store index
+    len(store) + i, len(store) taken before the sweep."""
+
+    points  = grid_points(altitudes, air_speeds, takeoff_masses)
+    shape   = tuple(np.atleast_1d(axis).size for axis in (altitudes, air_speeds, takeoff_masses))
+    results = np.zeros(len(points), dtype=SWEEP_DTYPE)
+    fields  = None if store is None else store.fields
+    start   = 0 if store is None else len(store)
+
+    for index, rows in iter_sweep(points, distance, max_workers, chunksize, warm_start,
+                                  propeller_map, fields):
+        if store is not None:
+            rows, missions = rows
+            for i, arrays in zip(index, missions):
+                if arrays is not None:
+                    store.write(start + i, arrays)
+            # keep the header's count current in case the sweep dies
+            store.flush()
+        results[index] = rows
+
+    return results.reshape(shape)
+
+def iter_sweep(points, distance=None, max_workers=None, chunksize=8, warm_start=True,
+               propeller_map=False, fields=None):
+    """Yields (indices, rows) as chunks of points finish. max_workers=0
+    evaluates in the calling process. With fields, rows is (rows, missions),
+    missions the flattened results of each point (see mission_store).
+    Points that raise come back with NaN results, converged False and
+    None for their mission."""
+
+    chunks = [np.arange(i, min(i + chunksize, len(points)))
+              for i in range(0, len(points), chunksize)]
+
+    if max_workers == 0:
+        init_worker(propeller_map)
+        for index in chunks:
+            yield index, evaluate_chunk(points[index], distance, warm_start, fields)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                             initargs=(propeller_map,)) as pool:
+        futures = {pool.submit(evaluate_chunk, points[index], distance, warm_start, fields): index
+                   for index in chunks}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    return
+
+def grid_points(altitudes, air_speeds, takeoff_masses):
+
+    grid   = itertools.product(np.atleast_1d(altitudes), np.atleast_1d(air_speeds),
+                               np.atleast_1d(takeoff_masses))
+    points = np.array(list(grid), dtype=float)
+
+    return points.reshape(-1, 3)
+
+# ----------------------------------------------------------------------
+#   Worker
+# ----------------------------------------------------------------------
+
+def init_worker(propeller_map=False):
+
+    if _worker:
+        return
+
+    import sling2
+    from warm_start import WarmStartStore
+
+    vehicle  = sling2.vehicle_setup(propeller_map)
+    analyses = sling2.base_analysis(vehicle)
+    analyses.finalize()
+
+    _worker['vehicle']    = vehicle
+    _worker['analyses']   = analyses
+    _worker['warm_start'] = WarmStartStore()
+
+    return
+
+def evaluate_point(altitude, air_speed, takeoff_mass, distance=None, warm_start=False):
+    """Runs the cruise mission at one point on this worker's analyses and
+    returns the SUAVE results."""
+
+    import sling2
+    from warm_start import count_iterations
+
+    init_worker()
+    vehicle  = _worker['vehicle']
+    analyses = _worker['analyses']
+    store    = _worker['warm_start']
+    takeoff  = vehicle.mass_properties.takeoff
+
+    # the worker's vehicle is shared, it gets its own mass back
+    vehicle.mass_properties.takeoff = takeoff_mass
+    try:
+        mission = sling2.mission_setup(analyses, vehicle, altitude=altitude, air_speed=air_speed,
+                                       distance=distance)
+        mission = count_iterations(mission)
+
+        segment   = mission.segments.cruise
+        condition = (altitude, air_speed, takeoff_mass, segment.distance)
+        if warm_start:
+            store.apply(mission, condition)
+
+        results = mission.evaluate()
+    finally:
+        vehicle.mass_properties.takeoff = takeoff
+
+    if warm_start:
+        store.seed(condition, results)
+
+    return results
+
+def evaluate_chunk(points, distance=None, warm_start=False, fields=None):
+
+    from warm_start import residual_evaluations
+
+    rows     = np.zeros(len(points), dtype=SWEEP_DTYPE)
+    missions = []
+
+    for i, (altitude, air_speed, takeoff_mass) in enumerate(points):
+        try:
+            results = evaluate_point(altitude, air_speed, takeoff_mass, distance, warm_start)
+        except Exception as error:
+            # one point that cannot be solved is a failed row, not a failed sweep
+            warnings.warn('sweep point h %.0f m, V %.1f m/s, m %.0f kg failed: %r'
+                          % (altitude, air_speed, takeoff_mass, error))
+            rows[i] = (altitude, air_speed, takeoff_mass) + (np.nan,) * 5 + (False, 0)
+            missions.append(None)
+            continue
+        rows[i] = ((altitude, air_speed, takeoff_mass)
+                   + summarise(results.segments.cruise)
+                   + (residual_evaluations(results),))
+        if fields is not None:
+            # flat arrays pickle back far smaller than the SUAVE results
+            from mission_store import flatten
+            missions.append(flatten(results, fields))
+
+    if fields is not None:
+        return rows, missions
+
+    return rows
+
+def summarise(segment):
+    """Fuel burn and time-averaged throttle, propeller rpm, L/D and sfc
+    of one segment."""
+
+    conditions = segment.conditions
+
+    time   = conditions.frames.inertial.time[:,0]
+    mass   = conditions.weights.total_mass[:,0]
+    mdot   = conditions.weights.vehicle_mass_rate[:,0]
+    thrust = conditions.frames.body.thrust_force_vector[:,0]
+    CL     = conditions.aerodynamics.lift_coefficient[:,0]
+    CD     = conditions.aerodynamics.drag_coefficient[:,0]
+
+    fuel_burn    = mass[0] - mass[-1]
+    throttle     = time_average(time, conditions.propulsion.throttle[:,0])
+    rpm          = time_average(time, conditions.propulsion.propeller_rpm[:,0])
+    lift_to_drag = time_average(time, CL / CD)
+    sfc          = time_average(time, mdot / thrust)
+    converged    = bool(segment_state(segment).numerics.get('converged', True))
+
+    return (fuel_burn, throttle, rpm, lift_to_drag, sfc, converged)
+
+def segment_state(segment):
+    """The solver state of a segment in mission results, whether the
+    results hold the segments themselves or their states."""
+
+    if 'state' in segment:
+        return segment.state
+
+    return segment
+
+def time_average(time, values):
+
+    duration = time[-1] - time[0]
+    if duration <= 0.:
+        return float(np.mean(values))
+
+    # trapezoidal, the control points are not evenly spaced
+    area = np.sum(0.5 * (values[1:] + values[:-1]) * np.diff(time))
+
+    return float(area / duration)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 20:14:09 2026
+
+@author: K. Grafton
+
+Batched payload-range diagrams. SUAVE's payload_range() re-solves the
+whole mission several times per corner while it iterates the cruise
+distance. Here each distinct takeoff weight is flown once, far enough to
+burn the largest fuel load asked of it, and every corner is read off that
+one solution. The cruise is steady, so flying it shorter only truncates
+it. The fuel curve is interpolated on the Chebyshev control points, and
+converged states warm-start the next solve across corners and
+configurations.
+
+Assumes the cruise is the last segment of the mission. Masses in kg,
+range in nautical miles as in SUAVE's payload_range().
+"""
+
+import time
+
+import numpy as np
+from scipy.interpolate import BarycentricInterpolator
+from scipy.optimize import brentq
+
+NAUTICAL_MILE = 1852.
+
+PAYLOAD_RANGE_DTYPE = np.dtype([(name, 'f8') for name in (
+    'operating_empty', 'max_zero_fuel', 'max_takeoff', 'reserves', 'altitude',
+    'range', 'payload', 'fuel', 'takeoff_weight')])
+
+class FuelCurveError(RuntimeError):
+    """The cruise could not be flown far enough to burn the fuel asked for."""
+
+def payload_range_batch(vehicle, analyses, operating_empty=None, max_zero_fuel=None,
+                        max_takeoff=None, reserves=0., cruise_altitudes=None,
+                        mission_setup=None, cruise_segment_tag='cruise', write=None, store=None):
+    """Payload-range diagrams for every broadcast combination of OEW, MZFW,
+    MTOW, reserves and cruise altitude. Returns a PAYLOAD_RANGE_DTYPE array
+    shaped (configurations..., 4) with the same four points as SUAVE:
+    zero range, max payload, max fuel and ferry. Pass a path as write to
+    also save the tables. Given a MissionStore every mission flown is
+    appended to it and the curves are read back from the store."""
+
+    from warm_start import WarmStartStore
+
+    if mission_setup is None:
+        from sling2 import mission_setup
+
+    masses = vehicle.mass_properties
+    if operating_empty is None:
+        operating_empty = masses.operating_empty
+    if max_zero_fuel is None:
+        max_zero_fuel   = masses.max_zero_fuel
+    if max_takeoff is None:
+        max_takeoff     = masses.max_takeoff
+    if cruise_altitudes is None:
+        cruise_altitudes = np.nan   # whatever mission_setup() defaults to
+
+    OEW, MZFW, MTOW, RES, ALT = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in
+                                                      (operating_empty, max_zero_fuel, max_takeoff,
+                                                       reserves, cruise_altitudes)])
+
+    diagrams = np.zeros(OEW.shape + (4,), dtype=PAYLOAD_RANGE_DTYPE)
+    warm     = WarmStartStore()
+    takeoff  = masses.takeoff
+
+    def fly(tow, altitude, distance):
+        masses.takeoff = tow
+        if np.isnan(altitude):
+            mission = mission_setup(analyses, vehicle, distance=distance)
+        else:
+            mission = mission_setup(analyses, vehicle, altitude=altitude, distance=distance)
+        segment   = mission.segments[cruise_segment_tag]
+        condition = (segment.altitude, segment.air_speed, tow, segment.distance)
+        warm.apply(mission, condition)
+        results   = mission.evaluate()
+        warm.seed(condition, results)
+        if store is not None:
+            results = store.results(store.append(results))
+        return mission, results
+
+    try:
+        for idx in np.ndindex(OEW.shape):
+            diagrams[idx] = diagram(fly, OEW[idx], MZFW[idx], MTOW[idx], RES[idx], ALT[idx],
+                                    masses, cruise_segment_tag)
+    finally:
+        masses.takeoff = takeoff
+
+    if store is not None:
+        store.flush()
+    if write:
+        write_payload_range(write, diagrams, vehicle.tag)
+
+    return diagrams
+
+def diagram(fly, OEW, MZFW, MTOW, reserves, altitude, masses, cruise_segment_tag):
+
+    max_payload = MZFW - OEW
+    if masses.get('max_payload', 0.):
+        max_payload = min(masses.max_payload, max_payload)
+    max_fuel    = MTOW - OEW
+    if masses.get('max_fuel', 0.):
+        max_fuel    = min(masses.max_fuel, max_fuel)
+
+    TOW  = [MTOW,                                MTOW,                  OEW + max_fuel]
+    FUEL = [min(MTOW - OEW - max_payload, max_fuel), max_fuel,          max_fuel]
+    PLD  = [max_payload,                         MTOW - max_fuel - OEW, 0.]
+
+    ranges = np.zeros(3)
+    for tow in np.unique(TOW):
+        corners = [i for i in range(3) if TOW[i] == tow]
+        burns   = [FUEL[i] - reserves for i in corners]
+        curve   = fuel_curve(fly, tow, altitude, max(burns), cruise_segment_tag)
+        for i, burn in zip(corners, burns):
+            ranges[i] = curve(burn)
+
+    rows = np.zeros(4, dtype=PAYLOAD_RANGE_DTYPE)
+    rows['operating_empty'] = OEW
+    rows['max_zero_fuel']   = MZFW
+    rows['max_takeoff']     = MTOW
+    rows['reserves']        = reserves
+    rows['altitude']        = altitude
+    rows['range']           = np.concatenate([[0.], ranges]) / NAUTICAL_MILE
+    rows['payload']         = [max_payload] + PLD
+    rows['fuel']            = [0.] + FUEL
+    rows['takeoff_weight']  = [0.] + TOW
+
+    return rows
+
+def fuel_curve(fly, tow, altitude, max_burn, cruise_segment_tag, max_iterations=8):
+    """Flies the mission far enough to burn max_burn and returns a function
+    giving the total range for any burn up to it."""
+
+    distance = None
+    for _ in range(max_iterations):
+        mission, results = fly(tow, altitude, distance)
+        segment  = results.segments[cruise_segment_tag]
+        position = segment.conditions.frames.inertial.position_vector[:,0]
+        mass     = segment.conditions.weights.total_mass[:,0]
+
+        # fuel burned before the cruise starts is carried as an offset
+        start    = tow - mass[0]
+        x        = position - position[0]
+        burn     = mass[0] - mass
+
+        if start + burn[-1] >= max_burn or max_burn <= start:
+            break
+
+        specific_range = x[-1] / burn[-1]
+        distance       = 1.05 * (max_burn - start) * specific_range
+    else:
+        raise FuelCurveError('cruise did not reach a fuel burn of %.1f kg in %d attempts'
+                           % (max_burn, max_iterations))
+
+    # spectral interpolation through the Chebyshev control points
+    interpolant = BarycentricInterpolator(x, burn)
+
+    def total_range(target):
+        cruise_burn = target - start
+        if cruise_burn <= 0.:
+            # used up before the cruise, scale the distance flown to get there
+            return position[0] * max(target, 0.) / start if start > 0. else 0.
+        if cruise_burn >= burn[-1]:
+            return position[-1]
+        d = brentq(lambda s: interpolant(s) - cruise_burn, 0., x[-1])
+        return position[0] + d
+
+    return total_range
+
+def write_payload_range(path, diagrams, tag=''):
+    """Writes each diagram in the layout of SUAVE's PayloadRangeDiagram.dat."""
+
+    diagrams = np.asarray(diagrams).reshape(-1, 4)
+
+    with open(path, 'w') as f:
+        f.write('Output file with Payload Range Diagram details\n')
+        for rows in diagrams:
+            first = rows[0]
+            f.write('\n')
+            if tag:
+                f.write(' Configuration .................................: %s\n' % tag)
+            f.write(' Maximum Takeoff Weight ...........( MTOW ).....: %8.0f kg\n' % first['max_takeoff'])
+            f.write(' Operational Empty Weight .........( OEW  ).....: %8.0f kg\n' % first['operating_empty'])
+            f.write(' Maximum Zero Fuel Weight .........( MZFW ).....: %8.0f kg\n' % first['max_zero_fuel'])
+            f.write(' Maximum Payload Weight ...........( PLDMX  )...: %8.0f kg\n' % rows['payload'][0])
+            f.write(' Maximum Fuel Weight ..............( FUELMX )...: %8.0f kg\n' % rows['fuel'][-1])
+            f.write(' Reserve Fuel  .................................: %8.0f kg\n' % first['reserves'])
+            if not np.isnan(first['altitude']):
+                f.write(' Cruise Altitude ...............................: %8.0f m\n' % first['altitude'])
+            f.write('\n    RANGE    |   PAYLOAD   |   FUEL      |    TOW      |  \n')
+            f.write('     nm      |     kg      |    kg       |     kg      |  \n')
+            for row in rows:
+                f.write('%10.0f   |%10.0f   |%10.0f   |%10.0f   |\n'
+                        % (row['range'], row['payload'], row['fuel'], row['takeoff_weight']))
+        f.write('\n\n-------------------------------------------\n ')
+        f.write(time.strftime('%A, %d. %B %Y %I:%M:%S %p'))
+
+    return path
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:48:52 2026
+
+@author: K. Grafton
+
+Compiled polar database. The XFOIL polar dumps in Airfoils/Polars are
+parsed once into a single binary file that every process maps read-only,
+so a node full of workers shares one page-cached copy instead of each
+re-parsing the text files. use_polar_db() serves SUAVE 2.5.2's
+import_airfoil_polars from it. The airfoil coordinates are a single small
+file and are still read by SUAVE's import_airfoil_geometry.
+
+File layout: 8 byte magic, little-endian uint64 header length, JSON header,
+then 64 byte aligned float64 blocks. Each polar is stored column-major so
+alpha, CL, CD, CDp, CM, Top_Xtr and Bot_Xtr are each contiguous.
+"""
+
+import glob
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from contextlib import contextmanager
+
+import numpy as np
+
+from design_cache import CACHE_DIR
+
+MAGIC     = b'SLPOLDB1'
+VERSION   = 2
+ALIGNMENT = 64
+COLUMNS   = ('alpha', 'CL', 'CD', 'CDp', 'CM', 'Top_Xtr', 'Bot_Xtr')
+
+POLAR_FILES = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                            'Airfoils', 'Polars', '*.txt')))
+DB_PATH     = os.path.join(CACHE_DIR, 'polars.db')
+
+_HEADER = re.compile(r'Mach\s*=\s*([-\d.]+)\s+Re\s*=\s*([\d.]+)\s*e\s*(\d+)\s+Ncrit\s*=\s*([\d.]+)')
+
+# ----------------------------------------------------------------------
+#   Database
+# ----------------------------------------------------------------------
+
+class PolarDatabase:
+
+    def __init__(self, path):
+
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(path + ' is not a compiled polar database')
+
+        (n,)         = struct.unpack('<Q', self._map[8:16])
+        self.header  = json.loads(self._map[16:16 + n].decode())
+        if self.header.get('version') != VERSION:
+            raise ValueError(path + ' is not a current polar database')
+        self.sources = self.header['sources']
+
+        self.polars = {}
+        for entry in self.header['polars']:
+            self.polars[entry['file']] = dict(entry, data=self._view(entry))
+
+    def _view(self, entry):
+        # read-only view straight onto the mapped pages, no copy
+        data = np.frombuffer(self._map, dtype='<f8', count=entry['rows'] * entry['columns'],
+                             offset=entry['offset'])
+        return data.reshape(entry['columns'], entry['rows'])
+
+    def reynolds_numbers(self, airfoil=None):
+
+        return np.sort([p['reynolds'] for p in self.polars.values()
+                        if airfoil is None or p['airfoil'] == airfoil])
+
+    def polar(self, file=None, reynolds=None):
+        """Columns of one polar as a dict of contiguous arrays, found by
+        source file or by (nearest) Reynolds number."""
+
+        if file is None:
+            entries = list(self.polars.values())
+            re_list = np.array([p['reynolds'] for p in entries])
+            entry   = entries[int(np.argmin(np.abs(np.log(re_list / reynolds))))]
+        else:
+            entry   = self.polars[_normalise(file)]
+
+        return {name: entry['data'][i] for i, name in enumerate(COLUMNS)}
+
+    def is_current(self, files):
+
+        if sorted(self.sources) != sorted(_normalise(f) for f in files):
+            return False
+
+        return all(self.sources[_normalise(f)] == _file_hash(f) for f in files)
+
+def open_polar_db(path=DB_PATH, polar_files=None):
+    """Maps the database, recompiling it first if it is missing or any
+    source file has changed since it was built."""
+
+    polar_files = POLAR_FILES if polar_files is None else polar_files
+
+    if os.path.exists(path):
+        try:
+            db = PolarDatabase(path)
+            if db.is_current(polar_files):
+                return db
+        except (ValueError, KeyError, struct.error):
+            pass
+
+    compile_polars(path, polar_files)
+
+    return PolarDatabase(path)
+
+def compile_polars(path=DB_PATH, polar_files=None):
+
+    polar_files = POLAR_FILES if polar_files is None else polar_files
+
+    blocks  = []
+    header  = {'version': VERSION, 'columns': COLUMNS, 'sources': {}, 'polars': []}
+
+    for file in polar_files:
+        entry, data = read_xfoil_polar(file)
+        header['polars'].append(entry)
+        blocks.append(data)
+        header['sources'][_normalise(file)] = _file_hash(file)
+
+    # the header holds the block offsets, so size it first with
+    # placeholders wide enough for any offset we could write
+    entries = header['polars']
+    for entry in entries:
+        entry['offset'] = 10**15
+    start = _align(16 + len(json.dumps(header).encode()))
+
+    offset = start
+    for entry, data in zip(entries, blocks):
+        entry['offset'] = offset
+        offset          = _align(offset + data.nbytes)
+
+    text = json.dumps(header).encode()
+    text = text + b' ' * (start - 16 - len(text))
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(text)))
+        f.write(text)
+        for entry, data in zip(entries, blocks):
+            f.write(b'\0' * (entry['offset'] - f.tell()))
+            f.write(np.ascontiguousarray(data, dtype='<f8').tobytes())
+    os.replace(tmp, path)
+
+    return path
+
+# ----------------------------------------------------------------------
+#   Text readers
+# ----------------------------------------------------------------------
+
+def read_xfoil_polar(file):
+
+    with open(file) as f:
+        lines = f.readlines()
+
+    airfoil  = ''
+    reynolds = mach = ncrit = np.nan
+    rows     = []
+    in_data  = False
+
+    for line in lines:
+        if in_data:
+            values = line.split()
+            if len(values) >= len(COLUMNS):
+                rows.append([float(v) for v in values[:len(COLUMNS)]])
+            continue
+        if 'Calculated polar for:' in line:
+            airfoil = line.split(':', 1)[1].strip()
+        match = _HEADER.search(line)
+        if match:
+            mach     = float(match.group(1))
+            reynolds = float(match.group(2)) * 10**int(match.group(3))
+            ncrit    = float(match.group(4))
+        if line.strip().startswith('---'):
+            in_data = True
+
+    if not rows:
+        raise ValueError('no polar data found in ' + file)
+
+    data  = np.array(rows).T
+    entry = {'file': _normalise(file), 'airfoil': airfoil, 'reynolds': reynolds,
+             'mach': mach, 'ncrit': ncrit, 'rows': data.shape[1], 'columns': data.shape[0]}
+
+    return entry, data
+
+# ----------------------------------------------------------------------
+#   SUAVE hook
+# ----------------------------------------------------------------------
+
+def import_airfoil_polars(airfoil_polar_files, angel_of_attack_discretization=89, db=None):
+    """SUAVE 2.5.2's import_airfoil_polars, same signature (its spelling
+    included) and output, served from the compiled database instead of
+    the text files."""
+
+    from SUAVE.Core import Data
+
+    if db is None:
+        db = open_polar_db()
+
+    num_airfoils = len(airfoil_polar_files)
+    num_polars   = 0
+    for files in airfoil_polar_files:
+        if len(files) < 3:
+            raise AttributeError('Provide three or more airfoil polars to compute surrogate')
+        num_polars = max(num_polars, len(files))
+
+    dim_aoa    = angel_of_attack_discretization
+    AoA_interp = np.linspace(-6, 16, dim_aoa)
+
+    CL = np.zeros((num_airfoils, num_polars, dim_aoa))
+    CD = np.zeros((num_airfoils, num_polars, dim_aoa))
+    Re = np.zeros((num_airfoils, num_polars))
+    Ma = np.zeros((num_airfoils, num_polars))
+
+    for i, files in enumerate(airfoil_polar_files):
+        for j, file in enumerate(files):
+            entry    = db.polars[_normalise(file)]
+            polar    = entry['data']
+            Re[i,j]  = entry['reynolds']
+            Ma[i,j]  = entry['mach']
+            CL[i,j]  = np.interp(AoA_interp, polar[0], polar[1])
+            CD[i,j]  = np.interp(AoA_interp, polar[0], polar[2])
+
+    airfoil_data                   = Data()
+    airfoil_data.angle_of_attacks  = AoA_interp
+    airfoil_data.reynolds_number   = Re
+    airfoil_data.mach_number       = Ma
+    airfoil_data.lift_coefficients = CL
+    airfoil_data.drag_coefficients = CD
+
+    return airfoil_data
+
+@contextmanager
+def use_polar_db(db=None):
+    """Points the SUAVE modules that imported import_airfoil_polars at the
+    database version for the duration of the block."""
+
+    import SUAVE.Methods.Propulsion   # noqa: F401, pulls in the polar readers
+
+    if db is None:
+        db = open_polar_db()
+
+    patched = []
+    for name, module in list(sys.modules.items()):
+        if not name.startswith('SUAVE') or module is None:
+            continue
+        original = getattr(module, 'import_airfoil_polars', None)
+        if callable(original) and not isinstance(original, type(sys)):
+            patched.append((module, original))
+            setattr(module, 'import_airfoil_polars', _from_db(db, original))
+
+    try:
+        yield db
+    finally:
+        for module, original in patched:
+            setattr(module, 'import_airfoil_polars', original)
+
+    return
+
+def _from_db(db, original):
+
+    def from_db(airfoil_polar_files, angel_of_attack_discretization=89):
+        files = [f for polars in airfoil_polar_files for f in polars]
+        if not all(_normalise(f) in db.polars for f in files):
+            return original(airfoil_polar_files, angel_of_attack_discretization)
+        return import_airfoil_polars(airfoil_polar_files, angel_of_attack_discretization, db)
+
+    return from_db
+
+# ----------------------------------------------------------------------
+#   Helpers
+# ----------------------------------------------------------------------
+
+def _normalise(file):
+    # absolute, so './Airfoils/...' from the working directory finds the
+    # module-anchored entries
+    return os.path.abspath(file)
+
+def _file_hash(file):
+    with open(file, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 18:41:36 2026
+
+@author: K. Grafton
+
+Propeller design-space exploration. propeller_design() is run over grids
+of blade count, design Cl, design rpm, tip radius and design power in a
+process pool, and each candidate is scored off-design:
+
+    cruise efficiency  at 9500 ft / 120 kt absorbing the cruise power
+    climb thrust       at sea level / 60 kt absorbing full rated power
+
+with the rpm found by matching the absorbed power. The non-dominated
+candidates on (cruise efficiency, climb thrust) form the Pareto front.
+"""
+
+import itertools
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+# SI except rpm
+CRUISE = {'altitude': 9500. * 0.3048, 'air_speed': 120. * 1852. / 3600., 'power': .64 * 73.5e3}
+CLIMB  = {'altitude': 0.,             'air_speed': 60.  * 1852. / 3600., 'power': 73.5e3}
+
+RATED_RPM   = 5800.
+SCORE_RPMS  = np.linspace(1500., 7000., 111)
+
+DESIGN_KEYS = ('number_of_blades', 'design_Cl', 'design_rpm', 'tip_radius', 'design_power')
+
+CANDIDATE_DTYPE = np.dtype([('number_of_blades',  'f8'),
+                            ('design_Cl',         'f8'),
+                            ('design_rpm',        'f8'),
+                            ('tip_radius',        'f8'),
+                            ('design_power',      'f8'),
+                            ('cruise_efficiency', 'f8'),
+                            ('cruise_rpm',        'f8'),
+                            ('climb_thrust',      'f8'),
+                            ('climb_rpm',         'f8'),
+                            ('feasible',          '?'),
+                            ('pareto',            '?')])
+
+# per-process polar database of a pool worker, filled by init_worker()
+_worker = {}
+
+# ----------------------------------------------------------------------
+#   Exploration
+# ----------------------------------------------------------------------
+
+def explore(number_of_blades=(2., 3., 4.), design_Cls=(0.6, 0.7, 0.8, 0.9),
+            design_rpms=(4000., 4500., 5000., 5500.), tip_radii=(0.80, 0.87, 0.915, 0.96),
+            design_powers=(0.55 * 73.5e3, 0.64 * 73.5e3, 0.75 * 73.5e3),
+            max_workers=None, chunksize=4):
+    """Designs and scores every grid combination. Returns a structured
+    CANDIDATE_DTYPE array with the Pareto front flagged."""
+
+    grid       = itertools.product(number_of_blades, design_Cls, design_rpms, tip_radii, design_powers)
+    candidates = np.array(list(grid), dtype=float).reshape(-1, len(DESIGN_KEYS))
+    results    = np.zeros(len(candidates), dtype=CANDIDATE_DTYPE)
+
+    chunks = [np.arange(i, min(i + chunksize, len(candidates)))
+              for i in range(0, len(candidates), chunksize)]
+
+    if max_workers == 0:
+        from polar_db import use_polar_db
+        # patched for this loop only, the caller's SUAVE is left as it was
+        with use_polar_db():
+            for index in chunks:
+                results[index] = evaluate_chunk(candidates[index])
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker) as pool:
+            futures = {pool.submit(evaluate_chunk, candidates[index]): index for index in chunks}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+    results['pareto'] = pareto_front(results)
+
+    return results
+
+def pareto_front(results):
+    """Feasible candidates not dominated on (cruise efficiency, climb thrust)."""
+
+    eta    = results['cruise_efficiency']
+    thrust = results['climb_thrust']
+    ok     = results['feasible']
+
+    dominated = ((eta[None,:] >= eta[:,None]) & (thrust[None,:] >= thrust[:,None])
+                 & ((eta[None,:] > eta[:,None]) | (thrust[None,:] > thrust[:,None]))
+                 & ok[None,:])
+
+    return ok & ~dominated.any(axis=1)
+
+# ----------------------------------------------------------------------
+#   Worker
+# ----------------------------------------------------------------------
+
+def init_worker():
+    """Pool initializer only. Every design in the worker reads the polars
+    from the shared mapped database, patched in for the life of the
+    process, which ends with the pool."""
+
+    if _worker:
+        return
+
+    from polar_db import open_polar_db, use_polar_db
+
+    stack = ExitStack()
+    stack.enter_context(use_polar_db(open_polar_db()))
+    _worker['stack'] = stack
+
+    return
+
+def evaluate_chunk(candidates):
+
+    rows = np.zeros(len(candidates), dtype=CANDIDATE_DTYPE)
+    for i, candidate in enumerate(candidates):
+        rows[i] = tuple(candidate) + score(design(*candidate)) + (False,)
+
+    return rows
+
+def design(number_of_blades, design_Cl, design_rpm, tip_radius, design_power):
+
+    from SUAVE.Methods.Propulsion import propeller_design
+    import sling2
+
+    prop = sling2.propeller_setup(number_of_blades=number_of_blades, design_Cl=design_Cl,
+                                  design_rpm=design_rpm, tip_radius=tip_radius,
+                                  design_power=design_power)
+
+    return propeller_design(prop)
+
+def score(prop, cruise=CRUISE, climb=CLIMB):
+
+    eta_cruise, _,            rpm_cruise = power_matched(prop, **cruise)
+    _,          thrust_climb, rpm_climb  = power_matched(prop, **climb)
+
+    feasible = bool(np.isfinite(rpm_cruise) and np.isfinite(rpm_climb) and rpm_climb <= RATED_RPM)
+
+    return (eta_cruise, rpm_cruise, thrust_climb, rpm_climb, feasible)
+
+def power_matched(prop, altitude, air_speed, power, rpms=SCORE_RPMS):
+    """Efficiency, thrust and rpm at which the prop absorbs the given
+    shaft power, NaN if it cannot within the rpm range."""
+
+    from SUAVE.Core import Units
+    from atmosphere_table import standard_atmosphere
+    from propeller_map import axial_thrust, freestream_conditions
+
+    atmo       = standard_atmosphere().compute(altitude)
+    conditions = freestream_conditions(float(atmo['density']), float(atmo['dynamic_viscosity']),
+                                       float(atmo['speed_of_sound']), float(atmo['temperature']),
+                                       np.full(len(rpms), air_speed))
+
+    prop.inputs.omega = (rpms * Units.rpm)[:,None]
+    F, Q, P, Cp, outputs, etap = prop.spin(conditions)
+
+    P      = P[:,0]
+    thrust = axial_thrust(F)[0]
+
+    # absorbed power rises with rpm, take the first crossing
+    above = np.nonzero(P >= power)[0]
+    if len(above) == 0 or above[0] == 0:
+        return np.nan, np.nan, np.nan
+
+    i = above[0]
+    w = (power - P[i-1]) / (P[i] - P[i-1])
+
+    rpm      = rpms[i-1]   + w * (rpms[i]   - rpms[i-1])
+    T        = thrust[i-1] + w * (thrust[i] - thrust[i-1])
+    eta      = T * air_speed / power
+
+    return eta, T, rpm
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:55:03 2026
+
+@author: K. Grafton
+
+Tabulated performance map of the designed propeller. The blade element
+solve is run once over a grid of advance ratio, rpm and density, and the
+thrust and torque coefficients are interpolated during missions instead
+of spinning the full BEM model at every control point and iteration.
+Points off the grid fall back to BEM, and a new map is checked against
+BEM between its nodes (pmap.check).
+"""
+
+import hashlib
+import os
+import warnings
+
+import numpy as np
+from scipy.interpolate import interpn
+
+from SUAVE.Core import Data, Units
+from SUAVE.Components.Energy.Converters import Propeller
+from SUAVE.Analyses.Mission.Segments.Conditions import Aerodynamics
+
+from atmosphere_table import standard_atmosphere
+from design_cache import CACHE_DIR, airfoil_files, hash_value, load_entry, store_entry
+
+ADVANCE_RATIOS = np.linspace(0.02, 1.2, 60)
+RPMS           = np.linspace(2000., 6000., 17)
+ALTITUDES      = np.linspace(-500., 5000., 12) * Units.m
+
+# designed propeller attributes the map depends on
+MAP_KEYS = ('number_of_blades', 'tip_radius', 'hub_radius', 'twist_distribution',
+            'chord_distribution', 'radius_distribution', 'max_thickness_distribution',
+            'mid_chord_alignment', 'airfoil_polar_stations', 'orientation_euler_angles',
+            'variable_pitch')
+
+# ----------------------------------------------------------------------
+#   Mapped Propeller
+# ----------------------------------------------------------------------
+
+class Mapped_Propeller(Propeller):
+    """Propeller whose spin() interpolates a precomputed performance map.
+    Build it from a designed propeller with use_propeller_map().
+
+    off_map says what a call with any point outside the map's advance
+    ratio, rpm or density range does: 'bem' (default) spins the full
+    blade element model for that call, 'clip' takes the map's edge values
+    with a warning."""
+
+    def spin(self, conditions):
+
+        pmap  = self.performance_map
+        D     = 2. * self.tip_radius
+
+        rho   = conditions.freestream.density[:,0,None]
+        Vv    = conditions.frames.inertial.velocity_vector
+        V     = np.linalg.norm(Vv, axis=1)[:,None]
+        omega = self.inputs.omega
+        n     = omega / (2. * np.pi)
+        rpm   = omega / Units.rpm
+        J     = V / (n * D)
+
+        axes   = (pmap.advance_ratio, pmap.rpm, pmap.density)
+        points = np.column_stack([J[:,0], rpm[:,0], rho[:,0]])
+        inside = np.all([(p >= axis[0]) & (p <= axis[-1]) for p, axis in zip(points.T, axes)], axis=0)
+
+        if not inside.all():
+            if self.get('off_map', 'bem') == 'bem':
+                return Propeller.spin(self, conditions)
+            warnings.warn('%d of %d points off the propeller map, using its edge values'
+                          % ((~inside).sum(), len(inside)))
+            points = np.column_stack([np.clip(p, axis[0], axis[-1]) for p, axis in zip(points.T, axes)])
+
+        Ct     = interpn(axes, pmap.thrust_coefficient, points)[:,None]
+        Cq     = interpn(axes, pmap.torque_coefficient, points)[:,None]
+
+        thrust = Ct * rho * n**2 * D**4
+        Q      = Cq * rho * n**2 * D**5
+        P      = Q * omega
+        Cp     = P / (rho * n**3 * D**5)
+        etap   = np.where(P > 0., thrust * V / np.where(P > 0., P, 1.), 0.)
+        F      = thrust * np.asarray(pmap.thrust_direction)[None,:]
+
+        outputs                    = Data()
+        outputs.advance_ratio      = J
+        outputs.thrust_coefficient = Ct
+        outputs.torque_coefficient = Cq
+        outputs.power_coefficient  = Cp
+        outputs.efficiency         = etap
+        outputs.omega              = omega
+        self.outputs               = outputs
+
+        return F, Q, P, Cp, outputs, etap
+
+def use_propeller_map(vehicle, cache_dir=CACHE_DIR):
+    """Swaps every propeller on the vehicle networks for a mapped copy."""
+
+    for network in vehicle.networks.values():
+        for tag, prop in list(network.propellers.items()):
+            if isinstance(prop, Mapped_Propeller):
+                continue
+            network.propellers[tag] = mapped_propeller(prop, cache_dir)
+
+    return vehicle
+
+def mapped_propeller(prop, cache_dir=CACHE_DIR):
+
+    mapped = Mapped_Propeller()
+    for key, value in prop.items():
+        mapped[key] = value
+    mapped.performance_map = cached_performance_map(prop, cache_dir)
+
+    return mapped
+
+# ----------------------------------------------------------------------
+#   Map
+# ----------------------------------------------------------------------
+
+def cached_performance_map(prop, cache_dir=CACHE_DIR, advance_ratios=ADVANCE_RATIOS,
+                           rpms=RPMS, altitudes=ALTITUDES):
+
+    h = hashlib.sha256()
+    hash_value(h, {k: prop[k] for k in MAP_KEYS if k in prop})
+    hash_value(h, [advance_ratios, rpms, altitudes])
+    for path in airfoil_files(prop):
+        with open(path, 'rb') as f:
+            h.update(f.read())
+
+    path = os.path.join(cache_dir, 'propeller_map_' + h.hexdigest()[:32] + '.pkl')
+
+    pmap = load_entry(path)
+    if pmap is None:
+        pmap = performance_map(prop, advance_ratios, rpms, altitudes)
+        pmap.check = check_map(prop, pmap, altitudes)
+        store_entry(path, pmap)
+
+    return pmap
+
+def performance_map(prop, advance_ratios=ADVANCE_RATIOS, rpms=RPMS, altitudes=ALTITUDES,
+                    batch_size=512):
+    """Thrust and torque coefficients of the BEM model on an
+    (advance ratio, rpm, density) grid. Densities come from the standard
+    atmosphere at the given altitudes."""
+
+    atmo       = standard_atmosphere().compute(np.atleast_1d(altitudes))
+
+    # density must increase along its axis for interpolation
+    order      = np.argsort(atmo['density'])
+    rho        = atmo['density'][order]
+    mu         = atmo['dynamic_viscosity'][order]
+    a          = atmo['speed_of_sound'][order]
+    T          = atmo['temperature'][order]
+
+    D          = 2. * prop.tip_radius
+    JJ, RR, KK = np.meshgrid(advance_ratios, rpms, np.arange(len(rho)), indexing='ij')
+    JJ, RR, KK = JJ.ravel(), RR.ravel(), KK.ravel()
+
+    n          = RR / 60.
+    V          = JJ * n * D
+
+    Cq         = np.zeros(JJ.size)
+    F_all      = np.zeros((JJ.size, 3))
+
+    for start in range(0, JJ.size, batch_size):
+        s  = slice(start, min(start + batch_size, JJ.size))
+        k  = KK[s]
+
+        conditions = freestream_conditions(rho[k], mu[k], a[k], T[k], V[s])
+
+        prop.inputs.omega = (RR[s] * Units.rpm)[:,None]
+        F, Q, P, Cp, outputs, etap = prop.spin(conditions)
+
+        F_all[s] = F
+        Cq[s]    = Q[:,0] / (rho[k] * n[s]**2 * D**5)
+
+    thrust, direction = axial_thrust(F_all)
+    Ct                = thrust / (rho[KK] * n**2 * D**4)
+
+    shape = (len(advance_ratios), len(rpms), len(rho))
+
+    pmap                    = Data()
+    pmap.advance_ratio      = np.asarray(advance_ratios, dtype=float)
+    pmap.rpm                = np.asarray(rpms, dtype=float)
+    pmap.density            = rho
+    pmap.thrust_coefficient = Ct.reshape(shape)
+    pmap.torque_coefficient = Cq.reshape(shape)
+    pmap.thrust_direction   = direction
+
+    return pmap
+
+def check_map(prop, pmap, altitudes=ALTITUDES, n_points=64, tolerance=0.02, seed=0):
+    """Largest differences between the map's Ct and Cq and the BEM model
+    at random points between the grid nodes, as fractions of each
+    coefficient's range over the map. Warns above tolerance."""
+
+    rng = np.random.default_rng(seed)
+    J   = rng.uniform(pmap.advance_ratio[0], pmap.advance_ratio[-1], n_points)
+    rpm = rng.uniform(pmap.rpm[0], pmap.rpm[-1], n_points)
+    h   = rng.uniform(np.min(altitudes), np.max(altitudes), n_points)
+
+    atmo = standard_atmosphere().compute(h)
+    rho  = atmo['density']
+    D    = 2. * prop.tip_radius
+    n    = rpm / 60.
+
+    conditions        = freestream_conditions(rho, atmo['dynamic_viscosity'], atmo['speed_of_sound'],
+                                              atmo['temperature'], J * n * D)
+    prop.inputs.omega = (rpm * Units.rpm)[:,None]
+    F, Q, P, Cp, outputs, etap = prop.spin(conditions)
+
+    Ct_bem = (F @ pmap.thrust_direction) / (rho * n**2 * D**4)
+    Cq_bem = Q[:,0] / (rho * n**2 * D**5)
+
+    axes   = (pmap.advance_ratio, pmap.rpm, pmap.density)
+    points = np.column_stack([J, rpm, np.clip(rho, pmap.density[0], pmap.density[-1])])
+    Ct     = interpn(axes, pmap.thrust_coefficient, points)
+    Cq     = interpn(axes, pmap.torque_coefficient, points)
+
+    def error(mapped, bem, table):
+        return float(np.max(np.abs(mapped - bem)) / max(np.ptp(table), 1e-12))
+
+    check = {'thrust_coefficient': error(Ct, Ct_bem, pmap.thrust_coefficient),
+             'torque_coefficient': error(Cq, Cq_bem, pmap.torque_coefficient),
+             'points':             n_points}
+    if max(check['thrust_coefficient'], check['torque_coefficient']) > tolerance:
+        warnings.warn('propeller map differs from BEM by up to %.1f%% (Ct) and %.1f%% (Cq) of range'
+                      % (100. * check['thrust_coefficient'], 100. * check['torque_coefficient']))
+
+    return check
+
+def axial_thrust(F):
+    """Signed thrust of spin() force rows and the axis it acts along.
+    Thrust acts along a fixed axis for a fixed-pitch prop, taken from the
+    strongest row so windmilling rows come out negative."""
+
+    norms = np.linalg.norm(F, axis=1)
+    if not norms.size or norms.max() == 0.:
+        return np.zeros(len(F)), np.array([1., 0., 0.])
+
+    direction = F[np.argmax(norms)] / norms.max()
+
+    return F @ direction, direction
+
+def freestream_conditions(density, dynamic_viscosity, speed_of_sound, temperature, velocity):
+    """Level-flight conditions for direct prop.spin() calls, one row per
+    entry of the (broadcast) inputs."""
+
+    rho, mu, a, T, V = np.broadcast_arrays(*[np.atleast_1d(np.asarray(x, dtype=float))
+                                            for x in (density, dynamic_viscosity,
+                                                      speed_of_sound, temperature, velocity)])
+    N = rho.size
+
+    conditions                                   = Aerodynamics()
+    conditions.freestream.density                = rho.reshape(N, 1)
+    conditions.freestream.dynamic_viscosity      = mu.reshape(N, 1)
+    conditions.freestream.speed_of_sound         = a.reshape(N, 1)
+    conditions.freestream.temperature            = T.reshape(N, 1)
+    conditions.frames.inertial.velocity_vector   = np.column_stack([V.ravel(), np.zeros(N), np.zeros(N)])
+    conditions.frames.body.transform_to_inertial = np.tile(np.eye(3), (N, 1, 1))
+    conditions.propulsion.throttle               = np.ones((N, 1))
+
+    return conditions
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:12:48 2026
+
+@author: K. Grafton
+
+Columnar output of a Sling 2 run. Mission conditions, the payload-range
+table and the V-n envelopes are flattened into one .npz file with a fixed
+set of keys, so batch jobs can be post-processed without SUAVE.
+
+Keys:
+    schema_version
+    mission/<segment tag>/<condition path>   e.g. mission/cruise/weights.total_mass
+    payload_range/<field>
+    vn/<field>
+    vn/source       the model the envelope comes from, e.g. 'vn_envelope'
+                    (FAR 23 in this repo), not SUAVE's V_n_diagram
+"""
+
+import numpy as np
+
+SCHEMA_VERSION = 1
+
+# condition paths kept for every segment, values stored as SUAVE holds them (SI)
+MISSION_FIELDS = ('frames.inertial.time',
+                  'frames.inertial.position_vector',
+                  'frames.inertial.velocity_vector',
+                  'frames.body.inertial_rotations',
+                  'frames.body.thrust_force_vector',
+                  'frames.wind.lift_force_vector',
+                  'frames.wind.drag_force_vector',
+                  'freestream.altitude',
+                  'freestream.velocity',
+                  'freestream.density',
+                  'freestream.mach_number',
+                  'freestream.dynamic_pressure',
+                  'aerodynamics.angle_of_attack',
+                  'aerodynamics.lift_coefficient',
+                  'aerodynamics.drag_coefficient',
+                  'propulsion.throttle',
+                  'propulsion.propeller_rpm',
+                  'propulsion.propeller_efficiency',
+                  'weights.total_mass',
+                  'weights.vehicle_mass_rate')
+
+PAYLOAD_RANGE_FIELDS = ('range', 'payload', 'fuel', 'takeoff_weight', 'reserves')
+
+def mission_arrays(results, fields=MISSION_FIELDS):
+    """Flattens mission results into {'mission/<tag>/<path>': array}.
+    Paths a segment does not carry are filled with NaN so the key set
+    stays the same from run to run."""
+
+    arrays = {}
+    for tag, segment in results.segments.items():
+        conditions = segment.conditions
+        n_points   = conditions.frames.inertial.time.shape[0]
+        for path in fields:
+            value = lookup(conditions, path)
+            if value is None:
+                value = np.full((n_points, 1), np.nan)
+            arrays['mission/%s/%s' % (tag, path)] = np.asarray(value, dtype=float)
+
+    return arrays
+
+def write_results(path, results=None, payload_range=None, vn=None, compressed=False,
+                  vn_source='vn_envelope'):
+
+    arrays = {'schema_version': np.array(SCHEMA_VERSION)}
+
+    if results is not None:
+        arrays.update(mission_arrays(results))
+
+    if payload_range is not None:
+        for field in PAYLOAD_RANGE_FIELDS:
+            arrays['payload_range/' + field] = np.asarray(payload_range[field], dtype=float)
+
+    if vn is not None:
+        vn = np.atleast_1d(vn)
+        for field in vn.dtype.names:
+            arrays['vn/' + field] = vn[field]
+        arrays['vn/source'] = np.array(vn_source)
+
+    save = np.savez_compressed if compressed else np.savez
+    save(path, **arrays)
+
+    return path
+
+def read_results(path):
+
+    with np.load(path) as data:
+        arrays = {key: data[key] for key in data.files}
+
+    if int(arrays['schema_version']) != SCHEMA_VERSION:
+        raise ValueError('%s has schema version %d, expected %d'
+                         % (path, arrays['schema_version'], SCHEMA_VERSION))
+
+    return arrays
+
+def lookup(data, path):
+    """Follows a dotted path through nested Data, None if any level is
+    missing."""
+
+    for key in path.split('.'):
+        if key not in data:
+            return None
+        data = data[key]
+
+    return data
@@ -7,36 +7,47 @@ Created on Sat Jan 14 15:11:02 2023
 Adpated from E. Botero tut_C172.py
 """
 
-import numpy as np
-import matplotlib.pyplot as plt
-
-import SUAVE
-assert SUAVE.__version__=='2.5.2', 'These tutorials only work with the SUAVE 2.5.2 release'
-from SUAVE.Core import Units
+import sys
+import time
 
-from SUAVE.Methods.Propulsion import propeller_design
-from SUAVE.Methods.Geometry.Two_Dimensional.Planform import segment_properties
-from SUAVE.Plots.Performance import *
-from SUAVE.Methods.Performance  import payload_range, V_n_diagram
+import numpy as np
 
-from SUAVE.Input_Output.OpenVSP import write
+# SUAVE, matplotlib and ADRpy are imported inside the functions that use
+# them, so a subcommand only pays for the modules its stage needs
 
-from ADRpy import airworthiness as aw
-from ADRpy import unitconversions as co
-from ADRpy import atmospheres as at
+def _suave():
+    import SUAVE
+    assert SUAVE.__version__=='2.5.2', 'These tutorials only work with the SUAVE 2.5.2 release'
+    return SUAVE
 
-def main(): 
+def main(headless=False,output=None): 
+    
+    import matplotlib.pyplot as plt
+    _suave()
+    from SUAVE.Core import Units
+    from SUAVE.Methods.Performance  import V_n_diagram
+    from payload_range_batch import payload_range_batch
+    from results_io import write_results
+    from vn_envelope import vn_envelopes
+    from instrumentation import stage
     
-    vehicle    = vehicle_setup()
+    if headless:
+        plt.switch_backend('Agg')
     
+    with stage('vehicle_setup'):
+        vehicle    = vehicle_setup()
+    
+#    from SUAVE.Input_Output.OpenVSP import write
 #    write(vehicle,'Sling_2')
     
     configs = configs_setup(vehicle)
     
     analyses = base_analysis(vehicle)
     
-    configs.finalize()
-    analyses.finalize()
+    with stage('configs.finalize'):
+        configs.finalize()
+    with stage('analyses.finalize'):
+        analyses.finalize()
     
    
     
@@ -44,28 +55,52 @@ def main():
     mission  = mission_setup(analyses,vehicle)
     
     
-    results = mission.evaluate()
+    with stage('mission.evaluate'):
+        results = mission.evaluate()
     
     # run payload diagram
-    config = configs.base
     cruise_segment_tag = "cruise"
     reserves = 0.
-    payload_range_results = payload_range(config,mission,cruise_segment_tag,reserves)
+    with stage('payload_range'):
+        payload_range_results = payload_range_batch(vehicle,analyses,reserves=reserves,
+                                                    cruise_segment_tag=cruise_segment_tag,
+                                                    write=None if headless else 'PayloadRangeDiagram.dat')[0]
     
-    plot_mission(results)
+    if not headless:
+        with stage('plot_mission'):
+            plot_mission(results)
     
 #    weights = analyses.configs.base.weights
 #    breakdown = weights.evaluate()  
     
-    loads(vehicle)
+    if not headless:
+        with stage('loads'):
+            loads(vehicle)
     
     altitude = 0 * Units.m
     delta_ISA = 20 * Units.degC
     weight = vehicle.mass_properties.max_takeoff
-    V_n_diagram(vehicle,analyses,weight, altitude, delta_ISA)
+    if not headless:
+        with stage('V_n_diagram'):
+            V_n_diagram(vehicle,analyses,weight, altitude, delta_ISA)
+    
+    # the file holds vn_envelope's FAR 23 envelope in both modes, tagged
+    # as such. SUAVE's V_n_diagram above is a different model and only
+    # drawn and written to its own files
+    if output is not None:
+        with stage('write_results'):
+            vn = vn_envelopes(vehicle, weight, altitude, delta_ISA)
+            write_results(output, results, payload_range_results, vn)
+    
     print("Complete")
 
-def vehicle_setup(): 
+def vehicle_setup(propeller_map=False,propeller_inputs=None): 
+    
+    SUAVE = _suave()
+    from SUAVE.Core import Units
+    from SUAVE.Methods.Geometry.Two_Dimensional.Planform import segment_properties
+    from design_cache import cached_propeller_design
+    from instrumentation import stage
       
     vehicle                                     = SUAVE.Vehicle()
     vehicle.tag                                 = 'Sling_2'
@@ -330,16 +365,52 @@ def vehicle_setup():
     net.engines.append(engine)
     
     # the prop
+    prop                         = propeller_setup(**(propeller_inputs or {}))
+    with stage('propeller_design'):
+        prop                     = cached_propeller_design(prop)   
+    
+    net.propellers.append(prop)
+     
+    
+    # add the network to the vehicle
+    vehicle.append_component(net) 
+    
+    # interpolate a tabulated map of the prop instead of running BEM in missions
+    if propeller_map:
+        from propeller_map import use_propeller_map
+        vehicle = use_propeller_map(vehicle)
+
+
+    # ------------------------------------------------------------------
+    #   Vehicle Definition Complete
+    # ------------------------------------------------------------------
+    
+    return vehicle
+
+def propeller_setup(number_of_blades=3.0,design_Cl=0.8,design_rpm=4500.,tip_radius=None,design_power=None):
+    
+    SUAVE = _suave()
+    from SUAVE.Core import Units
+    
+    # ------------------------------------------------------------------
+    #   Propeller inputs, designed by propeller_design()
+    # ------------------------------------------------------------------
+    
+    if tip_radius is None:
+        tip_radius   = 1.83/2. * Units.m
+    if design_power is None:
+        design_power = .64 * 73.5 * Units.kilowatts
+    
     prop = SUAVE.Components.Energy.Converters.Propeller()
-    prop.number_of_blades        = 3.0
+    prop.number_of_blades        = number_of_blades
     prop.origin                  = [[0.625 * Units.m,0.0,0.625 * Units.m]]
     prop.freestream_velocity     = 60.   * Units.knots
-    prop.angular_velocity        = 4500.  * Units.rpm
-    prop.tip_radius              = 1.83/2. * Units.m
+    prop.angular_velocity        = design_rpm * Units.rpm
+    prop.tip_radius              = tip_radius
     prop.hub_radius              = 0.28/2     * Units.m
-    prop.design_Cl               = 0.8
+    prop.design_Cl               = design_Cl
     prop.design_altitude         = 9500. * Units.feet
-    prop.design_power            = .64 * 73.5 * Units.kilowatts
+    prop.design_power            = design_power
     prop.variable_pitch          = False
     
 
@@ -350,23 +421,14 @@ def vehicle_setup():
                                       './Airfoils/Polars/NACA_4412_polar_Re_500000.txt' ,
                                       './Airfoils/Polars/NACA_4412_polar_Re_1000000.txt' ]]
 
-    prop.airfoil_polar_stations  = [0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]      
-    prop                         = propeller_design(prop)   
+    prop.airfoil_polar_stations  = [0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0,0]
     
-    net.propellers.append(prop)
-     
-    
-    # add the network to the vehicle
-    vehicle.append_component(net) 
-
-
-    # ------------------------------------------------------------------
-    #   Vehicle Definition Complete
-    # ------------------------------------------------------------------
-    
-    return vehicle
+    return prop
 
 def configs_setup(vehicle):
+    
+    SUAVE = _suave()
+    
     # ------------------------------------------------------------------
     #   Initialize Configurations
     # ------------------------------------------------------------------ 
@@ -388,7 +450,10 @@ def configs_setup(vehicle):
 #   Define the Mission
 # ----------------------------------------------------------------------
 
-def mission_setup(analyses,vehicle):
+def mission_setup(analyses,vehicle,altitude=None,air_speed=None,distance=None,rpm=5500,number_control_points=16):
+    
+    SUAVE = _suave()
+    from SUAVE.Core import Units
 
     # ------------------------------------------------------------------
     #   Initialize the Mission
@@ -415,14 +480,21 @@ def mission_setup(analyses,vehicle):
 
     segment.analyses.extend( analyses )
 
-    segment.altitude  = 9500. * Units.feet
-    segment.air_speed = 120   * Units.knots
-    segment.distance  = 600 * Units.nautical_mile
+    if altitude is None:
+        altitude  = 9500. * Units.feet
+    if air_speed is None:
+        air_speed = 120   * Units.knots
+    if distance is None:
+        distance  = 600 * Units.nautical_mile
+
+    segment.altitude  = altitude
+    segment.air_speed = air_speed
+    segment.distance  = distance
     
     ones_row                                        = segment.state.ones_row   
-    segment.state.numerics.number_control_points    = 16
+    segment.state.numerics.number_control_points    = number_control_points
     segment.state.unknowns.throttle                 = 1.0 * ones_row(1)
-    segment = vehicle.networks.internal_combustion.add_unknowns_and_residuals_to_segment(segment,rpm=5500)
+    segment = vehicle.networks.internal_combustion.add_unknowns_and_residuals_to_segment(segment,rpm=rpm)
     
     
     segment.process.iterate.conditions.stability    = SUAVE.Methods.skip
@@ -434,7 +506,11 @@ def mission_setup(analyses,vehicle):
 
     return mission
 
-def base_analysis(vehicle):
+def base_analysis(vehicle,drag_area=None):
+    
+    SUAVE = _suave()
+    from SUAVE.Core import Units
+    
 
     # ------------------------------------------------------------------
     #   Initialize the Analyses
@@ -473,7 +549,8 @@ def base_analysis(vehicle):
     total_strut = 2*main_gear_strut_height*main_gear_strut_length + nose_gear_strut_height*nose_gear_strut_width
     
     # total drag increment area
-    drag_area = 1.4*( total_wheel + total_strut)
+    if drag_area is None:
+        drag_area = 1.4*( total_wheel + total_strut)
     
     
     aerodynamics = SUAVE.Analyses.Aerodynamics.Fidelity_Zero() 
@@ -494,7 +571,9 @@ def base_analysis(vehicle):
 
     # ------------------------------------------------------------------
     #  Atmosphere Analysis
-    atmosphere = SUAVE.Analyses.Atmospheric.US_Standard_1976()
+    # US_Standard_1976 answered from the shared precomputed table
+    from atmosphere_table import suave_atmosphere
+    atmosphere = suave_atmosphere()
     atmosphere.features.planet = planet.features
     analyses.append(atmosphere)   
 
@@ -505,7 +584,15 @@ def base_analysis(vehicle):
 #   Plot Mission
 # ----------------------------------------------------------------------
 
-def plot_mission(results,line_style='bo-'):
+def plot_mission(results,line_style='bo-',decimate=False):
+    
+    import matplotlib.pyplot as plt
+    from SUAVE.Plots.Performance import (plot_flight_conditions, plot_aerodynamic_forces,
+                                         plot_aerodynamic_coefficients, plot_drag_components,
+                                         plot_altitude_sfc_weight, plot_aircraft_velocities,
+                                         plot_stability_coefficients)
+    
+    existing = set(plt.get_fignums())
     
     # Plot Flight Conditions 
     plot_flight_conditions(results, line_style)
@@ -526,13 +613,25 @@ def plot_mission(results,line_style='bo-'):
     plot_aircraft_velocities(results, line_style)  
     
     plot_stability_coefficients(results, line_style)
+    
+    # for dense missions (a few control points per segment gain nothing):
+    # only the figures drawn here are cut to about two points per pixel,
+    # re-decimated on zoom
+    if decimate:
+        from decimated_plot import decimate_figure
+        for number in plt.get_fignums():
+            if number not in existing:
+                decimate_figure(plt.figure(number))
 
     return
 
 
 
 
-def loads(vehicle):
+def loads(vehicle,show=True):
+    
+    from ADRpy import airworthiness as aw
+    from atmosphere_table import adrpy_atmosphere
         
     designbrief = {}
      
@@ -545,7 +644,7 @@ def loads(vehicle):
     designpropulsion = "piston" # not specifically needed for the V-n diagram here, required simply for 
                                 # consistency with other classes and to support features included in later releases 
     
-    designatm = at.Atmosphere() # set the design atmosphere to a zero-offset ISA
+    designatm = adrpy_atmosphere() # zero-offset ISA from the same table as the mission
     
     csbrief={'cruisespeed_keas': 60, 'divespeed_keas': 110,
     'altitude_m': 0,
@@ -553,10 +652,351 @@ def loads(vehicle):
     
     concept = aw.CertificationSpecifications(designbrief, designdef, designperf, designatm, designpropulsion, csbrief)
     
-    points = concept.flightenvelope(textsize=15, figsize_in=[15, 10], show=True)
+    points = concept.flightenvelope(textsize=15, figsize_in=[15, 10], show=show)
         
     return
 
+# ----------------------------------------------------------------------
+#   Command Line
+# ----------------------------------------------------------------------
+
+# modules each subcommand needs, imported first so their cost shows up in
+# the import report. 'main' is the full run with no subcommand.
+STARTUP_IMPORTS = {'vehicle':       ('SUAVE', 'SUAVE.Methods.Propulsion', 'design_cache'),
+                   'mission':       ('SUAVE', 'design_cache', 'results_io'),
+                   'payload-range': ('SUAVE', 'design_cache', 'scipy.interpolate', 'scipy.optimize',
+                                     'payload_range_batch'),
+                   'vn':            ('SUAVE', 'design_cache', 'vn_envelope'),
+                   'loads':         ('SUAVE', 'design_cache', 'matplotlib.pyplot', 'ADRpy.airworthiness',
+                                     'ADRpy.atmospheres'),
+                   'plot':          ('SUAVE', 'design_cache', 'matplotlib.pyplot', 'SUAVE.Plots.Performance',
+                                     'decimated_plot'),
+                   'main':          ('SUAVE', 'design_cache', 'matplotlib.pyplot', 'SUAVE.Plots.Performance',
+                                     'SUAVE.Methods.Performance', 'ADRpy.airworthiness', 'ADRpy.atmospheres',
+                                     'decimated_plot', 'payload_range_batch', 'results_io', 'vn_envelope')}
+
+# seconds allowed for those imports, warned about when exceeded and fatal
+# with --check-budget
+STARTUP_BUDGETS = {'vehicle':       3.0,
+                   'mission':       3.0,
+                   'payload-range': 3.5,
+                   'vn':            3.0,
+                   'loads':         4.5,
+                   'plot':          4.5,
+                   'main':          6.0}
+
+def timed_imports(modules):
+    """Imports each module in turn. Returns (module, seconds, modules
+    loaded) for each, so shared dependencies are charged to the first
+    module that pulls them in."""
+
+    import importlib
+
+    report = []
+    for name in modules:
+        count = len(sys.modules)
+        t0    = time.perf_counter()
+        if name == 'SUAVE':
+            _suave()
+        else:
+            importlib.import_module(name)
+        report.append((name, time.perf_counter() - t0, len(sys.modules) - count))
+
+    return report
+
+def print_import_report(report, budget=None, file=None):
+
+    file  = sys.stderr if file is None else file
+    total = sum(seconds for name, seconds, count in report)
+
+    for name, seconds, count in report:
+        print('  import %-28s %7.3f s %6d modules' % (name, seconds, count), file=file)
+    print('  %-35s %7.3f s' % ('total', total), file=file)
+    if budget is not None:
+        print('  %-35s %7.3f s' % ('budget', budget), file=file)
+
+    return total
+
+def load_vehicle(args):
+    """The pickled vehicle given with --vehicle, otherwise vehicle_setup()."""
+
+    from instrumentation import stage
+
+    if args.vehicle is None:
+        with stage('vehicle_setup'):
+            return vehicle_setup(propeller_map=args.propeller_map)
+
+    import pickle
+
+    _suave()
+    with open(args.vehicle, 'rb') as f:
+        vehicle = pickle.load(f)
+    if args.propeller_map:
+        from propeller_map import use_propeller_map
+        vehicle = use_propeller_map(vehicle)
+
+    return vehicle
+
+def evaluate_mission(args):
+
+    from SUAVE.Core import Units
+    from instrumentation import stage
+
+    vehicle  = load_vehicle(args)
+    analyses = base_analysis(vehicle)
+    with stage('analyses.finalize'):
+        analyses.finalize()
+
+    def scaled(value, unit):
+        return None if value is None else value * unit
+
+    def setup(number_control_points):
+        return mission_setup(analyses, vehicle,
+                             altitude  = scaled(args.altitude, Units.feet),
+                             air_speed = scaled(args.air_speed, Units.knots),
+                             distance  = scaled(args.distance, Units.nautical_mile),
+                             rpm       = args.rpm,
+                             number_control_points = number_control_points)
+
+    if args.fuel_tolerance is None:
+        mission = setup(args.control_points)
+        with stage('mission.evaluate'):
+            results = mission.evaluate()
+        return vehicle, analyses, results
+
+    # the control points are chosen per segment to meet the fuel tolerance
+    from adaptive_mission import evaluate_adaptive
+
+    with stage('mission.evaluate'):
+        results, info = evaluate_adaptive(setup, tolerance=args.fuel_tolerance)
+
+    for tag, n in info['control_points'].items():
+        print('%-12s %4d control points, fuel error estimate %.3g kg' % (tag, n, info['error_estimate'][tag]),
+              file=sys.stderr)
+    if not info['converged']:
+        print('fuel tolerance of %g kg not met after %d rounds' % (args.fuel_tolerance, info['rounds']),
+              file=sys.stderr)
+
+    return vehicle, analyses, results
+
+def run_vehicle(args):
+
+    vehicle = load_vehicle(args)
+    wing    = vehicle.wings.main_wing
+    prop    = list(vehicle.networks.internal_combustion.propellers.values())[0]
+
+    print('%s: MTOW %.0f kg, wing area %.2f m^2, span %.2f m, %d blade prop of radius %.3f m'
+          % (vehicle.tag, vehicle.mass_properties.max_takeoff, wing.areas.reference,
+             wing.spans.projected, prop.number_of_blades, prop.tip_radius))
+
+    if args.output:
+        import pickle
+        with open(args.output, 'wb') as f:
+            pickle.dump(vehicle, f)
+
+    return
+
+def run_mission(args):
+
+    from results_io import write_results
+
+    vehicle, analyses, results = evaluate_mission(args)
+
+    for tag, segment in results.segments.items():
+        t    = segment.conditions.frames.inertial.time[:,0]
+        mass = segment.conditions.weights.total_mass[:,0]
+        print('%-12s %8.1f min %8.2f kg fuel' % (tag, (t[-1] - t[0]) / 60., mass[0] - mass[-1]))
+
+    if args.output:
+        write_results(args.output, results)
+
+    return
+
+def run_payload_range(args):
+
+    from payload_range_batch import payload_range_batch
+
+    vehicle  = load_vehicle(args)
+    analyses = base_analysis(vehicle)
+    analyses.finalize()
+
+    rows = payload_range_batch(vehicle, analyses, reserves=args.reserves, write=args.output)[0]
+
+    print('    RANGE    |   PAYLOAD   |   FUEL      |    TOW      |')
+    for row in rows:
+        print('%10.0f   |%10.0f   |%10.0f   |%10.0f   |'
+              % (row['range'], row['payload'], row['fuel'], row['takeoff_weight']))
+
+    return
+
+def run_vn(args):
+
+    from vn_envelope import FT, KNOT, vn_envelopes, plot_vn_diagram
+
+    vehicle = load_vehicle(args)
+    weights = [vehicle.mass_properties.max_takeoff] if args.weight is None else args.weight
+
+    # every combination of the given weights, altitudes and ISA offsets
+    envelopes = vn_envelopes(vehicle, np.reshape(weights, (-1, 1, 1)),
+                             np.reshape(args.altitude, (1, -1, 1)) * FT,
+                             np.reshape(args.delta_isa, (1, 1, -1)), write=args.output)
+
+    for env in np.atleast_1d(envelopes).ravel():
+        print('W %6.0f kg  h %6.0f ft  dISA %5.1f K:  Va %5.1f  Vc %5.1f  Vd %5.1f KEAS  n %+5.2f / %+5.2f'
+              % (env['weight'], env['altitude'] / FT, env['delta_ISA'], env['Va'] / KNOT, env['Vc'] / KNOT,
+                 env['Vd'] / KNOT, env['n_limit_positive'], env['n_limit_negative']))
+
+    if args.plot:
+        import matplotlib
+        matplotlib.use('Agg')
+        ax = plot_vn_diagram(np.atleast_1d(envelopes).ravel()[0])
+        ax.figure.savefig(args.plot)
+
+    return
+
+def run_loads(args):
+
+    import matplotlib.pyplot as plt
+
+    if args.save:
+        plt.switch_backend('Agg')
+
+    loads(load_vehicle(args), show=not args.save)
+
+    if args.save:
+        plt.gcf().savefig(args.save)
+
+    return
+
+def run_plot(args):
+
+    import os
+    import matplotlib.pyplot as plt
+
+    if args.save_dir:
+        plt.switch_backend('Agg')
+
+    vehicle, analyses, results = evaluate_mission(args)
+    plot_mission(results)
+
+    if args.save_dir:
+        from decimated_plot import render_figures
+        os.makedirs(args.save_dir, exist_ok=True)
+        figures = [plt.figure(number) for number in plt.get_fignums()]
+        paths   = [os.path.join(args.save_dir, (fig.get_label() or 'figure_%d' % fig.number).replace(' ', '_') + '.png')
+                   for fig in figures]
+        render_figures(figures, paths)
+    else:
+        plt.show()
+
+    return
+
+def run_main(args):
+
+    output = args.main_output
+    if args.headless and output is None:
+        output = 'Sling_2_results.npz'
+
+    main(headless=args.headless, output=output)
+    if not args.headless:
+        import matplotlib.pyplot as plt
+        plt.show()
+
+    return
+
+def cli(argv=None):
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Sling 2 performance analysis. With no command '
+                                                 'the full analysis is run.')
+    parser.add_argument('--headless', action='store_true', help='skip all plotting and write results to --output instead')
+    # its own dest, a subcommand's --output default would overwrite it
+    parser.add_argument('--output', dest='main_output', default=None,
+                        help='columnar results file (.npz) of the full analysis')
+    parser.add_argument('--import-report', action='store_true', help='print the time spent importing each module')
+    parser.add_argument('--check-budget', action='store_true', help='exit with status 3 if the imports exceed the startup budget')
+    parser.add_argument('--instrument', default=None, help='write per-stage timings and call counts to this JSON '
+                                                           'file, Chrome trace events if it ends in .trace.json')
+    parser.add_argument('--profile-dir', default=None, help='save a cProfile of each pipeline stage here')
+    parser.add_argument('--trace-memory', action='store_true', help='record peak traced memory per stage (slower)')
+    parser.set_defaults(command='main', run=run_main)
+
+    commands = parser.add_subparsers(metavar='command')
+
+    def command(name, run, help):
+        sub = commands.add_parser(name, help=help)
+        sub.add_argument('--vehicle', default=None, help='pickled vehicle from "vehicle --output" instead of building it')
+        sub.add_argument('--propeller-map', action='store_true', help='interpolate a tabulated propeller map instead of BEM')
+        sub.set_defaults(command=name, run=run)
+        return sub
+
+    def mission_arguments(sub):
+        sub.add_argument('--altitude', type=float, default=None, help='cruise altitude (ft)')
+        sub.add_argument('--air-speed', type=float, default=None, help='cruise air speed (kt)')
+        sub.add_argument('--distance', type=float, default=None, help='cruise distance (nmi)')
+        sub.add_argument('--rpm', type=float, default=5500., help='initial propeller rpm guess of the solver')
+        sub.add_argument('--control-points', type=int, default=16, help='control points per segment')
+        sub.add_argument('--fuel-tolerance', type=float, default=None, help='refine each segment until its fuel '
+                                                                            'burn changes by less than this (kg)')
+        return sub
+
+    sub = command('vehicle', run_vehicle, 'build the vehicle and designed propeller')
+    sub.add_argument('--output', default=None, help='pickle the vehicle to this file')
+
+    sub = mission_arguments(command('mission', run_mission, 'evaluate the cruise mission'))
+    sub.add_argument('--output', default=None, help='columnar results file (.npz)')
+
+    sub = command('payload-range', run_payload_range, 'payload-range diagram')
+    sub.add_argument('--reserves', type=float, default=0., help='reserve fuel (kg)')
+    sub.add_argument('--output', default=None, help='write the diagram to this .dat file')
+
+    sub = command('vn', run_vn, 'FAR 23 V-n envelopes')
+    sub.add_argument('--weight', type=float, nargs='+', default=None, help='weights (kg), default MTOW')
+    sub.add_argument('--altitude', type=float, nargs='+', default=[0.], help='altitudes (ft)')
+    sub.add_argument('--delta-isa', type=float, nargs='+', default=[0.], help='ISA offsets (K)')
+    sub.add_argument('--output', default=None, help='write the envelope table to this file')
+    sub.add_argument('--plot', default=None, help='save the first V-n diagram to this image')
+
+    sub = command('loads', run_loads, 'ADRpy flight envelope')
+    sub.add_argument('--save', default=None, help='save the figure here instead of showing it')
+
+    sub = mission_arguments(command('plot', run_plot, 'evaluate the mission and plot it'))
+    sub.add_argument('--save-dir', default=None, help='save the figures here instead of showing them')
+
+    args = parser.parse_args(argv)
+    if args.command != 'main' and args.main_output is not None:
+        parser.error('--output before a command belongs to the full analysis, '
+                     'give it after "%s"' % args.command)
+
+    budget = STARTUP_BUDGETS[args.command]
+    report = timed_imports(STARTUP_IMPORTS[args.command])
+    total  = sum(seconds for name, seconds, count in report)
+
+    if args.import_report:
+        print_import_report(report, budget)
+    if total > budget:
+        print('%s: imports took %.2f s, over the %.2f s startup budget' % (args.command, total, budget),
+              file=sys.stderr)
+        if args.check_budget:
+            return 3
+
+    if args.instrument is None and args.profile_dir is None:
+        args.run(args)
+        return 0
+
+    from instrumentation import Instrumentation, stage
+
+    with Instrumentation(profile_dir=args.profile_dir, profile_depth=1,
+                         trace_memory=args.trace_memory) as inst:
+        with stage(args.command):
+            args.run(args)
+
+    inst.report()
+    if args.instrument:
+        inst.write(args.instrument)
+
+    return 0
+
 if __name__ == '__main__':
-    main()
-    plt.show()
\ No newline at end of file
+    sys.exit(cli())
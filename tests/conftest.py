@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""
+The modules live at the top of the repository, not in a package. Tests
+import them from there and keep every cache under a temporary directory.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from adaptive_mission import evaluate_adaptive
+
+class Data(dict):
+    """Attribute access like SUAVE's Data."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    __setattr__ = dict.__setitem__
+
+class StubMission:
+    """A mission whose segment fuel burns are known functions of their
+    control points, in place of mission_setup()."""
+
+    def __init__(self, burns, solves, unconverged):
+
+        self.burns       = burns
+        self.solves      = solves
+        self.unconverged = unconverged
+        self.segments    = Data({tag: Data(settings=Data(), state=Data(numerics=Data(), unknowns=Data()))
+                                 for tag in burns})
+
+    def evaluate(self):
+
+        results = Data(segments=Data())
+        for tag, segment in self.segments.items():
+            state = segment.state
+            n     = state.numerics.number_control_points
+            guess = state.unknowns.get('throttle')
+            self.solves.append((tag, n, None if guess is None else guess[:,0].copy()))
+
+            converged = (tag, n) not in self.unconverged
+            burn      = self.burns[tag](n) if converged else 1000.
+            mass      = 700. - burn * np.linspace(0., 1., n)[:,None]
+
+            # the solution marks which solve it came from
+            state.unknowns.throttle             = np.full((n, 1), float(n))
+            state.numerics.converged            = converged
+            state.numerics.residual_evaluations = 10
+            results.segments[tag] = Data(state=state, conditions=Data(weights=Data(total_mass=mass)))
+
+        return results
+
+def stub_setup(burns, unconverged=()):
+
+    solves = []
+
+    def setup(number_control_points):
+        return StubMission(burns, solves, set(unconverged))
+
+    return setup, solves
+
+def climb(n):
+    return 5. + 50. / n**2
+
+def cruise(n):
+    return 20.
+
+def test_refines_by_2n_minus_1_until_the_tolerance():
+
+    setup, solves = stub_setup({'climb': climb, 'cruise': cruise})
+    results, info = evaluate_adaptive(setup, tolerance=0.05)
+
+    assert [n for tag, n, guess in solves if tag == 'climb']  == [9, 17, 33, 65]
+    assert [n for tag, n, guess in solves if tag == 'cruise'] == [9, 17, 17, 17]
+
+    assert info['control_points'] == {'climb': 65, 'cruise': 17}
+    assert info['error_estimate']['climb'] == pytest.approx(climb(33) - climb(65))
+    assert info['error_estimate']['cruise'] == 0.
+    assert info['fuel_burn']['climb'] == pytest.approx(climb(65))
+    assert info['converged'] and info['unconverged'] == [] and info['rounds'] == 4
+    assert info['residual_evaluations'] == 8 * 10
+
+    # each solve starts from the last solution on the new grid
+    for tag, n, guess in solves[2:]:
+        assert guess is not None and len(guess) == n
+
+def test_a_looser_tolerance_stops_sooner():
+
+    setup, solves = stub_setup({'climb': climb})
+    results, info = evaluate_adaptive(setup, tolerance=0.5)
+
+    assert [n for tag, n, guess in solves] == [9, 17]
+    assert info['converged'] and info['control_points'] == {'climb': 17}
+
+def test_unconverged_solves_never_give_the_estimate():
+
+    setup, solves = stub_setup({'climb': climb}, unconverged=[('climb', 17)])
+    results, info = evaluate_adaptive(setup, tolerance=0.05)
+
+    # the failed 17 point solve is refined past, and compared against nothing
+    assert [n for tag, n, guess in solves] == [9, 17, 33, 65]
+    assert info['error_estimate']['climb'] == pytest.approx(climb(33) - climb(65))
+    assert info['converged']
+
+    # nor does it seed the next solve: the 33 point guess comes from the 9 point solution
+    guesses = {n: guess for tag, n, guess in solves}
+    np.testing.assert_array_equal(guesses[33], 9.)
+    np.testing.assert_array_equal(guesses[65], 33.)
+
+def test_unconverged_last_solve_is_reported():
+
+    setup, solves = stub_setup({'climb': climb}, unconverged=[('climb', 33), ('climb', 65)])
+    results, info = evaluate_adaptive(setup, tolerance=0.05, max_points=65)
+
+    assert info['unconverged'] == ['climb'] and not info['converged']
+    assert info['error_estimate']['climb'] == np.inf
+
+def test_refinement_stops_at_max_points():
+
+    setup, solves = stub_setup({'climb': lambda n: 5. + n / 10.})
+    results, info = evaluate_adaptive(setup, tolerance=0.05, max_points=33)
+
+    assert [n for tag, n, guess in solves] == [9, 17, 33]
+    assert not info['converged'] and info['control_points'] == {'climb': 33}
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import analysis_server
+from analysis_server import AnalysisServer, normalise
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Stands in for the SUAVE workers: records every batch and answers
+    each request with its own parameters."""
+
+    batches = []
+    lock    = threading.Lock()
+
+    def runner(kind):
+        def run(params):
+            with lock:
+                batches.append((kind, params))
+            if any(p.get('altitude') == -1. for p in params):
+                raise RuntimeError('solver failed')
+            return [dict(p, kind=kind) for p in params]
+        return run
+
+    monkeypatch.setattr(analysis_server, 'BATCH_RUNNERS', {kind: runner(kind) for kind in
+                                                           analysis_server.DEFAULTS})
+
+    return batches
+
+def serve(test, **kwargs):
+    """Runs test(server) against a server on a thread pool."""
+
+    async def main():
+        server          = AnalysisServer(**kwargs)
+        server._pool    = ThreadPoolExecutor(server.max_workers)
+        server._queue   = asyncio.Queue()
+        server._batcher = asyncio.create_task(server._batch_loop())
+        try:
+            return await test(server)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+def test_concurrent_requests_are_batched(runs):
+
+    async def test(server):
+        speeds = [50. + i for i in range(10)]
+        return await asyncio.gather(*[server.query('mission', {'air_speed': v}) for v in speeds]
+                                    + [server.query('vn', {'weight': w}) for w in (600., 700.)])
+
+    answers = serve(test, max_workers=2, batch_window=0.05)
+
+    assert [a['air_speed'] for a in answers[:10]] == [50. + i for i in range(10)]
+    assert [a['weight'] for a in answers[10:]] == [600., 700.]
+
+    # missions split across the two workers in speed order, V-n whole
+    missions = [params for kind, params in runs if kind == 'mission']
+    assert sorted(len(params) for params in missions) == [5, 5]
+    assert [p['air_speed'] for p in missions[0]] == sorted(p['air_speed'] for p in missions[0])
+    assert [len(params) for kind, params in runs if kind == 'vn'] == [2]
+
+def test_identical_requests_share_one_solve_then_the_cache(runs):
+
+    async def test(server):
+        first = await asyncio.gather(*[server.query('mission', {'air_speed': 60}) for i in range(5)])
+        again = await server.query('mission', {'air_speed': 60.})
+        return first, again, dict(server.stats)
+
+    first, again, stats = serve(test, batch_window=0.05)
+
+    assert len(runs) == 1 and len(runs[0][1]) == 1
+    assert all(answer == first[0] for answer in first) and again == first[0]
+    assert stats['shared'] == 4 and stats['cache_hits'] == 1 and stats['solved'] == 1
+
+def test_a_failed_batch_fails_its_requests_only(runs):
+
+    async def test(server):
+        bad  = server.query('vn', {'altitude': -1.})
+        good = server.query('mission', {})
+        return await asyncio.gather(bad, good, return_exceptions=True)
+
+    bad, good = serve(test, batch_window=0.05)
+
+    assert isinstance(bad, RuntimeError)
+    assert good['kind'] == 'mission'
+
+def test_the_cache_is_bounded(runs):
+
+    async def test(server):
+        for v in range(5):
+            await server.query('vn', {'weight': 600. + v})
+        await server.query('vn', {'weight': 600.})
+        return len(server.cache)
+
+    assert serve(test, cache_size=3, batch_window=0.) == 3
+    assert len(runs) == 6
+
+def test_normalise():
+
+    assert normalise('vn', {'weight': 700}) == {'weight': 700., 'altitude': 0., 'delta_ISA': 0.}
+    assert normalise('vn', None)['weight'] is None
+
+    with pytest.raises(ValueError):
+        normalise('loads', {})
+    with pytest.raises(ValueError):
+        normalise('vn', {'mass': 700.})
+
+    # the rpm only seeds the solver, it is not part of a mission request
+    assert 'rpm' not in normalise('mission', {})
+    with pytest.raises(ValueError):
+        normalise('mission', {'rpm': 5000.})
+
+def test_protocol(runs, tmp_path):
+
+    path = str(tmp_path / 'sling2.sock')
+
+    async def test(server):
+        listener = await asyncio.start_unix_server(server.handle, path)
+        async with listener:
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b'{"id": 1, "type": "vn", "params": {"weight": 650}}\n'
+                         b'not json\n'
+                         b'{"id": 3, "type": "stats"}\n'
+                         b'{"id": 4, "type": "mission", "params": {"mass": 1}}\n'
+                         b'[5]\n')
+            await writer.drain()
+            replies = [json.loads(await asyncio.wait_for(reader.readline(), 5.)) for i in range(5)]
+            writer.close()
+        return replies
+
+    replies  = serve(test, batch_window=0.)
+    answered = {reply['id']: reply for reply in replies if reply['id'] is not None}
+    errors   = sorted(reply['error'] for reply in replies if reply['id'] is None)
+
+    assert answered[1]['result']['weight'] == 650.
+    assert answered[3]['result']['requests'] >= 0
+    assert 'unknown mission parameters: mass' in answered[4]['error']
+
+    # neither a line that is not JSON nor one that is not an object leaves the client waiting
+    assert len(errors) == 2
+    assert errors[0].startswith('ValueError: bad request: Expecting value')
+    assert errors[1] == 'ValueError: bad request: expected a JSON object, not list'
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from atmosphere_table import (ALTITUDE_RANGE, R_AIR, AtmosphereTable, layered_conditions,
+                              standard_atmosphere)
+
+def test_table_matches_the_layers():
+
+    altitude = np.random.default_rng(0).uniform(*ALTITUDE_RANGE, size=100000)
+    T, p     = standard_atmosphere().standard(altitude)
+    T_l, p_l = layered_conditions(altitude)
+
+    # temperature is only non-linear in geometric altitude at the layer breaks
+    assert np.max(np.abs(T - T_l)) < 0.01
+    assert np.max(np.abs(p / p_l - 1.)) < 1e-7
+
+def test_us_standard_1976_values():
+
+    atmo = standard_atmosphere().compute([0., 5000., 11000., 20000.])
+
+    np.testing.assert_allclose(atmo['temperature'], [288.15, 255.676, 216.774, 216.65], atol=2e-3)
+    np.testing.assert_allclose(atmo['pressure'], [101325., 54048., 22700., 5529.], rtol=5e-4)
+    np.testing.assert_allclose(atmo['density'], [1.2250, 0.73643, 0.36480, 0.08891], rtol=5e-4)
+    assert atmo['speed_of_sound'][0] == pytest.approx(340.294, abs=1e-3)
+    assert atmo['dynamic_viscosity'][0] == pytest.approx(1.7894e-5, rel=1e-4)
+
+def test_delta_isa_changes_temperature_only():
+
+    altitude = np.array([0., 1500., 3000.])
+    base     = standard_atmosphere().compute(altitude)
+    hot      = standard_atmosphere().compute(altitude, 20.)
+
+    np.testing.assert_array_equal(hot['pressure'], base['pressure'])
+    np.testing.assert_allclose(hot['temperature'], base['temperature'] + 20.)
+    np.testing.assert_allclose(hot['density'], base['pressure'] / (R_AIR * (base['temperature'] + 20.)))
+    np.testing.assert_allclose(standard_atmosphere().density(altitude, 20.), hot['density'])
+
+def test_broadcast_and_outside_the_table():
+
+    table = AtmosphereTable((0., 1000.), 10.)
+
+    atmo = table.compute(np.array([[0.], [500.], [5000.]]), np.array([0., 10.]))
+    assert atmo['density'].shape == (3, 2)
+
+    # beyond the table the layers are evaluated directly
+    T, p = layered_conditions(np.array([5000.]))
+    assert atmo['temperature'][2,0] == pytest.approx(T[0])
+    assert atmo['pressure'][2,1] == pytest.approx(p[0])
+
+def test_one_shared_table():
+
+    assert standard_atmosphere() is standard_atmosphere()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+import benchmarks
+from benchmarks import compare, statistics_of
+
+def timings(**medians):
+    return {'environment': {}, 'benchmarks': {name: statistics_of([m]) for name, m in medians.items()}}
+
+def test_statistics_of():
+
+    stats = statistics_of([0.4, 0.1, 0.3, 0.2, 0.5])
+
+    assert stats['repeat'] == 5 and stats['times'] == [0.4, 0.1, 0.3, 0.2, 0.5]
+    assert (stats['min'], stats['median'], stats['max']) == (0.1, 0.3, 0.5)
+    assert stats['mean'] == pytest.approx(0.3)
+    assert stats['iqr'] == pytest.approx(0.45 - 0.15)
+
+    single = statistics_of([0.25])
+    assert single['median'] == single['min'] == 0.25 and single['iqr'] == single['stdev'] == 0.
+
+def test_regression_threshold():
+
+    baseline = timings(slower=1.0, faster=1.0, noise=0.001, within=1.0, gone=1.0)
+    current  = timings(slower=1.2, faster=0.5, noise=0.002, within=1.09, new=3.0)
+
+    rows = {row['name']: row for row in compare(current, baseline, threshold=0.10, min_delta=0.005)}
+
+    assert sorted(rows) == ['faster', 'noise', 'slower', 'within']
+    assert rows['slower']['regressed'] and rows['slower']['ratio'] == pytest.approx(1.2)
+    assert not rows['faster']['regressed'] and not rows['within']['regressed']
+    # twice as slow, but by a millisecond
+    assert rows['noise']['ratio'] == pytest.approx(2.) and not rows['noise']['regressed']
+
+    assert not any(row['regressed'] for row in compare(current, baseline, threshold=0.25))
+
+@pytest.fixture
+def measured(monkeypatch):
+    """Makes run_benchmarks() return preset timings."""
+
+    current = {}
+    monkeypatch.setattr(benchmarks, 'run_benchmarks', lambda names, warmup=None, repeat=None: current)
+
+    return current
+
+def test_exit_status(tmp_path, measured, capsys):
+
+    path = str(tmp_path / 'baseline.json')
+
+    assert benchmarks.cli(['--baseline', path]) == 0      # nothing to compare against yet
+
+    measured.update(timings(vehicle_setup=1.0, mission_evaluate=2.0))
+    assert benchmarks.cli(['--baseline', path, '--save-baseline']) == 0
+    with open(path) as f:
+        assert sorted(json.load(f)['benchmarks']) == ['mission_evaluate', 'vehicle_setup']
+
+    measured.update(timings(vehicle_setup=1.05, mission_evaluate=2.1))
+    assert benchmarks.cli(['--baseline', path]) == 0
+
+    measured.update(timings(vehicle_setup=1.05, mission_evaluate=2.5))
+    assert benchmarks.cli(['--baseline', path]) == 1
+    assert 'REGRESSED (> 10%)' in capsys.readouterr().err
+    assert benchmarks.cli(['--baseline', path, '--threshold', '0.3']) == 0
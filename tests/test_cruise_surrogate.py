@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+import cruise_surrogate
+import mission_sweep
+from cruise_surrogate import CruiseSurrogate, fill_unconverged, invert_curves, train
+
+def fuel_rate(altitude, air_speed, takeoff_mass):
+    return 1e-4 * (1. + 1e-4 * altitude + 1e-2 * air_speed + 1e-3 * takeoff_mass)
+
+@pytest.fixture
+def solves(monkeypatch):
+    """Stands in for the SUAVE cruise: fuel linear in distance, and records
+    every solve. Points listed in `fail` do not converge when warm started,
+    points in `never` do not converge at all."""
+
+    record = {'calls': [], 'fail': set(), 'never': set()}
+
+    def evaluate_fuel_curve(altitude, air_speed, takeoff_mass, distances, flown_distance,
+                            warm_start=True):
+        point = (altitude, air_speed, takeoff_mass)
+        record['calls'].append(point + (warm_start,))
+        fuel  = fuel_rate(*point) * np.asarray(distances, dtype=float)
+        ok    = point not in record['never'] and not (warm_start and point in record['fail'])
+        return (fuel if ok else np.full(fuel.shape, 1e9)), ok
+
+    monkeypatch.setattr(cruise_surrogate, 'evaluate_fuel_curve', evaluate_fuel_curve)
+    monkeypatch.setattr(mission_sweep, 'init_worker', lambda propeller_map=False: None)
+
+    return record
+
+def test_short_axis_drops_cubic_before_any_solve(solves):
+
+    with pytest.warns(UserWarning, match="altitude.*'linear'"):
+        surrogate = train([0., 1000.], [50., 55., 60., 65.], [600., 650., 700., 750.], 1e5,
+                          n_distance=5, n_validation=0, max_workers=0)
+
+    assert surrogate.method == 'linear'
+    assert surrogate.metadata['method'] == 'linear'
+
+    assert cruise_surrogate.interpolation_method('cubic', (4, 4, 4, 4)) == 'cubic'
+    with pytest.raises(ValueError):
+        cruise_surrogate.interpolation_method('linear', (4, 0, 4, 4))
+
+def test_surrogate_matches_the_samples(solves, tmp_path):
+
+    surrogate = train([0., 1000.], [50., 60.], [600., 700.], 1e5, n_distance=5,
+                      method='linear', n_validation=4, max_workers=0)
+
+    assert surrogate.fuel_burn(5e4, 500., 55., 650.) == pytest.approx(fuel_rate(500., 55., 650.) * 5e4)
+    assert surrogate.range(fuel_rate(0., 50., 600.) * 2e4, 0., 50., 600.) == pytest.approx(2e4)
+    assert surrogate.metadata['validation']['max_relative_error'] < 1e-9
+
+    loaded = CruiseSurrogate.load(surrogate.save(str(tmp_path / 'surrogate.npz')))
+    np.testing.assert_array_equal(loaded.fuel, surrogate.fuel)
+    assert loaded.method == 'linear'
+
+def test_unconverged_samples_are_solved_again_cold(solves):
+
+    solves['fail'].add((1000., 60., 700.))
+
+    surrogate = train([0., 1000.], [50., 60.], [600., 700.], 1e5, n_distance=3,
+                      method='linear', n_validation=0, max_workers=0)
+
+    assert (1000., 60., 700., False) in solves['calls']
+    assert surrogate.metadata['resolved'] == 1
+    assert surrogate.metadata['unconverged'] == 0
+    assert surrogate.fuel.max() < 1e9
+
+def test_still_unconverged_samples_are_filled_from_neighbours(solves):
+
+    solves['never'].add((0., 50., 600.))
+
+    with pytest.warns(UserWarning, match='1 of 8 cruise samples'):
+        surrogate = train([0., 1000.], [50., 60.], [600., 700.], 1e5, n_distance=3,
+                          method='linear', n_validation=0, max_workers=0)
+
+    neighbours = [fuel_rate(1000., 50., 600.), fuel_rate(0., 60., 600.), fuel_rate(0., 50., 700.)]
+    assert surrogate.metadata['unconverged'] == 1
+    assert surrogate.fuel[-1,0,0,0] == pytest.approx(np.mean(neighbours) * 1e5)
+
+def test_no_converged_sample_refuses_to_build(solves):
+
+    solves['never'].update({(0., 50., 600.), (0., 50., 700.)})
+
+    with pytest.raises(RuntimeError, match='no cruise sample converged'):
+        train([0.], [50.], [600., 700.], 1e5, n_distance=3, method='linear',
+              n_validation=0, max_workers=0)
+
+def test_fill_reaches_nodes_with_no_converged_neighbour():
+
+    curves    = np.arange(5.)[:,None] * np.ones((5, 2))
+    converged = np.array([True, False, False, False, True])
+
+    filled = fill_unconverged(curves, converged)
+
+    np.testing.assert_allclose(filled[:,0], [0., 0., 2., 4., 4.])
+
+def test_invert_curves():
+
+    d      = np.array([0., 1., 2.])
+    curves = np.array([[0., 10., 20.], [0., 10., 20.], [0., 10., 20.]])
+
+    np.testing.assert_allclose(invert_curves(d, curves, np.array([0., 15., 25.])), [0., 1.5, np.nan])
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from decimated_plot import decimate, lttb, min_max
+
+def reference_lttb(x, y, n_out):
+    """Steinarsson's LTTB written point by point."""
+
+    n       = len(x)
+    every   = (n - 2) / (n_out - 2)
+    chosen  = [0]
+    a       = 0
+    for i in range(n_out - 2):
+        lo   = int(np.floor(i * every)) + 1
+        hi   = int(np.floor((i + 1) * every)) + 1
+        nlo  = hi
+        nhi  = min(int(np.floor((i + 2) * every)) + 1, n)
+        if i == n_out - 3:
+            nlo, nhi = n - 1, n
+        xm   = np.mean(x[nlo:nhi])
+        ym   = np.mean(y[nlo:nhi])
+        best = -1.
+        for j in range(lo, hi):
+            area = abs((x[a] - xm) * (y[j] - y[a]) - (x[a] - x[j]) * (ym - y[a]))
+            if area > best:
+                best, chosen_j = area, j
+        chosen.append(chosen_j)
+        a = chosen_j
+    chosen.append(n - 1)
+
+    return np.array(chosen)
+
+def test_lttb_matches_reference():
+
+    rng = np.random.default_rng(1)
+    for n, n_out in [(1000, 50), (997, 101), (10, 5), (5000, 3)]:
+        x = np.sort(rng.uniform(0., 100., n))
+        y = np.cumsum(rng.normal(size=n))
+        np.testing.assert_array_equal(lttb(x, y, n_out), reference_lttb(x, y, n_out))
+
+def test_lttb_keeps_ends_and_spikes():
+
+    x = np.arange(10000.)
+    y = np.sin(x / 500.)
+    y[4321] = 50.
+
+    i = lttb(x, y, 200)
+    assert len(i) == 200
+    assert i[0] == 0 and i[-1] == len(x) - 1
+    assert np.all(np.diff(i) > 0)
+    assert 4321 in i
+
+def test_short_series_are_left_whole():
+
+    x = np.arange(20.)
+    np.testing.assert_array_equal(lttb(x, x, 50), np.arange(20))
+    np.testing.assert_array_equal(min_max(x, x, 50), np.arange(20))
+
+def test_min_max_keeps_every_bucket_extreme():
+
+    rng = np.random.default_rng(2)
+    y   = rng.normal(size=10007)
+    x   = np.arange(y.size, dtype=float)
+
+    i = min_max(x, y, 200)
+    assert np.all(np.diff(i) > 0)
+    assert i[0] == 0 and i[-1] == y.size - 1
+    assert len(i) <= 200 + 4
+    assert np.argmin(y) in i and np.argmax(y) in i
+
+    # every bucket's extremes survive, so the envelope is unchanged
+    size = y.size // 100
+    for b in range(100):
+        bucket = slice(b * size, (b + 1) * size)
+        assert b * size + np.argmax(y[bucket]) in i
+        assert b * size + np.argmin(y[bucket]) in i
+
+def test_decimate_with_nans():
+
+    x = np.arange(1000.)
+    y = np.sin(x / 50.)
+    y[100:200] = np.nan
+
+    for method in ('lttb', 'minmax'):
+        xd, yd = decimate(x, y, 100, method)
+        assert len(xd) == len(yd) <= 104
+        assert xd[0] == 0. and xd[-1] == 999.
+
+    # a gap in a bucket does not hide its extremes
+    xd, yd = decimate(x, y, 100, 'minmax')
+    assert np.nanmax(yd) == np.nanmax(y)
+    assert np.nanmin(yd) == np.nanmin(y)
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import os
+import pickle
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import design_cache
+from design_cache import hash_value, load_entry, propeller_design_key, store_entry
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# keys the test propeller in a fresh interpreter
+KEY_SCRIPT = """
+import sys
+sys.path[:0] = [%r, %r]
+from design_cache import propeller_design_key
+from test_design_cache import propeller
+print(propeller_design_key(propeller(sys.argv[1:3]), version='2.5.2'))
+""" % (REPO, os.path.join(REPO, 'tests'))
+
+@pytest.fixture
+def airfoils(tmp_path):
+
+    geometry = tmp_path / 'NACA_4412.txt'
+    polar    = tmp_path / 'NACA_4412_polar_Re_50000.txt'
+    geometry.write_text('NACA 4412\n1.0 0.0\n0.5 0.06\n0.0 0.0\n')
+    polar.write_text('alpha CL CD\n0.0 0.45 0.012\n')
+
+    return str(geometry), str(polar)
+
+def key_in_new_interpreter(airfoils):
+
+    return subprocess.run([sys.executable, '-c', KEY_SCRIPT] + list(airfoils), capture_output=True,
+                          text=True, check=True).stdout.strip()
+
+def propeller(airfoils, **changes):
+
+    geometry, polar = airfoils
+    prop = {'number_of_blades': 3., 'tip_radius': 0.915, 'hub_radius': 0.14, 'design_Cl': 0.8,
+            'angular_velocity': 471.2, 'design_power': 47040., 'design_altitude': 2895.6,
+            'freestream_velocity': 30.87, 'variable_pitch': False, 'origin': [[0.625, 0., 0.625]],
+            'airfoil_geometry': [geometry], 'airfoil_polars': [[polar]],
+            'airfoil_polar_stations': [0] * 20,
+            'inputs': object()}     # not a design input, and its repr changes every run
+    prop.update(changes)
+
+    return prop
+
+def test_key_is_the_same_in_every_interpreter(airfoils):
+
+    key = key_in_new_interpreter(airfoils)
+
+    assert len(key) == 32
+    assert key_in_new_interpreter(airfoils) == key
+    assert propeller_design_key(propeller(airfoils), version='2.5.2') == key
+
+def test_key_changes_with_any_input(airfoils):
+
+    key = propeller_design_key(propeller(airfoils), version='2.5.2')
+
+    for changes in ({'design_Cl': 0.7}, {'number_of_blades': 2.}, {'tip_radius': 0.9},
+                    {'angular_velocity': 500.}, {'origin': [[0.6, 0., 0.625]]}):
+        assert propeller_design_key(propeller(airfoils, **changes), version='2.5.2') != key
+
+    assert propeller_design_key(propeller(airfoils), 30, version='2.5.2') != key
+    assert propeller_design_key(propeller(airfoils), version='2.5.3') != key
+
+    # the object attribute is not a design input
+    assert propeller_design_key(propeller(airfoils, inputs=object()), version='2.5.2') == key
+
+def test_key_changes_with_the_airfoil_contents(airfoils):
+
+    key = propeller_design_key(propeller(airfoils), version='2.5.2')
+
+    with open(airfoils[1], 'a') as f:
+        f.write('2.0 0.67 0.013\n')
+    assert propeller_design_key(propeller(airfoils), version='2.5.2') != key
+
+def test_unsupported_values_are_refused(airfoils):
+
+    with pytest.raises(TypeError):
+        propeller_design_key(propeller(airfoils, design_power=object()), version='2.5.2')
+
+    h = hashlib.sha256()
+    hash_value(h, {'a': [1, 2.5, None, 'x', np.float32(3.), np.arange(3)], 'b': True})
+    with pytest.raises(TypeError):
+        hash_value(h, [lambda: None])
+
+def test_interrupted_write_leaves_no_entry(tmp_path, monkeypatch):
+
+    path = str(tmp_path / 'cache' / 'propeller_0123.pkl')
+
+    def dump(value, f, protocol=None):
+        f.write(b'\x80\x05partial')
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(design_cache.pickle, 'dump', dump)
+    with pytest.raises(KeyboardInterrupt):
+        store_entry(path, {'twist': np.ones(20)})
+    monkeypatch.undo()
+
+    assert os.listdir(str(tmp_path / 'cache')) == []
+    assert load_entry(path) is None
+
+    store_entry(path, {'twist': np.ones(20)})
+    np.testing.assert_array_equal(load_entry(path)['twist'], np.ones(20))
+    assert os.listdir(str(tmp_path / 'cache')) == ['propeller_0123.pkl']
+
+def test_half_written_entries_are_rebuilt(tmp_path):
+
+    path = tmp_path / 'propeller_0123.pkl'
+    path.write_bytes(pickle.dumps({'twist': np.ones(20)})[:-10])
+
+    assert load_entry(str(path)) is None
+    assert load_entry(str(tmp_path / 'missing.pkl')) is None
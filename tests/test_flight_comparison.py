@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+import xplane_store
+from flight_comparison import COMPARISON_DTYPE, compare_log, compare_logs, mission_reference, \
+    write_comparison
+from vn_envelope import KNOT, RHO_SL
+
+HEADER = '_real,_time|missn,_time|pitch,__deg|_Vind,_keas|Vtrue,_ktas|\n'
+
+class Data(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+    __setattr__ = dict.__setitem__
+
+def column(values):
+    return np.asarray(values, dtype=float)[:,None]
+
+def segment(time, air_speed, pitch):
+    """Level flight at sea level, air speed in m/s and pitch in degrees."""
+
+    n = len(time)
+    x = air_speed * time
+
+    return Data(conditions=Data(
+        freestream = Data(velocity=column(np.full(n, air_speed)), density=column(np.full(n, RHO_SL))),
+        frames     = Data(inertial = Data(time=column(time), position_vector=np.column_stack([x, 0*x, 0*x])),
+                          body     = Data(inertial_rotations=np.column_stack([0*x, np.radians(np.full(n, pitch)), 0*x]))),
+        weights    = Data(vehicle_mass_rate=column(np.full(n, 0.005))),
+        propulsion = Data(throttle=column(np.full(n, 0.7)))))
+
+def fake_results():
+    """Two cruise segments joined at t = 50 s, 90 kt throughout, pitched
+    2 deg then 3 deg."""
+
+    v = 90. * KNOT
+
+    return Data(segments=Data(first  = segment(np.linspace(0., 50., 11), v, 2.),
+                              second = segment(np.linspace(50., 100., 11), v, 3.)))
+
+def write_log(path, times, pitch, keas=90., ktas=90.):
+
+    with open(path, 'w') as f:
+        f.write(HEADER)
+        for t, p in zip(times, pitch):
+            f.write('%.3f|%.3f|%.3f|%.3f|%.3f|\n' % (t + 100., t, p, keas, ktas))
+
+    return str(path)
+
+@pytest.fixture(autouse=True)
+def store_dir(monkeypatch, tmp_path):
+    """Keeps the column stores out of the user's cache."""
+
+    open_log = xplane_store.open_log
+    monkeypatch.setattr(xplane_store, 'open_log',
+                        lambda source, chunksize=None: open_log(source, str(tmp_path / 'store'), chunksize))
+
+def test_reference_joins_the_segments():
+
+    reference = mission_reference(fake_results())
+
+    assert len(reference['time']) == 21
+    np.testing.assert_allclose(reference['air_speed'], 90.)
+    assert reference['pitch'][0] == pytest.approx(2.) and reference['pitch'][-1] == pytest.approx(3.)
+    np.testing.assert_allclose(reference['fuel_flow'], 18.)
+
+@pytest.mark.parametrize('align', ['time', 'distance'])
+def test_residuals_against_the_mission(tmp_path, align):
+
+    times = np.arange(0., 40., 1.)
+    log   = write_log(tmp_path / 'log.txt', times + 7., np.full(len(times), 2.5), keas=92.)
+
+    row = np.array(compare_log(log, mission_reference(fake_results()), align=align, index=4),
+                   dtype=COMPARISON_DTYPE)
+
+    assert row['log'] == 4
+    assert row['n_points'] == 40
+    assert row['duration'] == pytest.approx(39.)
+    assert row['distance'] == pytest.approx(39. * 90. * KNOT, rel=1e-4)
+    assert row['air_speed_bias'] == pytest.approx(2.)
+    assert row['pitch_bias'] == pytest.approx(0.5) and row['pitch_max'] == pytest.approx(0.5)
+    # no fuel flow or throttle column in the log
+    assert np.isnan(row['fuel_flow_rms']) and np.isnan(row['throttle_max'])
+
+def test_samples_past_the_mission_are_left_out(tmp_path):
+
+    times = np.arange(0., 150., 1.)
+    log   = write_log(tmp_path / 'log.txt', times, np.full(len(times), 2.))
+
+    row = compare_log(log, mission_reference(fake_results()))
+
+    assert row[COMPARISON_DTYPE.names.index('n_points')] == 101
+
+def test_logs_are_indexed_in_the_order_given(tmp_path):
+
+    # longer than a fixed-width text column would hold
+    deep  = tmp_path.joinpath(*['flights'] * 40)
+    deep.mkdir(parents=True)
+    logs  = [write_log(deep / ('%d.txt' % i), np.arange(0., 20., 1.), np.full(20, 2. + i))
+             for i in range(3)]
+    assert max(len(log) for log in logs) > 256
+
+    table = compare_logs(logs, fake_results(), max_workers=0)
+
+    assert table.dtype == COMPARISON_DTYPE
+    np.testing.assert_array_equal(table['log'], [0, 1, 2])
+    np.testing.assert_allclose(table['pitch_bias'], [0., 1., 2.], atol=1e-12)
+
+    with pytest.raises(KeyError):
+        compare_logs(logs, {logs[0]: fake_results()}, max_workers=0)
+
+    path = write_comparison(str(tmp_path / 'validation.dat'), table, logs)
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert [line.rsplit(' ', 1)[-1] for line in lines[2:]] == logs
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+from incremental import Pipeline
+
+def chain(**inputs):
+    """a reads x, b reads y and a, c reads nothing but b, d reads z."""
+
+    model = Pipeline(inputs, cache_size=2)
+
+    @model.stage('a')
+    def a(inputs):
+        return inputs['x'] * 2
+
+    @model.stage('b', depends=['a'])
+    def b(inputs, a):
+        return a + inputs.get('y', 0)
+
+    @model.stage('c', depends=['b'])
+    def c(inputs, b):
+        return [b]
+
+    @model.stage('d')
+    def d(inputs):
+        return inputs['z']
+
+    return model
+
+def test_only_stale_stages_run():
+
+    model = chain(x=1, y=10, z=5)
+
+    assert model.get('c') == [12]
+    assert model.recomputed == ['a', 'b', 'c']
+
+    assert model.get('c') == [12]
+    assert model.recomputed == []
+
+    # y is read by b alone, a keeps its output
+    model.set(y=20)
+    assert model.stale('c') == ['b', 'c']
+    assert model.get('c') == [22]
+    assert model.recomputed == ['b', 'c']
+
+    # z is not read on the way to c
+    model.set(z=6)
+    assert model.stale('c') == []
+    assert model.get('c') == [22]
+    assert model.recomputed == []
+
+    model.set(x=2)
+    assert model.get('c') == [24]
+    assert model.recomputed == ['a', 'b', 'c']
+
+def test_outputs_are_shared_not_copied():
+
+    model = chain(x=1, y=0, z=0)
+
+    assert model.get('c') is model.get('c')
+
+def test_going_back_is_served_from_the_memo():
+
+    model = chain(x=1, y=0, z=0)
+    first = model.get('c')
+
+    model.set(x=2)
+    model.get('c')
+    model.set(x=1)
+    assert model.get('c') is first
+    assert model.recomputed == []
+
+    # cache_size=2 keeps the two outputs used last per stage, x=2 is gone
+    model.set(x=3)
+    model.get('c')
+    model.set(x=1)
+    model.get('c')
+    assert model.recomputed == []
+    model.set(x=2)
+    model.get('c')
+    assert model.recomputed == ['a', 'b', 'c']
+
+def test_a_missing_input_is_tracked():
+
+    model = Pipeline({'x': 1})
+
+    @model.stage('a')
+    def a(inputs):
+        return inputs.get('y', 0) + inputs['x']
+
+    assert model.get('a') == 1
+    model.set(y=5)
+    assert model.stale('a') == ['a']
+    assert model.get('a') == 6
+
+def test_iterating_the_inputs_reads_them_all():
+
+    model = Pipeline({'x': 1, 'y': 2})
+
+    @model.stage('total')
+    def total(inputs):
+        return sum(inputs[k] for k in inputs)
+
+    assert model.get('total') == 3
+    model.set(y=3)
+    assert model.get('total') == 4
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import numpy as np
+import scipy.optimize
+
+import instrumentation
+from instrumentation import Instrumentation, stage
+
+class Data(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+    __setattr__ = dict.__setitem__
+
+def converge(segment):
+    """What SUAVE's converge_root does with the segment's root finder."""
+
+    root_finder = segment.settings.get('root_finder', scipy.optimize.fsolve)
+    return root_finder(lambda x, s: x - 2., np.zeros(1), args=segment, full_output=1)
+
+def mission():
+
+    climb  = Data(settings=Data(root_finder=scipy.optimize.fsolve))
+    cruise = Data(settings=Data())
+
+    return Data(settings=Data(), segments=Data(climb=climb, cruise=cruise))
+
+def test_stage_is_a_no_op_when_nothing_is_active():
+
+    assert instrumentation.active() is None
+    with stage('free') as record:
+        assert record is None
+
+def test_stages_nest_and_include_their_children():
+
+    with Instrumentation(patch=False) as inst:
+        with stage('outer', run=1):
+            inst.count('propeller_spin')
+            with stage('inner'):
+                inst.count('propeller_spin', 2)
+        assert instrumentation.active() is inst
+    assert instrumentation.active() is None
+
+    outer, inner = sorted(inst.stages, key=lambda s: s['start'])
+    assert (outer['name'], outer['depth'], outer['args']) == ('outer', 0, {'run': 1})
+    assert (inner['name'], inner['depth']) == ('inner', 1)
+    assert outer['counters']['propeller_spin'] == 3
+    assert inner['counters']['propeller_spin'] == 2
+    assert outer['wall'] >= inner['wall']
+    assert inner['start'] >= outer['start']
+
+def test_root_finders_of_prebuilt_segments_are_counted():
+
+    m        = mission()
+    original = m.segments.climb.settings.root_finder
+
+    with Instrumentation(patch=False) as inst:
+        with stage('mission.evaluate'):
+            with inst.counting_root_finders(m):
+                # a segment evaluate inside the mission's is not counted twice
+                with inst.counting_root_finders(m.segments.climb):
+                    x, climb, ier, msg = converge(m.segments.climb)
+                cruise = converge(m.segments.cruise)[1]
+
+    assert ier == 1 and x[0] == 2.
+    assert inst.counters['root_finder_calls'] == 2
+    assert inst.counters['residual_evaluations'] == climb['nfev'] + cruise['nfev']
+    assert inst.stages[0]['counters']['root_finder_calls'] == 2
+    # the segments get their own root finders back
+    assert m.segments.climb.settings.root_finder is original
+    assert 'root_finder' not in m.segments.cruise.settings
+
+def test_mapped_spins_and_fallbacks_are_counted_apart():
+
+    class Propeller:
+        def spin(self, conditions):
+            return 'bem'
+
+    class Mapped(Propeller):
+        def spin(self, conditions):
+            if conditions.off_map:
+                return Propeller.spin(self, conditions)
+            return 'map'
+
+    on  = Data(off_map=False, freestream=Data(density=np.ones((4, 1))))
+    off = Data(off_map=True,  freestream=Data(density=np.ones((4, 1))))
+
+    with Instrumentation(patch=False) as inst:
+        inst._mapped = Mapped
+        inst._wrap(Propeller, 'spin', inst._count_spin)
+        inst._wrap(Mapped, 'spin', lambda *a: inst.count('propeller_map_spin'))
+        assert Propeller().spin(on) == 'bem'
+        assert Mapped().spin(on) == 'map'
+        assert Mapped().spin(off) == 'bem'
+
+    assert inst.counters['propeller_spin'] == 1
+    assert inst.counters['propeller_spin_points'] == 4
+    assert inst.counters['propeller_map_spin'] == 2
+    assert inst.counters['propeller_map_fallback'] == 1
+    # the patches are undone on exit
+    assert 'spin' in Propeller.__dict__ and Propeller.spin.__name__ == 'spin'
+    assert Mapped().spin(off) == 'bem' and inst.counters['propeller_map_spin'] == 2
+
+def test_chrome_trace_and_json_output(tmp_path):
+
+    with Instrumentation(patch=False) as inst:
+        with stage('outer'):
+            with stage('inner', point=3):
+                pass
+
+    trace  = inst.chrome_trace()
+    events = trace['traceEvents']
+    assert [e['name'] for e in events] == ['outer', 'inner']
+    assert all(e['ph'] == 'X' and e['cat'] == 'stage' for e in events)
+    assert events[1]['ts'] >= events[0]['ts']
+    assert events[1]['args']['point'] == 3
+    assert set(instrumentation.COUNTERS) <= set(events[0]['args'])
+
+    path = inst.write(str(tmp_path / 'stages.trace.json'))
+    with open(path) as f:
+        assert json.load(f)['traceEvents'][0]['name'] == 'outer'
+
+    path = inst.write(str(tmp_path / 'stages.json'))
+    with open(path) as f:
+        summary = json.load(f)
+    assert [s['name'] for s in summary['stages']] == ['outer', 'inner']
+    assert set(summary['counters']) == set(instrumentation.COUNTERS)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from mission_store import AttributeDict, MissionStore, flatten
+
+FIELDS = ('frames.inertial.time', 'weights.total_mass', 'missing.path')
+
+def mission(offset, n_points=4):
+    """Results of a two segment mission, every value shifted by offset."""
+
+    Data = AttributeDict
+
+    results          = Data()
+    results.segments = Data()
+    for j, tag in enumerate(('climb', 'cruise')):
+        time  = offset + j + np.linspace(0., 1., n_points)[:, None]
+        conditions = Data(frames  = Data(inertial=Data(time=time,
+                                                       position_vector=np.hstack([time, 2 * time, 3 * time]))),
+                          weights = Data(total_mass=750. - time),
+                          tag     = tag)
+        results.segments[tag] = Data(conditions=conditions)
+
+    return results
+
+def test_flatten():
+
+    arrays = flatten(mission(0.), FIELDS)
+
+    assert sorted(arrays) == ['climb/frames.inertial.time', 'climb/missing.path', 'climb/weights.total_mass',
+                              'cruise/frames.inertial.time', 'cruise/missing.path', 'cruise/weights.total_mass']
+    assert np.isnan(arrays['climb/missing.path']).all()
+    assert arrays['cruise/weights.total_mass'].shape == (4, 1)
+
+    everything = flatten(mission(0.), 'all')
+    assert everything['climb/frames.inertial.position_vector'].shape == (4, 3)
+    assert 'climb/tag' not in everything
+
+@pytest.mark.parametrize('on_disk', [False, True])
+def test_grow_and_read_back(tmp_path, on_disk):
+
+    store = MissionStore('all', capacity=2, path=str(tmp_path / 'store') if on_disk else None)
+    for i in range(5):
+        assert store.append(mission(10. * i)) == i
+
+    assert len(store) == 5 and store.capacity == 8
+    time = store.field('cruise/frames.inertial.time')
+    assert time.shape == (5, 4, 1)
+    np.testing.assert_array_equal(time[:, 0, 0], [1., 11., 21., 31., 41.])
+
+    results = store.results(3)
+    np.testing.assert_array_equal(results.segments.climb.conditions.weights.total_mass,
+                                  mission(30.).segments.climb.conditions.weights.total_mass)
+
+def test_reopen_on_disk(tmp_path):
+
+    path  = str(tmp_path / 'store')
+    store = MissionStore(FIELDS, dtype='f4', capacity=2, path=path)
+    for i in range(3):
+        store.append(mission(i))
+    store.flush()
+    del store
+
+    store = MissionStore.open(path)
+    assert len(store) == 3 and store.capacity == 4 and store.dtype == np.float32
+    assert set(store.keys()) == {'%s/%s' % (tag, f) for tag in ('climb', 'cruise') for f in FIELDS}
+    np.testing.assert_array_equal(store.field('climb/frames.inertial.time')[:, 0, 0], [0., 1., 2.])
+
+    with pytest.raises(ValueError):
+        store.field('climb/frames.inertial.time')[0] = 1.
+
+    store = MissionStore.open(path, mode='r+')
+    store.append(mission(3.))
+    store.flush()
+    assert len(MissionStore.open(path)) == 4
+
+@pytest.mark.parametrize('on_disk', [False, True])
+def test_rows_skipped_over_read_nan(tmp_path, on_disk):
+
+    path  = str(tmp_path / 'store') if on_disk else None
+    store = MissionStore(FIELDS, capacity=2, path=path)
+    store.append(mission(0.))
+    store.write(6, flatten(mission(6.), FIELDS))
+    if on_disk:
+        store.flush()
+        store = MissionStore.open(path)
+
+    time = store.field('climb/frames.inertial.time')[:, 0, 0]
+    assert len(store) == 7
+    assert time[0] == 0. and time[6] == 6.
+    assert np.isnan(time[1:6]).all()
+
+def test_the_first_mission_fixes_the_layout():
+
+    store = MissionStore(FIELDS)
+    store.append(mission(0.))
+
+    with pytest.raises(ValueError):
+        store.append(mission(1., n_points=5))
+
+    arrays = flatten(mission(1.), FIELDS)
+    del arrays['cruise/missing.path']
+    with pytest.raises(KeyError):
+        store.append_arrays(arrays)
+
+    assert len(store) == 1
+
+def test_old_versions_are_refused(tmp_path):
+
+    path  = str(tmp_path / 'store')
+    store = MissionStore(FIELDS, path=path)
+    store.append(mission(0.))
+    store.flush()
+
+    header = (tmp_path / 'store' / 'header.json')
+    header.write_text(header.read_text().replace('"version": 1', '"version": 0'))
+    with pytest.raises(ValueError):
+        MissionStore.open(path)
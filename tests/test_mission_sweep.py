@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+import mission_sweep
+from mission_sweep import SWEEP_DTYPE, evaluate_chunk, grid_points, summarise
+
+class Data(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+    __setattr__ = dict.__setitem__
+
+def column(values):
+    return np.asarray(values, dtype=float)[:,None]
+
+def cruise(rpm, converged=True):
+
+    n    = len(rpm)
+    time = np.linspace(0., 600., n)
+
+    conditions = Data(frames       = Data(inertial = Data(time=column(time)),
+                                          body     = Data(thrust_force_vector=column(np.full(n, 500.)))),
+                      weights      = Data(total_mass        = column(700. - 0.01 * time),
+                                          vehicle_mass_rate = column(np.full(n, 0.01))),
+                      aerodynamics = Data(lift_coefficient = column(np.full(n, 0.4)),
+                                          drag_coefficient = column(np.full(n, 0.04))),
+                      propulsion   = Data(throttle      = column(np.full(n, 0.6)),
+                                          propeller_rpm = column(rpm)))
+
+    return Data(conditions=conditions, state=Data(numerics=Data(converged=converged)))
+
+def test_grid_points_has_no_rpm_axis():
+
+    points = grid_points([0., 1000.], [50., 60., 70.], 700.)
+
+    assert points.shape == (6, 3)
+    assert tuple(points[-1]) == (1000., 70., 700.)
+    assert 'rpm' in SWEEP_DTYPE.names
+
+def test_summarise_reports_the_converged_rpm():
+
+    fuel_burn, throttle, rpm, lift_to_drag, sfc, converged = summarise(cruise([5000., 5200., 5400.]))
+
+    assert fuel_burn == pytest.approx(6.)
+    assert throttle == pytest.approx(0.6)
+    assert rpm == pytest.approx(5200.)
+    assert lift_to_drag == pytest.approx(10.)
+    assert sfc == pytest.approx(2e-5)
+    assert converged
+
+def test_failed_point_is_a_nan_row(monkeypatch):
+
+    def evaluate_point(altitude, air_speed, takeoff_mass, distance=None, warm_start=False):
+        raise RuntimeError('no solution')
+
+    monkeypatch.setattr(mission_sweep, 'evaluate_point', evaluate_point)
+
+    with pytest.warns(UserWarning, match='failed'):
+        rows = evaluate_chunk(np.array([[1000., 60., 700.]]))
+
+    assert tuple(rows[['altitude', 'air_speed', 'takeoff_mass']][0]) == (1000., 60., 700.)
+    assert np.isnan(rows['rpm'][0]) and np.isnan(rows['fuel_burn'][0])
+    assert not rows['converged'][0]
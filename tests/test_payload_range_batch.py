@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from payload_range_batch import NAUTICAL_MILE, FuelCurveError, diagram, fuel_curve, write_payload_range
+
+class Data(dict):
+    """Attribute access like SUAVE's Data."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    __setattr__ = dict.__setitem__
+
+CLIMB_BURN     = 5.       # kg burned before the cruise
+CLIMB_DISTANCE = 20.e3    # m flown before the cruise
+
+def specific_range(tow):
+    """m/kg of the fake cruise, better when lighter."""
+    return 1.4e6 / tow
+
+def steady_cruise(flights=None, max_distance=np.inf):
+    """fly() of a mission whose cruise burns fuel at a constant rate, on
+    Chebyshev control points as SUAVE places them."""
+
+    def fly(tow, altitude, distance):
+        if flights is not None:
+            flights.append((tow, distance))
+        distance = min(50.e3 if distance is None else distance, max_distance)
+
+        t    = 0.5 * (1. - np.cos(np.pi * np.arange(16) / 15.))
+        x    = CLIMB_DISTANCE + distance * t
+        mass = tow - CLIMB_BURN - (x - CLIMB_DISTANCE) / specific_range(tow)
+
+        position   = np.column_stack([x, 0. * x, 0. * x])
+        conditions = Data(frames  = Data(inertial=Data(position_vector=position)),
+                          weights = Data(total_mass=mass[:,None]))
+        results    = Data(segments=Data(cruise=Data(conditions=conditions)))
+
+        return None, results
+
+    return fly
+
+def expected_range(tow, burn):
+    return CLIMB_DISTANCE + (burn - CLIMB_BURN) * specific_range(tow)
+
+def test_fuel_curve_extends_the_cruise_until_it_burns_enough():
+
+    flights = []
+    curve   = fuel_curve(steady_cruise(flights), 700., np.nan, 130., 'cruise')
+
+    # 25 kg in the first 50 km, then long enough for 1.05 times the rest
+    assert len(flights) == 2
+    assert flights[1][1] == pytest.approx(1.05 * 125. * specific_range(700.))
+
+    for burn in (5.5, 60., 130.):
+        assert curve(burn) == pytest.approx(expected_range(700., burn), rel=1e-9)
+    assert curve(2.5) == pytest.approx(CLIMB_DISTANCE / 2.)
+    assert curve(0.) == 0.
+
+def test_fuel_curve_error_when_the_cruise_falls_short():
+
+    flights = []
+    with pytest.raises(FuelCurveError):
+        fuel_curve(steady_cruise(flights, max_distance=10.e3), 700., np.nan, 130., 'cruise', max_iterations=3)
+    assert len(flights) == 3
+
+def test_diagram_corners():
+
+    masses   = Data(max_fuel=150.)
+    flights  = []
+    rows     = diagram(steady_cruise(flights), 400., 600., 700., 20., np.nan, masses, 'cruise')
+
+    np.testing.assert_array_equal(rows['payload'],        [200., 200., 150., 0.])
+    np.testing.assert_array_equal(rows['fuel'],           [0., 100., 150., 150.])
+    np.testing.assert_array_equal(rows['takeoff_weight'], [0., 700., 700., 550.])
+    assert (rows['reserves'] == 20.).all() and (rows['max_takeoff'] == 700.).all()
+
+    ranges = [0., expected_range(700., 80.), expected_range(700., 130.), expected_range(550., 130.)]
+    np.testing.assert_allclose(rows['range'], np.array(ranges) / NAUTICAL_MILE, rtol=1e-9)
+
+    # one fuel curve per distinct takeoff weight
+    assert sorted({tow for tow, distance in flights}) == [550., 700.]
+
+def test_payload_limited_by_the_vehicle():
+
+    masses = Data(max_payload=120.)
+    rows   = diagram(steady_cruise(), 400., 600., 700., 0., 2500., masses, 'cruise')
+
+    np.testing.assert_array_equal(rows['payload'], [120., 120., 0., 0.])
+    np.testing.assert_array_equal(rows['fuel'],    [0., 180., 300., 300.])
+    assert (rows['altitude'] == 2500.).all()
+
+def test_write_in_suave_layout(tmp_path):
+
+    rows     = diagram(steady_cruise(), 400., 600., 700., 20., np.nan, Data(max_fuel=150.), 'cruise')
+    other    = diagram(steady_cruise(), 400., 600., 650., 20., 2500., Data(max_fuel=150.), 'cruise')
+    path     = write_payload_range(str(tmp_path / 'PayloadRangeDiagram.dat'), np.stack([rows, other]), 'Sling2')
+
+    with open(path) as f:
+        text = f.read()
+    lines = text.splitlines()
+
+    assert lines[0] == 'Output file with Payload Range Diagram details'
+    assert text.count(' Configuration .................................: Sling2') == 2
+    assert ' Maximum Takeoff Weight ...........( MTOW ).....:      700 kg' in lines
+    assert ' Maximum Fuel Weight ..............( FUELMX )...:      150 kg' in lines
+    assert text.count('Cruise Altitude') == 1
+
+    table = [line for line in lines if line.count('|') == 4 and 'RANGE' not in line and 'nm' not in line]
+    assert len(table) == 8
+    assert [float(v) for v in table[2].split('|')[:4]] == [round(rows[2]['range']), 150., 150., 700.]
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+import shutil
+
+import numpy as np
+
+import polar_db
+from polar_db import COLUMNS, POLAR_FILES, PolarDatabase, open_polar_db, read_xfoil_polar
+
+def test_round_trip(tmp_path):
+
+    db = open_polar_db(str(tmp_path / 'polars.db'))
+
+    assert len(db.polars) == len(POLAR_FILES) == 5
+    for file in POLAR_FILES:
+        entry, data = read_xfoil_polar(file)
+        stored      = db.polars[polar_db._normalise(file)]
+        assert stored['reynolds'] == entry['reynolds']
+        assert stored['mach'] == entry['mach']
+        np.testing.assert_array_equal(stored['data'], data)
+
+    polar = db.polar(reynolds=2.1e5)
+    assert list(polar) == list(COLUMNS)
+    assert polar['alpha'][0] == -8.5 and polar['CL'][0] == -0.4088
+    assert polar['CL'].flags['C_CONTIGUOUS']
+
+def test_reynolds_numbers_sorted(tmp_path):
+
+    db = open_polar_db(str(tmp_path / 'polars.db'))
+
+    np.testing.assert_array_equal(db.reynolds_numbers(), [5e4, 1e5, 2e5, 5e5, 1e6])
+
+def test_recompiled_when_a_source_changes(tmp_path):
+
+    files = []
+    for file in POLAR_FILES[:3]:
+        files.append(str(tmp_path / file.rsplit('/', 1)[-1]))
+        shutil.copy(file, files[-1])
+    path = str(tmp_path / 'polars.db')
+
+    db = open_polar_db(path, files)
+    assert db.is_current(files)
+
+    with open(files[0], 'a') as f:
+        f.write('\n')
+    assert not PolarDatabase(path).is_current(files)
+
+    db = open_polar_db(path, files)
+    assert db.is_current(files)
+
+def test_rejects_other_files(tmp_path):
+
+    path = tmp_path / 'polars.db'
+    path.write_bytes(b'not a database')
+
+    # an unreadable file is rebuilt rather than trusted
+    db = open_polar_db(str(path), POLAR_FILES)
+    assert len(db.polars) == len(POLAR_FILES)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from prop_explore import CANDIDATE_DTYPE, pareto_front
+
+def designs(*scores):
+    """Candidates from (cruise efficiency, climb thrust, feasible) triples."""
+
+    results = np.zeros(len(scores), dtype=CANDIDATE_DTYPE)
+    for i, (eta, thrust, feasible) in enumerate(scores):
+        results[i]['cruise_efficiency'] = eta
+        results[i]['climb_thrust']      = thrust
+        results[i]['feasible']          = feasible
+
+    return results
+
+def test_front_of_hand_built_designs():
+
+    results = designs((0.80, 1500., True),      # front, best efficiency
+                      (0.75, 1800., True),      # front, best thrust
+                      (0.78, 1600., True),      # front, a trade between them
+                      (0.74, 1700., True),      # dominated by the best thrust
+                      (0.80, 1400., True),      # same efficiency, less thrust
+                      (0.90, 2000., False))     # dominates all, but infeasible
+
+    np.testing.assert_array_equal(pareto_front(results), [True, True, True, False, False, False])
+
+def test_ties_stay_on_the_front():
+
+    results = designs((0.80, 1500., True),
+                      (0.80, 1500., True),
+                      (0.75, 1800., True),
+                      (0.75, 1800., True),
+                      (0.75, 1500., True))
+
+    np.testing.assert_array_equal(pareto_front(results), [True, True, True, True, False])
+
+def test_no_feasible_designs():
+
+    results = designs((0.80, 1500., False), (0.75, 1800., False))
+
+    assert not pareto_front(results).any()
+    assert not pareto_front(designs()).any()
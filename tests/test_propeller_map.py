@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip('SUAVE')
+
+import propeller_map
+from propeller_map import Mapped_Propeller, check_map, freestream_conditions
+
+D = 1.6
+
+def Ct_of(J, rpm, rho):
+    return 0.12 - 0.1 * J + 1e-6 * rpm
+
+def Cq_of(J, rpm, rho):
+    return 0.01 + 0.002 * rho - 0.002 * J
+
+def synthetic_map():
+    """A map linear along each axis, so interpolation between its nodes is exact."""
+
+    J, rpm, rho = np.linspace(0.1, 1., 10), np.linspace(2000., 6000., 5), np.linspace(0.9, 1.3, 3)
+    JJ, RR, PP  = np.meshgrid(J, rpm, rho, indexing='ij')
+
+    return SimpleNamespace(advance_ratio=J, rpm=rpm, density=rho, thrust_direction=np.array([1., 0., 0.]),
+                           thrust_coefficient=Ct_of(JJ, RR, PP), torque_coefficient=Cq_of(JJ, RR, PP))
+
+def conditions(J, rpm, rho):
+
+    J, rpm, rho = np.broadcast_arrays(*[np.atleast_1d(np.asarray(x, dtype=float)) for x in (J, rpm, rho)])
+
+    return freestream_conditions(rho, 1.8e-5, 340., 288., J * rpm / 60. * D)
+
+def mapped(off_map=None):
+
+    prop                 = Mapped_Propeller()
+    prop.tip_radius      = D / 2.
+    prop.performance_map = synthetic_map()
+    if off_map is not None:
+        prop.off_map = off_map
+
+    return prop
+
+@pytest.fixture
+def bem(monkeypatch):
+    """Stands in for the blade element model behind the map."""
+
+    calls = []
+
+    def spin(self, conditions):
+        calls.append(len(conditions.freestream.density))
+        return 'bem'
+
+    monkeypatch.setattr(propeller_map.Propeller, 'spin', spin)
+
+    return calls
+
+def test_points_inside_the_map_are_interpolated(bem):
+
+    J, rpm, rho = np.array([0.15, 0.55, 0.95]), np.array([2500., 4100., 5900.]), np.array([1.0, 1.2, 0.95])
+
+    prop              = mapped()
+    prop.inputs.omega = (rpm * 2. * np.pi / 60.)[:,None]
+    F, Q, P, Cp, outputs, etap = prop.spin(conditions(J, rpm, rho))
+
+    n = rpm / 60.
+    assert bem == []
+    np.testing.assert_allclose(outputs.advance_ratio[:,0], J)
+    np.testing.assert_allclose(F[:,0], Ct_of(J, rpm, rho) * rho * n**2 * D**4)
+    np.testing.assert_allclose(F[:,1:], 0.)
+    np.testing.assert_allclose(Q[:,0], Cq_of(J, rpm, rho) * rho * n**2 * D**5)
+    np.testing.assert_allclose(P, Q * prop.inputs.omega)
+
+def test_points_off_the_map_fall_back_to_bem(bem):
+
+    rpm               = np.array([3000., 6500.])
+    prop              = mapped()
+    prop.inputs.omega = (rpm * 2. * np.pi / 60.)[:,None]
+
+    assert prop.spin(conditions(0.5, rpm, 1.1)) == 'bem'
+    assert bem == [2]
+
+def test_off_map_clip_takes_the_edge_values(bem):
+
+    rpm               = np.array([3000., 6500.])
+    prop              = mapped('clip')
+    prop.inputs.omega = (rpm * 2. * np.pi / 60.)[:,None]
+
+    with pytest.warns(UserWarning, match='1 of 2 points off the propeller map'):
+        F, Q, P, Cp, outputs, etap = prop.spin(conditions(0.5, rpm, 1.1))
+
+    assert bem == []
+    n = rpm / 60.
+    np.testing.assert_allclose(F[:,0], Ct_of(0.5, np.clip(rpm, 2000., 6000.), 1.1) * 1.1 * n**2 * D**4)
+
+def test_check_map_against_the_model_it_tabulates():
+
+    def spin(conditions, Ct_of=Ct_of):
+        rho   = conditions.freestream.density[:,0]
+        V     = conditions.frames.inertial.velocity_vector[:,0]
+        n     = prop.inputs.omega[:,0] / (2. * np.pi)
+        J     = V / (n * D)
+        rpm   = 60. * n
+        T     = Ct_of(J, rpm, rho) * rho * n**2 * D**4
+        Q     = Cq_of(J, rpm, rho) * rho * n**2 * D**5
+        F     = np.column_stack([T, 0. * T, 0. * T])
+        return F, Q[:,None], None, None, None, None
+
+    prop = SimpleNamespace(tip_radius=D / 2., inputs=SimpleNamespace(), spin=spin)
+    pmap = synthetic_map()
+
+    # altitudes spanning the map's densities only
+    altitudes = [500., 2000.]
+    check     = check_map(prop, pmap, altitudes, n_points=32)
+    assert check['points'] == 32
+    assert check['thrust_coefficient'] < 1e-9 and check['torque_coefficient'] < 1e-9
+
+    prop.spin = lambda conditions: spin(conditions, lambda J, rpm, rho: Ct_of(J, rpm, rho) + 0.01 * np.sin(20. * J))
+    with pytest.warns(UserWarning, match='propeller map differs from BEM'):
+        check = check_map(prop, pmap, altitudes, n_points=32)
+    assert check['thrust_coefficient'] > 0.02
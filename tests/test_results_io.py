@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+import results_io
+from results_io import MISSION_FIELDS, PAYLOAD_RANGE_FIELDS, read_results, write_results
+
+class Data(dict):
+    """Attribute access like SUAVE's Data."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    __setattr__ = dict.__setitem__
+
+def mission(n_points=3):
+
+    time       = np.linspace(0., 60., n_points)[:, None]
+    conditions = Data(frames  = Data(inertial=Data(time=time, position_vector=np.hstack([time, 0 * time, -time]))),
+                      weights = Data(total_mass=700. - 0.01 * time))
+
+    return Data(segments=Data(climb=Data(conditions=conditions)))
+
+def envelope():
+
+    vn = np.zeros(2, dtype=[('weight', 'f8'), ('Vc', 'f8'), ('n_limit_positive', 'f8')])
+    vn['weight']           = 600., 700.
+    vn['Vc']               = 55., 59.
+    vn['n_limit_positive'] = 3.8
+
+    return vn
+
+@pytest.mark.parametrize('compressed', [False, True])
+def test_round_trip(tmp_path, compressed):
+
+    payload_range = {field: np.arange(4.) + i for i, field in enumerate(PAYLOAD_RANGE_FIELDS)}
+    path          = write_results(str(tmp_path / 'run.npz'), mission(), payload_range, envelope(),
+                                  compressed=compressed)
+
+    arrays = read_results(path)
+
+    assert int(arrays['schema_version']) == results_io.SCHEMA_VERSION
+    assert {key for key in arrays if key.startswith('mission/')} == {'mission/climb/' + f for f in MISSION_FIELDS}
+    np.testing.assert_array_equal(arrays['mission/climb/weights.total_mass'],
+                                  mission().segments.climb.conditions.weights.total_mass)
+    assert arrays['mission/climb/frames.inertial.position_vector'].shape == (3, 3)
+
+    # conditions the segment lacks keep their key, filled with NaN
+    assert arrays['mission/climb/propulsion.throttle'].shape == (3, 1)
+    assert np.isnan(arrays['mission/climb/propulsion.throttle']).all()
+
+    for field in PAYLOAD_RANGE_FIELDS:
+        np.testing.assert_array_equal(arrays['payload_range/' + field], payload_range[field])
+
+    np.testing.assert_array_equal(arrays['vn/Vc'], [55., 59.])
+    assert str(arrays['vn/source']) == 'vn_envelope'
+
+def test_sections_are_optional_and_tagged(tmp_path):
+
+    arrays = read_results(write_results(str(tmp_path / 'vn.npz'), vn=envelope()[0], vn_source='V_n_diagram'))
+
+    assert sorted(arrays) == ['schema_version', 'vn/Vc', 'vn/n_limit_positive', 'vn/source', 'vn/weight']
+    assert str(arrays['vn/source']) == 'V_n_diagram'
+    assert arrays['vn/weight'].shape == (1,)
+
+    assert sorted(read_results(write_results(str(tmp_path / 'empty.npz')))) == ['schema_version']
+
+def test_other_schema_versions_are_refused(tmp_path, monkeypatch):
+
+    path = str(tmp_path / 'old.npz')
+    monkeypatch.setattr(results_io, 'SCHEMA_VERSION', 0)
+    write_results(path, vn=envelope())
+    monkeypatch.undo()
+
+    with pytest.raises(ValueError):
+        read_results(path)
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+import sling2
+from sling2 import cli
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Replaces every command with a recorder and the import timing with a
+    fixed report, so no command needs SUAVE."""
+
+    calls = []
+
+    def recorder(args):
+        calls.append(args)
+
+    for name in ('run_main', 'run_vehicle', 'run_mission', 'run_payload_range', 'run_vn', 'run_loads', 'run_plot'):
+        monkeypatch.setattr(sling2, name, recorder)
+    monkeypatch.setattr(sling2, 'timed_imports', lambda modules: [(name, 0.5, 10) for name in modules])
+
+    return calls
+
+def test_subcommands(runs):
+
+    assert cli(['vn', '--weight', '600', '700', '--altitude', '0', '5000', '--output', 'vn.dat']) == 0
+    assert cli(['mission', '--altitude', '9500', '--fuel-tolerance', '0.1', '--propeller-map']) == 0
+    assert cli(['payload-range', '--reserves', '20']) == 0
+
+    vn, mission, payload_range = runs
+    assert vn.command == 'vn' and vn.weight == [600., 700.] and vn.altitude == [0., 5000.]
+    assert vn.delta_isa == [0.] and vn.output == 'vn.dat' and vn.main_output is None
+    assert mission.altitude == 9500. and mission.fuel_tolerance == 0.1 and mission.control_points == 16
+    assert mission.propeller_map and mission.vehicle is None
+    assert payload_range.reserves == 20.
+
+def test_no_command_runs_the_full_analysis(runs):
+
+    assert cli(['--headless', '--output', 'run.npz']) == 0
+
+    args, = runs
+    assert args.command == 'main' and args.headless and args.main_output == 'run.npz'
+
+def test_top_level_output_with_a_command_is_refused(runs, capsys):
+
+    with pytest.raises(SystemExit) as exit:
+        cli(['--output', 'run.npz', 'mission'])
+
+    assert exit.value.code == 2
+    assert 'give it after "mission"' in capsys.readouterr().err
+    assert runs == []
+
+def test_check_budget_exits_with_status_3(runs, monkeypatch, capsys):
+
+    # SUAVE, design_cache and the three plotting modules at 0.5 s each
+    monkeypatch.setitem(sling2.STARTUP_BUDGETS, 'loads', 2.)
+
+    assert cli(['--check-budget', 'loads']) == 3
+    assert runs == []
+    assert 'over the 2.00 s startup budget' in capsys.readouterr().err
+
+    # without --check-budget it only warns
+    assert cli(['loads']) == 0
+    assert len(runs) == 1
+    assert 'over the 2.00 s startup budget' in capsys.readouterr().err
+
+    monkeypatch.setitem(sling2.STARTUP_BUDGETS, 'loads', 3.)
+    assert cli(['--check-budget', '--import-report', 'loads']) == 0
+    err = capsys.readouterr().err
+    assert 'startup budget' not in err
+    assert 'import ADRpy.atmospheres' in err and 'budget' in err
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+from scipy import stats as distributions
+
+from uncertainty import (OUTPUTS, UNCERTAIN_INPUTS, checkpoint_length, converged, inverse_cdf,
+                         sample_inputs, statistics)
+
+def quantiles(samples):
+    """The uniform draw behind each input sample, through its CDF."""
+
+    u = {}
+    for name, (kind, params) in UNCERTAIN_INPUTS.items():
+        x = samples[name]
+        if kind == 'uniform':
+            low, high = params
+            u[name] = (x - low) / (high - low)
+        elif kind == 'normal':
+            u[name] = distributions.norm.cdf(x, *params)
+        else:
+            low, mode, high = params
+            u[name] = distributions.triang.cdf(x, (mode - low) / (high - low), low, high - low)
+
+    return u
+
+def test_sobol_is_balanced_on_power_of_2_prefixes():
+
+    samples = sample_inputs(100, seed=3)
+    assert len(samples) == 128 and samples.dtype.names == tuple(UNCERTAIN_INPUTS)
+
+    # every prefix of 2^m draws puts one in each of 2^m equal strata
+    for name, u in quantiles(samples).items():
+        for m in range(8):
+            counts = np.bincount(np.floor(u[:2**m] * 2**m).astype(int), minlength=2**m)
+            assert (counts == 1).all(), (name, m)
+
+    assert len(sample_inputs(128)) == 128 and len(sample_inputs(1)) == 1
+    np.testing.assert_array_equal(sample_inputs(64, seed=3), samples[:64])
+
+def test_latin_hypercube_is_stratified():
+
+    samples = sample_inputs(50, method='lhs', seed=1)
+    assert len(samples) == 50
+
+    for name, u in quantiles(samples).items():
+        assert sorted(np.floor(u * 50).astype(int)) == list(range(50)), name
+
+    with pytest.raises(ValueError):
+        sample_inputs(50, method='random')
+    with pytest.raises(ValueError):
+        inverse_cdf('lognormal', (0., 1.), np.array([0.5]))
+
+def test_distribution_parameters():
+
+    u = np.array([0., 0.5, 1.])
+    np.testing.assert_allclose(inverse_cdf('uniform', (1.2, 1.5), u), [1.2, 1.35, 1.5])
+    np.testing.assert_allclose(inverse_cdf('triangular', (1., 1.4, 2.), u[[0, 2]]), [1., 2.])
+    assert inverse_cdf('triangular', (1., 1.4, 2.), np.array([0.4]))[0] == pytest.approx(1.4)
+    assert inverse_cdf('normal', (0.56, 0.03), np.array([0.5]))[0] == pytest.approx(0.56)
+
+def rows(values, solved=None):
+
+    dtype = [(name, 'f8') for name in OUTPUTS] + [('solved', '?')]
+    rows  = np.zeros(len(values), dtype=dtype)
+    for name in OUTPUTS:
+        rows[name] = values
+    rows['solved'] = True if solved is None else solved
+
+    return rows
+
+def test_statistics_skip_dropped_samples():
+
+    values = np.array([1., 2., 3., 4., np.nan, 5.])
+    stats  = statistics(rows(values, solved=np.isfinite(values)))
+
+    assert stats['dropped'] == 1 and stats['converged'] is False
+    for name in OUTPUTS:
+        entry = stats[name]
+        assert entry['n'] == 5 and (entry['min'], entry['max'], entry['p50']) == (1., 5., 3.)
+        assert entry['mean'] == 3. and entry['std'] == pytest.approx(np.std([1, 2, 3, 4, 5], ddof=1))
+        assert entry['p05'] == pytest.approx(1.2) and entry['p95'] == pytest.approx(4.8)
+
+    nothing = statistics(rows(np.full(3, np.nan), solved=False))
+    assert nothing['dropped'] == 3 and nothing['range'] == {'n': 0}
+
+def test_converged_needs_patience_within_tolerance():
+
+    def snapshot(shift):
+        return statistics(rows(np.linspace(0., 100., 11) + shift))
+
+    # spread p05..p95 is 90, rtol 0.01 allows 0.9 of drift
+    settled = [snapshot(5.), snapshot(0.5), snapshot(0.), snapshot(0.4)]
+    assert converged(settled, rtol=0.01, patience=2)
+    assert not converged(settled, rtol=0.01, patience=3)
+    assert not converged(settled[-2:], rtol=0.01, patience=2)
+    assert not converged(settled[:-1] + [snapshot(1.5)], rtol=0.01, patience=2)
+
+    empty = statistics(rows(np.full(3, np.nan), solved=False))
+    assert not converged([empty] * 4, rtol=0.01, patience=2)
+
+def test_checkpoint_length():
+
+    assert [checkpoint_length(n, 'sobol') for n in (0, 1, 2, 3, 255, 256, 257, 1000)] == \
+           [0, 1, 2, 2, 128, 256, 256, 512]
+    assert checkpoint_length(1000, 'lhs') == 1000
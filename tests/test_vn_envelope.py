@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from vn_envelope import FT, KNOT, LB, vn_envelopes
+
+S_FT2 = 11.845 / FT**2
+
+def sling2(category='normal'):
+    """The envelope inputs of vehicle_setup(), mean aerodynamic chord approximate."""
+
+    wing = SimpleNamespace(aspect_ratio=7.04, sweeps=SimpleNamespace(quarter_chord=0.),
+                           chords=SimpleNamespace(mean_aerodynamic=1.32))
+
+    return SimpleNamespace(wings=SimpleNamespace(main_wing=wing), reference_area=11.845,
+                           maximum_lift_coefficient=1.3, minimum_lift_coefficient=-1.,
+                           envelope=SimpleNamespace(category=category, cruise_mach=0.09))
+
+def test_far23_normal_category_at_mtow():
+
+    env = vn_envelopes(sling2(), 700.)
+
+    # 1543 lb on 127.5 ft^2 is 12.1 psf: Vc = 33 sqrt(W/S) and Vd = 1.4 Vc
+    ws = 700. / LB / S_FT2
+    assert env['Vc'] / KNOT == pytest.approx(33. * np.sqrt(ws))
+    assert env['Vc'] / KNOT == pytest.approx(114.8, abs=0.1)
+    assert env['Vd'] == pytest.approx(1.4 * env['Vc'])
+
+    # 2.1 + 24000 / (W + 10000) = 4.18 is capped at 3.8, n- = -0.4 n+
+    assert env['n_maneuver_positive'] == pytest.approx(3.8)
+    assert env['n_maneuver_negative'] == pytest.approx(-1.52)
+
+    Vs1 = np.sqrt(2. * 700. * 9.80665 / (1.225 * 11.845 * 1.3))
+    assert env['Vs1'] == pytest.approx(Vs1)
+    assert env['Va'] == pytest.approx(Vs1 * np.sqrt(3.8))
+    assert env['density'] == pytest.approx(1.225, rel=1e-4)
+
+    # 50 and 25 ft/s gusts at Vc and Vd, the limit covers both envelopes
+    assert 0. < env['gust_alleviation_factor'] < 0.88
+    assert env['n_gust_Vc_positive'] - 1. == pytest.approx(1. - env['n_gust_Vc_negative'])
+    assert env['n_limit_positive'] == max(env['n_maneuver_positive'], env['n_gust_Vc_positive'],
+                                          env['n_gust_Vd_positive'])
+    assert env['n_limit_negative'] == min(env['n_maneuver_negative'], env['n_gust_Vc_negative'],
+                                          env['n_gust_Vd_negative'])
+
+def test_far23_speed_factors_at_100_psf():
+
+    env = vn_envelopes(sling2(), 100. * S_FT2 * LB)
+
+    assert env['Vc'] / KNOT == pytest.approx(28.6 * 10.)
+    assert env['Vd'] == pytest.approx(1.35 * env['Vc'])
+
+def test_far23_utility_category():
+
+    env = vn_envelopes(sling2('utility'), 700.)
+
+    assert env['n_maneuver_positive'] == pytest.approx(4.4)
+    assert env['Vd'] == pytest.approx(1.5 * env['Vc'])
+
+def test_broadcast_matches_single_envelopes():
+
+    weights   = np.array([550., 625., 700.])
+    altitudes = np.array([0., 3000.])
+    offsets   = np.array([0., 20.])
+
+    batch = vn_envelopes(sling2(), weights[:,None,None], altitudes[None,:,None], offsets[None,None,:])
+    assert batch.shape == (3, 2, 2)
+
+    for i, j, k in np.ndindex(batch.shape):
+        single = vn_envelopes(sling2(), weights[i], altitudes[j], offsets[k])
+        for name in batch.dtype.names:
+            assert batch[i,j,k][name] == pytest.approx(single[name])
+
+    # thinner air, from altitude or a hot day, means larger gust loads
+    assert np.all(np.diff(batch['density'], axis=1) < 0.)
+    assert np.all(np.diff(batch['density'], axis=2) < 0.)
+    assert np.all(np.diff(batch['n_gust_Vc_positive'], axis=1) > 0.)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from warm_start import (CONDITION_KEYS, WarmStartStore, chebyshev_points, count_iterations,
+                        counting_root_finder, resample, residual_evaluations)
+
+class Data(dict):
+    """Attribute access like SUAVE's Data."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    __setattr__ = dict.__setitem__
+
+def segment(n_points=16, converged=True, **unknowns):
+
+    numerics = Data(number_control_points=n_points, converged=converged)
+
+    return Data(settings=Data(), state=Data(numerics=numerics, unknowns=Data(unknowns)))
+
+def mission(**segments):
+
+    return Data(segments=Data(segments))
+
+def test_query_returns_the_nearest_scaled_condition():
+
+    assert CONDITION_KEYS == ('altitude', 'air_speed', 'takeoff_mass', 'distance')
+
+    store = WarmStartStore()
+    assert store.query((2900., 60., 700., 1.e6)) is None
+
+    store.add((2900., 60., 700., 1.e6), 'cruise at 60 m/s')
+    store.add((2900., 70., 700., 1.e6), 'cruise at 70 m/s')
+    store.add((1000., 62., 700., 1.e6), 'low cruise')
+
+    assert store.query((2900., 64., 700., 1.e6)) == 'cruise at 60 m/s'
+    assert store.query((2900., 66., 700., 1.e6)) == 'cruise at 70 m/s'
+    # 1700 m lower is 3.4 units, 2 m/s faster only 0.4
+    assert store.query((1200., 60., 700., 1.e6)) == 'low cruise'
+    assert store.query((2600., 60., 700., 1.e6)) == 'cruise at 60 m/s'
+
+def test_store_grows_and_evicts_the_oldest():
+
+    store = WarmStartStore()
+    for i in range(100):
+        store.add((0., float(i), 700., 0.), i)
+    assert len(store) == 100 and store.conditions.shape == (100, 4)
+    assert store.query((0., 41.2, 700., 0.)) == 41
+
+    store = WarmStartStore(max_points=3)
+    for i in range(5):
+        store.add((0., 10. * i, 700., 0.), i)
+    assert len(store) == 3 and sorted(store.unknowns) == [2, 3, 4]
+    assert store.query((0., 0., 700., 0.)) == 2
+
+    store = WarmStartStore(max_points=0)
+    store.add((0., 0., 700., 0.), 0)
+    assert len(store) == 0 and store.query((0., 0., 700., 0.)) is None
+
+def test_seed_and_apply():
+
+    store   = WarmStartStore()
+    results = mission(climb =segment(9, throttle=np.linspace(0.8, 1., 9)[:,None]),
+                      cruise=segment(9, throttle=np.full((9, 1), 0.6), rpm=np.full((9, 1), 5100.)))
+    assert store.seed((2900., 60., 700., 1.e6), results)
+
+    # the stored arrays are copies
+    results.segments.cruise.state.unknowns.rpm[:] = 0.
+
+    target = mission(climb=segment(17, throttle=np.ones((1, 1))), cruise=segment(5), descent=segment(5))
+    assert store.apply(target, (2900., 61., 700., 1.e6))
+
+    climb, cruise = target.segments.climb.state.unknowns, target.segments.cruise.state.unknowns
+    assert climb.throttle.shape == (17, 1)
+    np.testing.assert_allclose(climb.throttle[[0, -1], 0], [0.8, 1.])
+    np.testing.assert_array_equal(cruise.rpm, np.full((5, 1), 5100.))
+    assert target.segments.descent.state.unknowns == {}
+
+    assert not store.seed((0., 0., 0., 0.), mission(cruise=segment(converged=False, throttle=np.ones((9, 1)))))
+    assert len(store) == 1
+    assert not WarmStartStore().apply(target, (2900., 61., 700., 1.e6))
+
+def test_resample_onto_chebyshev_points():
+
+    x9 = chebyshev_points(9)
+    assert x9[0] == 0. and x9[-1] == 1. and np.all(np.diff(x9) > 0.)
+    np.testing.assert_allclose(chebyshev_points(3), [0., 0.5, 1.], atol=1e-15)
+    np.testing.assert_array_equal(chebyshev_points(1), [0.])
+
+    # linear in time comes out exactly, in ascending order, coarser or finer
+    values = np.column_stack([1. + 2. * x9, 5000. - 100. * x9])
+    for n in (5, 9, 17, 33):
+        x = chebyshev_points(n)
+        np.testing.assert_allclose(resample(values, n), np.column_stack([1. + 2. * x, 5000. - 100. * x]))
+
+    # a single row is left for SUAVE to expand
+    np.testing.assert_array_equal(resample(np.array([[0.5, 5500.]]), 16), [[0.5, 5500.]])
+    assert resample(values, 9) is not values
+
+def test_counting_root_finder():
+
+    seg = segment()
+
+    def residual(x, segment):
+        assert segment is seg
+        calls.append(x.copy())
+        return x**2 - np.array([4., 9.])
+
+    calls  = []
+    x      = counting_root_finder(residual, np.array([1., 1.]), args=seg, xtol=1e-12)
+    np.testing.assert_allclose(x, [2., 3.])
+    assert seg.state.numerics.residual_evaluations == len(calls) > 2
+
+    first = len(calls)
+    x, info, ier, message = counting_root_finder(residual, np.array([1., 1.]), args=seg, full_output=1)
+    assert ier == 1 and info['nfev'] <= len(calls) - first
+    assert seg.state.numerics.residual_evaluations == len(calls)
+
+def test_count_iterations_installs_the_counter():
+
+    m = mission(climb=segment(), cruise=segment())
+    m.segments.cruise.state.numerics.residual_evaluations = 12
+
+    assert count_iterations(m) is m
+    for seg in m.segments.values():
+        assert seg.settings.root_finder is counting_root_finder
+        assert seg.state.numerics.residual_evaluations == 0
+
+    m.segments.climb.state.numerics.residual_evaluations = 7
+    m.segments.cruise.state.numerics.residual_evaluations = 5
+    assert residual_evaluations(m) == 12
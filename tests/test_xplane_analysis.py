@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+import pytest
+
+from xplane_analysis import TIME, RunningStats, iter_log, log_statistics, read_header, read_log
+
+# as X-Plane writes it: padded names, commas, a trailing separator
+HEADER = '   _real,_time |   missn,_time |   pitch,__deg |   _Vind,_keas |  _Vind,_keas |\n'
+
+def write_log(path, n_rows, seed=0):
+
+    rng    = np.random.default_rng(seed)
+    time   = 0.1 * np.arange(n_rows) + 1000.25
+    pitch  = rng.normal(3., 2., n_rows)
+    speed  = rng.normal(95., 10., n_rows)
+    with open(path, 'w') as f:
+        f.write(HEADER)
+        for row in zip(time + 5., time, pitch, speed, speed + 1.):
+            f.write('  %.3f |  %.5f |  %.5f |  %.5f |  %.5f |\n' % row)
+
+    return str(path), time, pitch, speed
+
+def test_padded_header_is_normalised(tmp_path):
+
+    path, time, pitch, speed = write_log(tmp_path / 'log.txt', 3)
+
+    assert read_header(path) == ['_real_time', TIME, 'pitch_deg', '_Vind_keas', '_Vind_keas_4', '_unnamed_5']
+
+def test_only_the_asked_columns_in_float32(tmp_path):
+
+    path, time, pitch, speed = write_log(tmp_path / 'log.txt', 25)
+
+    frames = list(iter_log(path, ['pitch_deg'], chunksize=10))
+    assert [len(frame) for frame in frames] == [10, 10, 5]
+    for frame in frames:
+        assert list(frame.columns) == [TIME, 'pitch_deg']
+        assert frame[TIME].dtype == np.float64 and frame['pitch_deg'].dtype == np.float32
+
+    log = read_log(path, ['pitch_deg', '_Vind_keas'], chunksize=10)
+    np.testing.assert_array_equal(log[TIME], np.round(time, 5))
+    np.testing.assert_array_equal(log['_Vind_keas'], np.round(speed, 5).astype(np.float32))
+
+    every = read_log(path)
+    assert list(every.columns) == ['_real_time', TIME, 'pitch_deg', '_Vind_keas', '_Vind_keas_4']
+
+    with pytest.raises(KeyError):
+        next(iter_log(path, ['pitch_deg', 'roll_deg']))
+
+def test_running_stats_merge_chunks():
+
+    rng    = np.random.default_rng(1)
+    values = np.concatenate([rng.normal(1e4, 3., 1000), rng.normal(1e4 + 50., 1., 7), [np.nan] * 3])
+    rng.shuffle(values)
+
+    stats = RunningStats()
+    for chunk in np.split(values, [1, 2, 300, 300, 750, 1007]):
+        stats.update(chunk)
+
+    expected = values[~np.isnan(values)]
+    assert stats.count == expected.size
+    assert (stats.min, stats.max) == (expected.min(), expected.max())
+    assert stats.mean == pytest.approx(expected.mean(), rel=1e-14)
+    assert stats.variance == pytest.approx(expected.var(ddof=1), rel=1e-10)
+    assert stats.as_dict()['std'] == pytest.approx(expected.std(ddof=1), rel=1e-10)
+
+    empty = RunningStats().update([np.nan])
+    assert empty.count == 0 and empty.variance == 0.
+
+def test_log_statistics_across_chunk_boundaries(tmp_path):
+
+    path, time, pitch, speed = write_log(tmp_path / 'log.txt', 101)
+
+    whole = log_statistics(path, ['pitch_deg', '_Vind_keas'], chunksize=1000)
+    stats = log_statistics(path, ['pitch_deg', '_Vind_keas'], chunksize=7,
+                           phases=[('early', time[0], time[40]), ('late', time[40], np.inf)])
+
+    for name, values in (('pitch_deg', pitch), ('_Vind_keas', speed)):
+        values = np.round(values, 5).astype(np.float32).astype(np.float64)
+        s      = stats['all'][name]
+        assert s.count == 101
+        assert (s.min, s.max) == (values.min(), values.max())
+        assert s.mean == pytest.approx(values.mean(), rel=1e-12)
+        assert s.variance == pytest.approx(values.var(ddof=1), rel=1e-10)
+        assert s.mean == pytest.approx(whole['all'][name].mean, rel=1e-12)
+
+        early, late = stats['early'][name], stats['late'][name]
+        assert (early.count, late.count) == (40, 61)
+        assert early.mean == pytest.approx(values[:40].mean(), rel=1e-12)
+        assert late.variance == pytest.approx(values[40:].var(ddof=1), rel=1e-10)
+
+def test_phases_from_a_labelling_function(tmp_path):
+
+    path, time, pitch, speed = write_log(tmp_path / 'log.txt', 50)
+
+    def climbing(frame):
+        return np.where(frame['pitch_deg'] > 3., 'climb', None)
+
+    stats = log_statistics(path, ['pitch_deg'], climbing, chunksize=8)
+
+    values = np.round(pitch, 5).astype(np.float32).astype(np.float64)
+    assert sorted(stats) == ['all', 'climb']
+    assert stats['climb']['pitch_deg'].count == (values > 3.).sum()
+    assert stats['climb']['pitch_deg'].min == values[values > 3.].min()
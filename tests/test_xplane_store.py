@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+import pytest
+
+import xplane_store
+from xplane_store import XPlaneStore, open_log
+
+HEADER = '_real,_time|missn,_time|pitch,__deg|_Vind,_keas|\n'
+
+def write_log(path, times):
+
+    with open(path, 'w') as f:
+        f.write(HEADER)
+        for t in times:
+            f.write('%.3f|%.3f|%.2f|%.2f|\n' % (t + 100., t, t / 10., 90. + t))
+
+    return str(path)
+
+@pytest.fixture
+def ingests(monkeypatch):
+    """Counts the logs parsed into a store."""
+
+    calls  = []
+    ingest = xplane_store.ingest
+
+    def counted(source, directory, chunksize=None):
+        calls.append(source)
+        return ingest(source, directory, chunksize)
+
+    monkeypatch.setattr(xplane_store, 'ingest', counted)
+
+    return calls
+
+def test_store_is_reused_until_the_source_changes(tmp_path, ingests):
+
+    log   = write_log(tmp_path / 'log.txt', np.arange(10.))
+    store = str(tmp_path / 'store')
+
+    assert open_log(log, store).rows == 10
+    assert open_log(log, store).rows == 10
+    assert len(ingests) == 1
+
+    # a different size
+    write_log(log, np.arange(12.))
+    assert open_log(log, store).rows == 12
+    assert len(ingests) == 2
+
+    # the same size, a later modification time
+    size = os.path.getsize(log)
+    write_log(log, np.arange(12.) + .5)
+    assert os.path.getsize(log) == size
+    stat = os.stat(log)
+    os.utime(log, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    frame = open_log(log, store).query(columns=['pitch_deg'])
+    assert len(ingests) == 3
+    assert frame['missn_time'].iloc[0] == .5
+
+def test_a_broken_store_is_rebuilt(tmp_path, ingests):
+
+    log   = write_log(tmp_path / 'log.txt', np.arange(10.))
+    store = str(tmp_path / 'store')
+
+    directory = xplane_store.store_path(log, store)
+    open_log(log, store)
+    with open(os.path.join(directory, 'header.json'), 'w') as f:
+        f.write('{"version": 0}')
+
+    assert open_log(log, store).rows == 10
+    assert len(ingests) == 2
+
+def test_range_query_on_a_sorted_store(tmp_path):
+
+    times = np.array([5., 1., 3., 2., 4., 0.])
+    store = open_log(write_log(tmp_path / 'log.txt', times), str(tmp_path / 'store'), chunksize=2)
+
+    np.testing.assert_array_equal(store.time, np.sort(times))
+    np.testing.assert_allclose(store.column('_Vind_keas'), 90. + np.sort(times))
+
+    frame = store.query(1., 4., ['pitch_deg'])
+    assert list(frame.columns) == ['missn_time', 'pitch_deg']
+    np.testing.assert_array_equal(frame['missn_time'], [1., 2., 3.])
+
+    stats = store.statistics(['_Vind_keas'])['_Vind_keas']
+    assert stats.count == 6 and stats.mean == pytest.approx(92.5)
+
+    with pytest.raises(KeyError):
+        store.arrays(columns=['altitude'])
+
+def test_header_only_log(tmp_path):
+
+    store = open_log(write_log(tmp_path / 'log.txt', []), str(tmp_path / 'store'))
+
+    assert store.rows == 0
+    assert store.query(0., 10., ['pitch_deg']).shape == (0, 2)
+    assert isinstance(store, XPlaneStore)
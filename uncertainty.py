@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Mon Oct 19 03:14:26 2026
+
+@author: K. Grafton
+
+Monte Carlo propagation of the assumed Sling 2 inputs through the cruise
+mission and the V-n envelope. The inputs are drawn from their
+distributions with a scrambled Sobol sequence (or a Latin hypercube),
+evaluated in batches on a process pool and the percentiles of the
+outputs are updated as the batches come back, in sequence order. A Sobol
+sequence is only balanced over power-of-2 prefixes, so sampling stops
+early at such a prefix once the tracked statistics have settled.
+
+    for n, stats in iter_uncertainty(4096):
+        print(n, stats['range']['p05'], stats['range']['p95'])
+
+Outputs: range on the max-payload fuel load (nmi), fuel burn over the
+default 600 nmi cruise (kg), Vs1 and Va (KEAS) and the positive and
+negative limit load factors. Samples whose mission does not converge are
+dropped, the statistics count them.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+# name -> (distribution, parameters). uniform (low, high), normal (mean,
+# std), triangular (low, mode, high). The nominal values are sling2's.
+UNCERTAIN_INPUTS = {'maximum_lift_coefficient':        ('uniform',    (1.2, 1.5)),
+                    'minimum_lift_coefficient':        ('uniform',    (-1.2, -0.8)),
+                    'gear_drag_factor':                ('triangular', (1.0, 1.4, 2.0)),
+                    'power_specific_fuel_consumption': ('normal',     (0.56, 0.03))}
+
+# the factor base_analysis() uses
+NOMINAL_GEAR_DRAG_FACTOR = 1.4
+
+OUTPUTS = ('range', 'fuel_burn', 'Vs1', 'Va', 'n_limit_positive', 'n_limit_negative')
+
+PERCENTILES = (5., 50., 95.)
+
+KNOT          = 1852. / 3600.
+NAUTICAL_MILE = 1852.
+
+# ----------------------------------------------------------------------
+#   Sampling
+# ----------------------------------------------------------------------
+
+def sample_inputs(n_samples, distributions=UNCERTAIN_INPUTS, method='sobol', seed=0):
+    """Structured array of input draws, one field per input. With
+    method='sobol' n_samples is rounded up to a power of 2."""
+
+    from scipy.stats import qmc
+
+    names = list(distributions)
+    if method == 'sobol':
+        m = int(np.ceil(np.log2(max(n_samples, 1))))
+        u = qmc.Sobol(len(names), scramble=True, seed=seed).random_base2(m)
+    elif method == 'lhs':
+        u = qmc.LatinHypercube(len(names), seed=seed).random(n_samples)
+    else:
+        raise ValueError("method must be 'sobol' or 'lhs', not %r" % method)
+
+    samples = np.zeros(len(u), dtype=[(name, 'f8') for name in names])
+    for i, name in enumerate(names):
+        kind, params   = distributions[name]
+        samples[name]  = inverse_cdf(kind, params, u[:,i])
+
+    return samples
+
+def inverse_cdf(kind, params, u):
+
+    from scipy import stats
+
+    if kind == 'uniform':
+        low, high = params
+        return low + (high - low) * u
+    if kind == 'normal':
+        mean, std = params
+        return stats.norm.ppf(u, loc=mean, scale=std)
+    if kind == 'triangular':
+        low, mode, high = params
+        return stats.triang.ppf(u, (mode - low) / (high - low), loc=low, scale=high - low)
+
+    raise ValueError('unknown distribution %r' % kind)
+
+# ----------------------------------------------------------------------
+#   Propagation
+# ----------------------------------------------------------------------
+
+def iter_uncertainty(n_samples, distributions=UNCERTAIN_INPUTS, method='sobol', seed=0,
+                     batch_size=16, max_workers=None, rtol=0.005, min_samples=256, patience=2,
+                     propeller_map=False):
+    """Yields (samples done, statistics) as batches finish, with the
+    statistics of every output over the samples done so far in sequence
+    order. Convergence is checked on every power-of-2 prefix for Sobol and
+    after every batch for a Latin hypercube. Stops before n_samples once
+    min_samples are done and no tracked statistic has moved by more than
+    rtol of its output's spread over the last patience checks. The last
+    yield carries 'samples', every row used."""
+
+    inputs    = sample_inputs(n_samples, distributions, method, seed)
+    n_samples = len(inputs)
+    batches   = [inputs[i:i + batch_size] for i in range(0, n_samples, batch_size)]
+    done      = [None] * len(batches)
+    ready     = 0     # leading batches done, results are used in sequence order
+    checked   = 0     # samples in the last convergence check
+    history   = []
+
+    max_workers = max_workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker,
+                             initargs=(propeller_map,)) as pool:
+        # keep the pool a little ahead rather than queueing everything, so
+        # stopping early does not leave thousands of samples to cancel
+        ahead   = 2 * max_workers
+        pending = {}
+        queued  = iter(range(len(batches)))
+
+        def refill():
+            for i in queued:
+                pending[pool.submit(evaluate_samples, batches[i])] = i
+                if len(pending) >= ahead:
+                    break
+
+        refill()
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done[pending.pop(future)] = future.result()
+            while ready < len(batches) and done[ready] is not None:
+                ready += 1
+            if not ready:
+                refill()
+                continue
+
+            rows = np.concatenate(done[:ready])
+            stop = False
+            checkpoint = checkpoint_length(len(rows), method)
+            if checkpoint > checked:
+                checked = checkpoint
+                history.append(statistics(rows[:checkpoint]))
+                stop = (checkpoint >= min(min_samples, n_samples)
+                        and converged(history, rtol, patience))
+
+            if stop:
+                for future in pending:
+                    future.cancel()
+                pending.clear()
+                rows  = rows[:checkpoint]
+                stats = history[-1]
+                stats['converged'] = True
+            else:
+                refill()
+                stats = statistics(rows)
+
+            if not pending:
+                stats['samples'] = rows
+            yield len(rows), stats
+
+    return
+
+def propagate(n_samples, **kwargs):
+    """Runs iter_uncertainty() to the end and returns (samples, statistics)."""
+
+    for n, stats in iter_uncertainty(n_samples, **kwargs):
+        pass
+
+    return stats.pop('samples'), stats
+
+def checkpoint_length(n, method):
+    """Longest prefix of n samples convergence may be judged on."""
+
+    if method == 'sobol':
+        return 2 ** int(np.log2(n)) if n else 0
+
+    return n
+
+def statistics(rows):
+
+    stats = {'dropped': int((~rows['solved']).sum())}
+    for name in OUTPUTS:
+        values = rows[name][np.isfinite(rows[name])]
+        entry  = {'n': int(values.size)}
+        if values.size:
+            for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+                entry['p%02d' % p] = float(value)
+            entry['mean'] = float(values.mean())
+            entry['std']  = float(values.std(ddof=1)) if values.size > 1 else 0.
+            entry['min']  = float(values.min())
+            entry['max']  = float(values.max())
+        stats[name] = entry
+    stats['converged'] = False
+
+    return stats
+
+def converged(history, rtol, patience):
+    """True when the percentiles and mean of every output have each stayed
+    within rtol of the output's 5-95 spread for the last patience updates."""
+
+    if len(history) <= patience:
+        return False
+
+    keys = ['p%02d' % p for p in PERCENTILES] + ['mean']
+    last = history[-1]
+    for name in OUTPUTS:
+        if 'mean' not in last[name]:
+            return False
+        spread = max(last[name]['p95'] - last[name]['p05'], 1e-12)
+        for previous in history[-1 - patience:-1]:
+            if any(abs(last[name][k] - previous[name].get(k, np.inf)) > rtol * spread for k in keys):
+                return False
+
+    return True
+
+# ----------------------------------------------------------------------
+#   Worker
+# ----------------------------------------------------------------------
+
+def init_worker(propeller_map=False):
+
+    import mission_sweep
+
+    mission_sweep.init_worker(propeller_map)
+
+    worker = mission_sweep._worker
+    if 'nominal' not in worker:
+        vehicle  = worker['vehicle']
+        engine   = list(vehicle.networks.internal_combustion.engines.values())[0]
+        worker['nominal'] = {
+            'drag_coefficient_increment':      worker['analyses'].aerodynamics.settings.drag_coefficient_increment,
+            'power_specific_fuel_consumption': engine.power_specific_fuel_consumption,
+            'maximum_lift_coefficient':        vehicle.maximum_lift_coefficient,
+            'minimum_lift_coefficient':        vehicle.minimum_lift_coefficient}
+
+    return
+
+def evaluate_samples(inputs):
+    """Output rows for a batch of input draws, on this worker's vehicle."""
+
+    from mission_sweep import _worker
+
+    from payload_range_batch import FuelCurveError
+
+    dtype = inputs.dtype.descr + [(name, 'f8') for name in OUTPUTS] + [('solved', '?')]
+    rows  = np.zeros(len(inputs), dtype=dtype)
+    for name in inputs.dtype.names:
+        rows[name] = inputs[name]
+
+    nominal = _worker['nominal']
+    try:
+        for i, sample in enumerate(inputs):
+            apply_sample(sample, nominal)
+            try:
+                values = evaluate_sample()
+                rows['solved'][i] = True
+            except (Unconverged, FuelCurveError):
+                # dropped, counted by statistics()
+                values = dict.fromkeys(OUTPUTS, np.nan)
+            for name in OUTPUTS:
+                rows[name][i] = values[name]
+    finally:
+        restore_nominal(nominal)
+
+    return rows
+
+def apply_sample(sample, nominal):
+
+    from mission_sweep import _worker
+
+    vehicle  = _worker['vehicle']
+    analyses = _worker['analyses']
+    engine   = list(vehicle.networks.internal_combustion.engines.values())[0]
+    names    = sample.dtype.names
+
+    def value(name, default):
+        return float(sample[name]) if name in names else default
+
+    vehicle.maximum_lift_coefficient = value('maximum_lift_coefficient', nominal['maximum_lift_coefficient'])
+    vehicle.minimum_lift_coefficient = value('minimum_lift_coefficient', nominal['minimum_lift_coefficient'])
+    engine.power_specific_fuel_consumption = value('power_specific_fuel_consumption',
+                                                   nominal['power_specific_fuel_consumption'])
+
+    analyses.aerodynamics.settings.drag_coefficient_increment = (
+        nominal['drag_coefficient_increment']
+        * value('gear_drag_factor', NOMINAL_GEAR_DRAG_FACTOR) / NOMINAL_GEAR_DRAG_FACTOR)
+
+    return
+
+def restore_nominal(nominal):
+
+    from mission_sweep import _worker
+
+    vehicle  = _worker['vehicle']
+    engine   = list(vehicle.networks.internal_combustion.engines.values())[0]
+
+    vehicle.maximum_lift_coefficient       = nominal['maximum_lift_coefficient']
+    vehicle.minimum_lift_coefficient       = nominal['minimum_lift_coefficient']
+    engine.power_specific_fuel_consumption = nominal['power_specific_fuel_consumption']
+    _worker['analyses'].aerodynamics.settings.drag_coefficient_increment = nominal['drag_coefficient_increment']
+
+    return
+
+def evaluate_sample():
+    """Outputs for the inputs currently applied to the worker's vehicle."""
+
+    import sling2
+    from mission_sweep import _worker, segment_state
+    from payload_range_batch import fuel_curve
+    from vn_envelope import vn_envelopes
+
+    vehicle  = _worker['vehicle']
+    analyses = _worker['analyses']
+    store    = _worker['warm_start']
+    masses   = vehicle.mass_properties
+    takeoff  = masses.takeoff
+    flown    = {}
+
+    def fly(tow, altitude, distance):
+        # fuel_curve() asks for the default distance first, that solve is
+        # also the fuel burn
+        if distance in flown:
+            return flown[distance]
+        masses.takeoff = tow
+        mission   = sling2.mission_setup(analyses, vehicle, distance=distance)
+        segment   = mission.segments.cruise
+        condition = (segment.altitude, segment.air_speed, tow, segment.distance)
+        store.apply(mission, condition)
+        results   = mission.evaluate()
+        store.seed(condition, results)
+        if not all(segment_state(segment).numerics.get('converged', True)
+                   for segment in results.segments.values()):
+            raise Unconverged('mission at %.1f kg did not converge' % tow)
+        flown[distance] = (mission, results)
+        return flown[distance]
+
+    try:
+        mission, results = fly(masses.max_takeoff, np.nan, None)
+        mass      = results.segments.cruise.conditions.weights.total_mass[:,0]
+        fuel_burn = mass[0] - mass[-1]
+        fuel      = masses.max_takeoff - masses.max_zero_fuel
+        range_    = fuel_curve(fly, masses.max_takeoff, np.nan, fuel, 'cruise')(fuel) / NAUTICAL_MILE
+    finally:
+        masses.takeoff = takeoff
+
+    vn = vn_envelopes(vehicle, masses.max_takeoff)
+
+    return {'range':            range_,
+            'fuel_burn':        fuel_burn,
+            'Vs1':              float(vn['Vs1']) / KNOT,
+            'Va':               float(vn['Va']) / KNOT,
+            'n_limit_positive': float(vn['n_limit_positive']),
+            'n_limit_negative': float(vn['n_limit_negative'])}
+
+class Unconverged(RuntimeError):
+    """A mission of the sample did not converge."""
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:40:15 2026
+
+@author: K. Grafton
+
+Batch FAR 23 V-n envelopes. Weights, altitudes and ISA offsets are
+broadcast against each other and every envelope is computed in one numpy
+pass, with no log, data file or figure written unless asked for.
+
+Speeds are equivalent airspeeds in m/s, weights are masses in kg.
+"""
+
+import numpy as np
+
+# unit conversions, kept local so the module does not need SUAVE
+LB      = 0.45359237
+FT      = 0.3048
+KNOT    = 1852. / 3600.
+G       = 9.80665
+G_FT    = G / FT
+SLUG_FT = 515.378818
+
+RHO_SL  = 1.225
+T_SL    = 288.15
+P_SL    = 101325.
+R_AIR   = 287.0528742
+
+VN_DTYPE = np.dtype([(name, 'f8') for name in (
+    'weight', 'altitude', 'delta_ISA', 'density',
+    'Vs1', 'Vs1_negative', 'Va', 'Va_negative', 'Vc', 'Vd',
+    'n_maneuver_positive', 'n_maneuver_negative',
+    'n_gust_Vc_positive', 'n_gust_Vc_negative',
+    'n_gust_Vd_positive', 'n_gust_Vd_negative',
+    'n_limit_positive', 'n_limit_negative',
+    'CL_alpha', 'gust_alleviation_factor')])
+
+# FAR 23.335 / 23.337 factors per category:
+#   (n+ cap, n-/n+, Vc factor at W/S <= 20 psf, Vd/Vc at W/S <= 20 psf)
+CATEGORIES = {'normal':    (3.8, -0.4, 33., 1.40),
+              'commuter':  (3.8, -0.4, 33., 1.40),
+              'utility':   (4.4, -0.4, 33., 1.50),
+              'aerobatic': (6.0, -0.5, 36., 1.55)}
+
+# ----------------------------------------------------------------------
+#   Envelopes
+# ----------------------------------------------------------------------
+
+def vn_envelopes(vehicle, weights, altitudes=0., delta_ISAs=0., write=None):
+    """FAR 23 V-n envelopes for every broadcast combination of weight,
+    altitude and ISA offset. Returns a structured VN_DTYPE array with the
+    broadcast shape; pass a path as write to also save the table."""
+
+    weight, altitude, delta_ISA = np.broadcast_arrays(np.asarray(weights, dtype=float),
+                                                      np.asarray(altitudes, dtype=float),
+                                                      np.asarray(delta_ISAs, dtype=float))
+
+    wing     = vehicle.wings.main_wing
+    S        = vehicle.reference_area
+    CLmax    = vehicle.maximum_lift_coefficient
+    CLmin    = vehicle.minimum_lift_coefficient
+    category = vehicle.envelope.category.lower()
+
+    n_cap, n_ratio, k_c20, k_d20 = CATEGORIES[category]
+
+    rho      = isa_density(altitude, delta_ISA)
+    CLa      = lift_curve_slope(wing.aspect_ratio, wing.sweeps.quarter_chord,
+                                vehicle.envelope.cruise_mach)
+
+    W_lb     = weight / LB
+    WS_psf   = W_lb / (S / FT**2)
+
+    # stall speeds
+    Vs1      = np.sqrt(2. * weight * G / (RHO_SL * S * CLmax))
+    Vs1_neg  = np.sqrt(2. * weight * G / (RHO_SL * S * np.abs(CLmin)))
+
+    # FAR 23.337 maneuvering load factors
+    n_pos    = np.minimum(2.1 + 24000. / (W_lb + 10000.), n_cap)
+    if category == 'utility' or category == 'aerobatic':
+        n_pos = np.full_like(W_lb, n_cap)
+    n_neg    = n_ratio * n_pos
+
+    # FAR 23.335 design cruise and dive speeds, factors fall linearly to
+    # 28.6 and 1.35 between 20 and 100 psf
+    frac     = np.clip((WS_psf - 20.) / 80., 0., 1.)
+    k_c      = k_c20 + (28.6 - k_c20) * frac
+    k_d      = k_d20 + (1.35 - k_d20) * frac
+    Vc       = k_c * np.sqrt(WS_psf) * KNOT
+    Vd       = k_d * Vc
+
+    Va       = np.minimum(Vs1 * np.sqrt(n_pos), Vc)
+    Va_neg   = np.minimum(Vs1_neg * np.sqrt(np.abs(n_neg)), Vc)
+
+    # FAR 23.341 gust load factors
+    chord    = wing.chords.mean_aerodynamic / FT
+    mu       = 2. * WS_psf / ((rho / SLUG_FT) * chord * CLa * G_FT)
+    Kg       = 0.88 * mu / (5.3 + mu)
+
+    h_ft     = altitude / FT
+    fade     = np.clip((h_ft - 20000.) / 30000., 0., 1.)
+    Ude_c    = 50. - 25.  * fade
+    Ude_d    = 25. - 12.5 * fade
+
+    dn_c     = Kg * Ude_c * (Vc / KNOT) * CLa / (498. * WS_psf)
+    dn_d     = Kg * Ude_d * (Vd / KNOT) * CLa / (498. * WS_psf)
+
+    envelopes = np.zeros(weight.shape, dtype=VN_DTYPE)
+    envelopes['weight']                  = weight
+    envelopes['altitude']                = altitude
+    envelopes['delta_ISA']               = delta_ISA
+    envelopes['density']                 = rho
+    envelopes['Vs1']                     = Vs1
+    envelopes['Vs1_negative']            = Vs1_neg
+    envelopes['Va']                      = Va
+    envelopes['Va_negative']             = Va_neg
+    envelopes['Vc']                      = Vc
+    envelopes['Vd']                      = Vd
+    envelopes['n_maneuver_positive']     = n_pos
+    envelopes['n_maneuver_negative']     = n_neg
+    envelopes['n_gust_Vc_positive']      = 1. + dn_c
+    envelopes['n_gust_Vc_negative']      = 1. - dn_c
+    envelopes['n_gust_Vd_positive']      = 1. + dn_d
+    envelopes['n_gust_Vd_negative']      = 1. - dn_d
+    envelopes['n_limit_positive']        = np.maximum(n_pos, np.maximum(1. + dn_c, 1. + dn_d))
+    envelopes['n_limit_negative']        = np.minimum(n_neg, np.minimum(1. - dn_c, 1. - dn_d))
+    envelopes['CL_alpha']                = CLa
+    envelopes['gust_alleviation_factor'] = Kg
+
+    if write:
+        write_vn_table(write, envelopes)
+
+    return envelopes
+
+def lift_curve_slope(aspect_ratio, sweep, mach):
+    """DATCOM finite wing lift curve slope per radian."""
+
+    beta = np.sqrt(1. - mach**2)
+
+    return 2. * np.pi * aspect_ratio / (2. + np.sqrt(aspect_ratio**2 * beta**2
+                                                     * (1. + np.tan(sweep)**2 / beta**2) + 4.))
+
+def isa_density(altitude, delta_ISA=0.):
+    """Density of the standard atmosphere with a temperature offset,
+    pressure is unchanged by the offset."""
+
+    from atmosphere_table import standard_atmosphere
+
+    return standard_atmosphere().density(altitude, delta_ISA)
+
+# ----------------------------------------------------------------------
+#   Output
+# ----------------------------------------------------------------------
+
+def write_vn_table(path, envelopes):
+
+    envelopes = np.atleast_1d(envelopes).ravel()
+    columns   = np.column_stack([envelopes[name] for name in VN_DTYPE.names])
+
+    np.savetxt(path, columns, fmt='%14.6g', delimiter=' ',
+               header='V-n envelopes (SI, equivalent airspeeds in m/s)\n' + ' '.join(VN_DTYPE.names))
+
+    return path
+
+def plot_vn_diagram(envelope, ax=None):
+    """Draws the maneuver and gust envelope of one VN_DTYPE row."""
+
+    import matplotlib.pyplot as plt
+
+    if ax is None:
+        fig, ax = plt.subplots()
+
+    kt  = 1. / KNOT
+    Vs1 = envelope['Vs1']
+    Vsn = envelope['Vs1_negative']
+    Va  = envelope['Va']
+    Van = envelope['Va_negative']
+    Vc  = envelope['Vc']
+    Vd  = envelope['Vd']
+    n_p = envelope['n_maneuver_positive']
+    n_n = envelope['n_maneuver_negative']
+
+    V_pos = np.linspace(0., Va, 50)
+    V_neg = np.linspace(0., Van, 50)
+    ax.plot(V_pos * kt, n_p * (V_pos / Va)**2, 'b-')
+    ax.plot(V_neg * kt, n_n * (V_neg / Van)**2, 'b-')
+    ax.plot(np.array([Va, Vd, Vd, Vc, Van]) * kt, [n_p, n_p, 0., n_n, n_n], 'b-', label='maneuver')
+
+    ax.plot(np.array([0., Vc, Vd, Vd, Vc, 0.]) * kt,
+            [1., envelope['n_gust_Vc_positive'], envelope['n_gust_Vd_positive'],
+             envelope['n_gust_Vd_negative'], envelope['n_gust_Vc_negative'], 1.], 'r--', label='gust')
+
+    ax.axvline(Vs1 * kt, color='k', linestyle=':')
+    ax.axvline(Vsn * kt, color='k', linestyle=':')
+    ax.set_xlabel('Airspeed (KEAS)')
+    ax.set_ylabel('Load factor')
+    ax.legend()
+
+    return ax
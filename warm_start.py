@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:05:27 2026
+
+@author: K. Grafton
+
+Warm starts for the mission solver. Converged unknowns are stored against
+the flight condition they were solved at, and the nearest stored point is
+used as the initial guess for the next evaluation instead of the fixed
+throttle = 1 / rpm = 5500 guesses in mission_setup(). The rpm is one of
+the unknowns solved for, not part of the flight condition.
+"""
+
+import numpy as np
+import scipy.optimize
+
+from mission_sweep import segment_state
+
+# flight condition used to find neighbours, and the distance that counts
+# as "one unit" apart in each of them
+CONDITION_KEYS   = ('altitude', 'air_speed', 'takeoff_mass', 'distance')
+CONDITION_SCALES = (500., 5., 25., 100000.)
+
+class WarmStartStore:
+
+    def __init__(self, scales=CONDITION_SCALES, max_points=None):
+
+        self.scales      = np.asarray(scales, dtype=float)
+        self.max_points  = max_points
+        self.unknowns    = []
+        self._conditions = np.zeros((16, len(self.scales)))
+        self._oldest     = 0
+
+    def __len__(self):
+        return len(self.unknowns)
+
+    @property
+    def conditions(self):
+        """Scaled conditions of the stored solutions, one row each."""
+
+        return self._conditions[:len(self.unknowns)]
+
+    def add(self, condition, unknowns):
+
+        condition = np.asarray(condition, dtype=float).ravel() / self.scales
+        n         = len(self.unknowns)
+
+        if self.max_points is not None and n >= self.max_points:
+            if not self.max_points:
+                return
+            # full, the oldest solution makes way
+            slot                   = self._oldest
+            self._oldest           = (slot + 1) % self.max_points
+            self._conditions[slot] = condition
+            self.unknowns[slot]    = unknowns
+            return
+
+        # grown geometrically, a sweep adds one row per point
+        if n == len(self._conditions):
+            grown            = np.zeros((2 * n, len(self.scales)))
+            grown[:n]        = self._conditions
+            self._conditions = grown
+        self._conditions[n] = condition
+        self.unknowns.append(unknowns)
+
+        return
+
+    def seed(self, condition, results):
+        """Stores the converged unknowns of every segment in the results of
+        mission.evaluate(). Returns False if any segment did not converge."""
+
+        unknowns = {}
+        for tag, segment in results.segments.items():
+            state = segment_state(segment)
+            if not state.numerics.get('converged', True):
+                return False
+            unknowns[tag] = {k: np.array(v, copy=True) for k, v in state.unknowns.items()}
+
+        self.add(condition, unknowns)
+
+        return True
+
+    def query(self, condition):
+        """Unknowns of the nearest stored condition, or None if empty."""
+
+        if not self.unknowns:
+            return None
+
+        condition = np.asarray(condition, dtype=float) / self.scales
+        distance  = np.sum((self.conditions - condition)**2, axis=1)
+
+        return self.unknowns[int(np.argmin(distance))]
+
+    def apply(self, mission, condition):
+        """Overwrites the initial unknowns of the mission segments with the
+        nearest stored solution. Returns True if a guess was applied."""
+
+        guess = self.query(condition)
+        if guess is None:
+            return False
+
+        for tag, segment in mission.segments.items():
+            if tag not in guess:
+                continue
+            n_points = segment.state.numerics.number_control_points
+            for key, value in guess[tag].items():
+                segment.state.unknowns[key] = resample(value, n_points)
+
+        return True
+
+# ----------------------------------------------------------------------
+#   Solver iteration counting
+# ----------------------------------------------------------------------
+
+def counting_root_finder(func, x0, args=(), **kwargs):
+    """Drop-in for scipy.optimize.fsolve that records the number of
+    residual evaluations in segment.state.numerics."""
+
+    segment = args
+    count   = [0]
+
+    def counted(x, *a):
+        count[0] += 1
+        return func(x, *a)
+
+    output = scipy.optimize.fsolve(counted, x0, args=args, **kwargs)
+
+    numerics = segment.state.numerics
+    numerics.residual_evaluations = numerics.get('residual_evaluations', 0) + count[0]
+
+    return output
+
+def count_iterations(mission):
+
+    for segment in mission.segments.values():
+        segment.settings.root_finder                 = counting_root_finder
+        segment.state.numerics.residual_evaluations  = 0
+
+    return mission
+
+def residual_evaluations(results):
+
+    return sum(segment_state(segment).numerics.get('residual_evaluations', 0)
+               for segment in results.segments.values())
+
+# ----------------------------------------------------------------------
+#   Helpers
+# ----------------------------------------------------------------------
+
+def chebyshev_points(n_points):
+
+    if n_points == 1:
+        return np.zeros(1)
+
+    return 0.5 * (1. - np.cos(np.pi * np.arange(n_points) / (n_points - 1)))
+
+def resample(values, n_points):
+    """Interpolates an (n, m) array of unknowns onto n_points Chebyshev
+    control points. Single-row guesses are left for SUAVE to expand."""
+
+    values = np.atleast_2d(values)
+    n      = values.shape[0]
+
+    if n == n_points or n == 1:
+        return values.copy()
+
+    x_old = chebyshev_points(n)
+    x_new = chebyshev_points(n_points)
+
+    return np.column_stack([np.interp(x_new, x_old, column) for column in values.T])
@@ -3,22 +3,205 @@
 Created on Tue Jan 24 21:03:56 2023
 
 @author: kaela
+
+X-Plane data-output logs ('|' separated, one header row). The logs are
+read in chunks of only the columns asked for, with float32 values and a
+float64 missn_time, so running statistics of a multi-GB flight never hold
+more than one chunk.
 """
 
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-df = pd.read_csv('c172_shotperiod.txt', sep='|', header=0)
+LOG = 'c172_shotperiod.txt'
+
+TIME = 'missn_time'
+
+CHUNKSIZE = 200000
+
+# ----------------------------------------------------------------------
+#   Reading
+# ----------------------------------------------------------------------
+
+def normalise_header(name):
+    """X-Plane pads its headers with spaces and commas, e.g.
+    '_Vind,_keas ' becomes '_Vind_keas'."""
+
+    return name.replace(',','').replace(' ','').replace('__','_')
+
+def read_header(path):
+    """Normalised column names of a log. Blank names (the trailing '|')
+    become '_unnamed_<i>' so every name is unique."""
+
+    with open(path) as f:
+        header = f.readline().rstrip('\r\n').split('|')
+
+    names = []
+    for i, name in enumerate(header):
+        name = normalise_header(name) or '_unnamed_%d' % i
+        if name in names:
+            name = '%s_%d' % (name, i)
+        names.append(name)
+
+    return names
+
+def iter_log(path, columns=None, chunksize=CHUNKSIZE, dtype=np.float32):
+    """Yields DataFrames of up to chunksize rows holding only columns
+    (normalised names, default all) plus missn_time. Values are parsed
+    straight to dtype, missn_time to float64."""
+
+    names = read_header(path)
+    if columns is None:
+        columns = [name for name in names if not name.startswith('_unnamed_')]
+    else:
+        columns = list(dict.fromkeys([TIME] + list(columns)))
+        missing = [name for name in columns if name not in names]
+        if missing:
+            raise KeyError('%s has no columns %s' % (path, ', '.join(missing)))
+
+    dtypes = {name: (np.float64 if name == TIME else dtype) for name in columns}
+
+    reader = pd.read_csv(path, sep='|', header=0, names=names, usecols=columns, dtype=dtypes,
+                         chunksize=chunksize, skipinitialspace=True)
+    with reader:
+        for frame in reader:
+            yield frame
+
+    return
+
+def read_log(path, columns=None, chunksize=CHUNKSIZE, dtype=np.float32):
+    """The whole log as one DataFrame, for logs (or columns) that fit."""
+
+    return pd.concat(iter_log(path, columns, chunksize, dtype), ignore_index=True)
+
+# ----------------------------------------------------------------------
+#   Running statistics
+# ----------------------------------------------------------------------
+
+class RunningStats:
+    """Count, min, max, mean and variance of a stream of values, merged
+    chunk by chunk in float64 (Chan et al.), NaNs ignored."""
+
+    def __init__(self):
+
+        self.count = 0
+        self.min   = np.inf
+        self.max   = -np.inf
+        self.mean  = 0.
+        self._m2   = 0.
+
+    def update(self, values):
+
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+
+        n     = values.size
+        mean  = values.mean()
+        m2    = np.sum((values - mean)**2)
+        total = self.count + n
+        delta = mean - self.mean
+
+        self._m2   += m2 + delta**2 * self.count * n / total
+        self.mean  += delta * n / total
+        self.count  = total
+        self.min    = min(self.min, values.min())
+        self.max    = max(self.max, values.max())
+
+        return self
+
+    @property
+    def variance(self):
+
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.
+
+    @property
+    def std(self):
+
+        return np.sqrt(self.variance)
+
+    def as_dict(self):
+
+        return {'count': self.count, 'min': float(self.min), 'max': float(self.max),
+                'mean': float(self.mean), 'std': float(self.std)}
+
+def log_statistics(path, columns, phases=None, chunksize=CHUNKSIZE):
+    """Running statistics of columns over the whole log and per phase,
+    returned as {phase: {column: RunningStats}} with the whole log under
+    'all'.
+
+    phases is either a list of (name, start, end) missn_time windows or a
+    function taking a chunk and returning a phase label per row (None or
+    NaN rows belong to no phase)."""
+
+    stats = {'all': {name: RunningStats() for name in columns}}
+
+    def phase_stats(label):
+        if label not in stats:
+            stats[label] = {name: RunningStats() for name in columns}
+        return stats[label]
+
+    for frame in iter_log(path, columns, chunksize):
+        for name in columns:
+            stats['all'][name].update(frame[name].to_numpy())
+
+        if phases is None:
+            continue
+
+        if callable(phases):
+            labels = pd.Series(phases(frame), index=frame.index)
+            groups = frame.groupby(labels, sort=False)
+        else:
+            time   = frame[TIME].to_numpy()
+            groups = [(label, frame[(time >= start) & (time < end)]) for label, start, end in phases]
+
+        for label, rows in groups:
+            if len(rows) == 0:
+                continue
+            for name in columns:
+                phase_stats(label)[name].update(rows[name].to_numpy())
+
+    return stats
+
+def print_statistics(stats):
+
+    for phase, columns in stats.items():
+        print(phase)
+        for name, s in columns.items():
+            print('  %-24s n %9d  min %12.4g  max %12.4g  mean %12.4g  std %12.4g'
+                  % (name, s.count, s.min, s.max, s.mean, s.std))
+
+    return
+
+# ----------------------------------------------------------------------
+#   Plot
+# ----------------------------------------------------------------------
+
+def main(path=LOG, columns=('pitch_deg', '_Vind_keas'), start=None, end=None):
+
+    import matplotlib.pyplot as plt
+    from decimated_plot import plot
+    from xplane_store import open_log
+
+    # parsed once into the columnar store, later runs only map it
+    store = open_log(path)
+    if store.rows == 0:
+        print('%s has no data rows' % path)
+        return
+
+    print_statistics({'all': store.statistics(columns)})
+    df = store.query(start, end, columns)
 
-df.rename(columns = lambda x: x.replace(',',''), inplace = True)
-df.rename(columns = lambda x: x.replace(' ',''), inplace = True)
-df.rename(columns = lambda x: x.replace('__','_'), inplace = True)
+    ax = plt.gca()
+    for name in columns:
+        plot(ax, df[TIME].to_numpy(), df[name].to_numpy(), label=name)
+    plt.xlabel(TIME)
+    plt.ylabel('Value')
+    plt.legend()
+    plt.show()
 
+    return
 
-plt.plot(df['missn_time'], df['pitch_deg'], label='pitch_deg')
-plt.plot(df['missn_time'], df['_Vind_keas'], label='_Vind_keas')
-plt.xlabel('missn_time')
-plt.ylabel('Value')
-plt.legend()
-plt.show()
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:51:17 2026
+
+@author: K. Grafton
+
+Columnar cache of X-Plane logs. Each log is parsed once into a directory
+of raw little-endian column files plus a JSON header, rows sorted on
+missn_time. Later opens map the columns read-only, and a time range is
+found by binary search on the time column, so a few minutes around a
+manoeuvre are read without touching the rest of the log.
+
+The cache is rebuilt when the source's size or modification time
+changes. Hashing the source would mean reading all of a multi-GB log on
+every open, which is the cost the cache is there to avoid.
+
+    log   = open_log('c172_shotperiod.txt')
+    frame = log.query(1200., 1500., ['pitch_deg', '_Vind_keas'])
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+from design_cache import CACHE_DIR
+from xplane_analysis import CHUNKSIZE, TIME, RunningStats, iter_log, read_header
+
+STORE_DIR = os.path.join(CACHE_DIR, 'xplane')
+VERSION   = 1
+
+# ----------------------------------------------------------------------
+#   Store
+# ----------------------------------------------------------------------
+
+class XPlaneStore:
+
+    def __init__(self, directory):
+
+        self.directory = directory
+        with open(os.path.join(directory, 'header.json')) as f:
+            self.header = json.load(f)
+
+        if self.header.get('version') != VERSION:
+            raise ValueError(directory + ' is not a current X-Plane store')
+
+        self.rows    = self.header['rows']
+        self.columns = list(self.header['columns'])
+        self._maps   = {}
+
+    def column(self, name):
+        """Read-only memory map of one whole column."""
+
+        if name not in self._maps:
+            dtype = self.header['columns'][name]
+            path  = os.path.join(self.directory, _column_file(self.columns.index(name)))
+            if self.rows == 0:
+                self._maps[name] = np.zeros(0, dtype=dtype)
+            else:
+                self._maps[name] = np.memmap(path, dtype=dtype, mode='r', shape=(self.rows,))
+
+        return self._maps[name]
+
+    @property
+    def time(self):
+
+        return self.column(TIME)
+
+    def bounds(self, start=None, end=None):
+        """Row slice of start <= missn_time < end."""
+
+        time = self.time
+        i0   = 0 if start is None else int(np.searchsorted(time, start, side='left'))
+        i1   = self.rows if end is None else int(np.searchsorted(time, end, side='left'))
+
+        return slice(i0, max(i0, i1))
+
+    def arrays(self, start=None, end=None, columns=None):
+        """{column: view} of the rows in the time range, no copy made."""
+
+        columns = self.columns if columns is None else list(dict.fromkeys([TIME] + list(columns)))
+        missing = [name for name in columns if name not in self.header['columns']]
+        if missing:
+            raise KeyError('%s has no columns %s' % (self.header['source'], ', '.join(missing)))
+
+        rows = self.bounds(start, end)
+
+        return {name: self.column(name)[rows] for name in columns}
+
+    def query(self, start=None, end=None, columns=None):
+        """The rows in the time range as a DataFrame of columns (plus
+        missn_time)."""
+
+        import pandas as pd
+
+        return pd.DataFrame(self.arrays(start, end, columns))
+
+    def statistics(self, columns, start=None, end=None, chunksize=CHUNKSIZE):
+        """{column: RunningStats} over the rows in the time range, read
+        from the mapped columns a chunk at a time."""
+
+        rows  = self.bounds(start, end)
+        stats = {}
+        for name, values in self.arrays(start, end, columns).items():
+            if name == TIME and TIME not in columns:
+                continue
+            stats[name] = RunningStats()
+            for i in range(0, rows.stop - rows.start, chunksize):
+                stats[name].update(values[i:i + chunksize])
+
+        return stats
+
+    def is_current(self, source):
+
+        return self.header['source_stat'] == _source_stat(source)
+
+def open_log(source, store_dir=STORE_DIR, chunksize=None):
+    """Maps the store of an X-Plane log, ingesting it first if it is
+    missing or the source has changed since."""
+
+    directory = store_path(source, store_dir)
+
+    if os.path.exists(directory):
+        try:
+            store = XPlaneStore(directory)
+            if store.is_current(source):
+                return store
+        except (OSError, ValueError, KeyError):
+            pass
+
+    ingest(source, directory, chunksize)
+
+    return XPlaneStore(directory)
+
+def store_path(source, store_dir=STORE_DIR):
+
+    import hashlib
+
+    source = os.path.abspath(source)
+    key    = hashlib.sha256(source.encode()).hexdigest()[:16]
+
+    return os.path.join(store_dir, '%s-%s' % (os.path.basename(source), key))
+
+# ----------------------------------------------------------------------
+#   Ingest
+# ----------------------------------------------------------------------
+
+def ingest(source, directory, chunksize=None):
+    """Streams the log into column files, sorting on missn_time if the
+    recording is not already in order."""
+
+    stat = _source_stat(source)
+    tmp  = '%s.%d.tmp' % (directory, os.getpid())
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    kwargs  = {} if chunksize is None else {'chunksize': chunksize}
+    files   = {}
+    columns = {}
+    rows    = 0
+    ordered = True
+    last    = -np.inf
+
+    def open_columns(dtypes):
+        for name, dtype in dtypes:
+            columns[name] = np.dtype(dtype).newbyteorder('<').str
+            files[name]   = open(os.path.join(tmp, _column_file(len(files))), 'wb')
+
+    try:
+        for frame in iter_log(source, **kwargs):
+            if not files:
+                open_columns((name, frame[name].dtype) for name in frame.columns)
+
+            time = frame[TIME].to_numpy()
+            if len(time):
+                ordered = ordered and time[0] >= last and bool(np.all(np.diff(time) >= 0.))
+                last    = time[-1]
+
+            for name, f in files.items():
+                f.write(np.ascontiguousarray(frame[name].to_numpy(), dtype=columns[name]).tobytes())
+            rows += len(frame)
+
+        # a log with only its header row may parse to no chunk at all, it
+        # still gets every column, empty, with the dtypes iter_log() uses
+        if not files:
+            names = [name for name in read_header(source) if not name.startswith('_unnamed_')]
+            open_columns((name, np.float64 if name == TIME else np.float32) for name in names)
+    finally:
+        for f in files.values():
+            f.close()
+
+    if TIME not in columns:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise KeyError('%s has no %s column' % (source, TIME))
+
+    if not ordered:
+        _sort_columns(tmp, columns, rows)
+
+    header = {'version':     VERSION,
+              'source':      os.path.abspath(source),
+              'source_stat': stat,
+              'rows':        rows,
+              'columns':     columns}
+    with open(os.path.join(tmp, 'header.json'), 'w') as f:
+        json.dump(header, f, indent=1)
+
+    # swap the finished store in whole so a reader never maps a
+    # half-written one
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp, directory)
+
+    return directory
+
+def _sort_columns(directory, columns, rows):
+    """Reorders every column by missn_time, one column in memory at a time."""
+
+    def path(name):
+        return os.path.join(directory, _column_file(list(columns).index(name)))
+
+    time  = np.fromfile(path(TIME), dtype=columns[TIME], count=rows)
+    order = np.argsort(time, kind='stable')
+
+    for name, dtype in columns.items():
+        values = np.fromfile(path(name), dtype=dtype, count=rows)
+        values[order].tofile(path(name))
+
+    return
+
+# ----------------------------------------------------------------------
+#   Helpers
+# ----------------------------------------------------------------------
+
+def _source_stat(source):
+
+    stat = os.stat(source)
+
+    return [stat.st_size, stat.st_mtime_ns]
+
+def _column_file(index):
+    # by position, header names need not be valid file names
+    return 'column_%04d.bin' % index